@@ -0,0 +1,28 @@
+"""Add completion bitmap to habits
+
+Revision ID: 0e5f9f5bdd93
+Revises: ac3338455ae2
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0e5f9f5bdd93'
+down_revision = 'ac3338455ae2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Bitmaps start NULL and are built lazily on the next completion change,
+    # or in bulk with `python -m app.commands.recompute_streaks --missing-only`.
+    op.add_column('habits', sa.Column('completion_bitmap', sa.LargeBinary(), nullable=True))
+    op.add_column('habits', sa.Column('bitmap_origin', sa.Date(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('habits', 'bitmap_origin')
+    op.drop_column('habits', 'completion_bitmap')
@@ -0,0 +1,101 @@
+"""Add food daily rollups
+
+Revision ID: 5b7c1e9a3d42
+Revises: 0e5f9f5bdd93
+Create Date: 2026-10-17 11:02:15.407311
+
+"""
+from datetime import datetime
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '5b7c1e9a3d42'
+down_revision = '0e5f9f5bdd93'
+branch_labels = None
+depends_on = None
+
+MEALS = ('breakfast', 'lunch', 'dinner', 'snack')
+NUTRIENTS = ('carbs', 'protein', 'fat', 'fiber', 'sugar', 'sodium')
+BATCH_SIZE = 1000
+
+
+def _nutrient(value):
+    # As app.services.food_summary.nutrient_value: missing or non-numeric counts as 0
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0.0
+    return float(value)
+
+
+def _backfill(rollups_table) -> None:
+    """Build a rollup row for every user and day that already has food entries."""
+    food_entries = sa.table(
+        'food_entries',
+        sa.column('user_id', sa.String),
+        sa.column('logged_at', sa.DateTime),
+        sa.column('calories', sa.Integer),
+        sa.column('meal_category', sa.String),
+        sa.column('nutritional_info', sa.JSON),
+    )
+    rollups = {}
+    result = op.get_bind().execution_options(stream_results=True).execute(sa.select(food_entries))
+    for entry in result:
+        key = (entry.user_id, entry.logged_at.date())
+        rollup = rollups.get(key)
+        if rollup is None:
+            rollup = rollups[key] = {'user_id': key[0], 'date': key[1], 'entries_count': 0, 'total_calories': 0}
+            rollup.update({f'{meal}_{suffix}': 0 for meal in MEALS for suffix in ('calories', 'count')})
+            rollup.update({nutrient: 0.0 for nutrient in NUTRIENTS})
+        # The enum column stores member names (BREAKFAST); values are lowercase
+        meal = entry.meal_category.lower()
+        rollup['entries_count'] += 1
+        rollup['total_calories'] += entry.calories
+        rollup[f'{meal}_calories'] += entry.calories
+        rollup[f'{meal}_count'] += 1
+        info = entry.nutritional_info or {}
+        for nutrient in NUTRIENTS:
+            rollup[nutrient] += _nutrient(info.get(nutrient))
+
+    now = datetime.utcnow()
+    rows = list(rollups.values())
+    for row in rows:
+        row['updated_at'] = now
+        for nutrient in NUTRIENTS:
+            row[nutrient] = round(row[nutrient], 4)
+    for start in range(0, len(rows), BATCH_SIZE):
+        op.bulk_insert(rollups_table, rows[start:start + BATCH_SIZE])
+
+
+def upgrade() -> None:
+    rollups_table = op.create_table('food_daily_rollups',
+    sa.Column('user_id', mysql.CHAR(length=36), nullable=False),
+    sa.Column('date', sa.Date(), nullable=False),
+    sa.Column('entries_count', sa.Integer(), nullable=False),
+    sa.Column('total_calories', sa.Integer(), nullable=False),
+    sa.Column('breakfast_calories', sa.Integer(), nullable=False),
+    sa.Column('breakfast_count', sa.Integer(), nullable=False),
+    sa.Column('lunch_calories', sa.Integer(), nullable=False),
+    sa.Column('lunch_count', sa.Integer(), nullable=False),
+    sa.Column('dinner_calories', sa.Integer(), nullable=False),
+    sa.Column('dinner_count', sa.Integer(), nullable=False),
+    sa.Column('snack_calories', sa.Integer(), nullable=False),
+    sa.Column('snack_count', sa.Integer(), nullable=False),
+    sa.Column('carbs', sa.Float(), nullable=False),
+    sa.Column('protein', sa.Float(), nullable=False),
+    sa.Column('fat', sa.Float(), nullable=False),
+    sa.Column('fiber', sa.Float(), nullable=False),
+    sa.Column('sugar', sa.Float(), nullable=False),
+    sa.Column('sodium', sa.Float(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('user_id', 'date')
+    )
+    # Existing entries are summed here, so summaries are right as soon as the
+    # upgrade finishes; `python -m app.commands.reconcile_food_rollups` repairs drift later.
+    _backfill(rollups_table)
+
+
+def downgrade() -> None:
+    op.drop_table('food_daily_rollups')
@@ -0,0 +1,47 @@
+"""Add composite indexes matching query shapes
+
+Revision ID: 9d3e6f2a7c18
+Revises: 5b7c1e9a3d42
+Create Date: 2026-10-17 12:20:51.664093
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '9d3e6f2a7c18'
+down_revision = '5b7c1e9a3d42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Duplicate completions carry no extra information; keep one per habit and day
+    # so the unique index can be built.
+    op.execute(
+        "DELETE FROM habit_completions WHERE id NOT IN ("
+        "SELECT keep_id FROM (SELECT MIN(id) AS keep_id FROM habit_completions "
+        "GROUP BY habit_id, completion_date) AS keep)"
+    )
+    # Sleep duplicates can differ; keep the most recently updated entry per user and day
+    # (ties broken by id). The derived table lets MySQL delete from the table it reads.
+    op.execute(
+        "DELETE FROM sleep_entries WHERE id IN ("
+        "SELECT id FROM (SELECT older.id FROM sleep_entries older "
+        "JOIN sleep_entries newer ON newer.user_id = older.user_id AND newer.date = older.date "
+        "AND (newer.updated_at > older.updated_at "
+        "OR (newer.updated_at = older.updated_at AND newer.id > older.id))) AS superseded)"
+    )
+    op.create_index('ix_food_entries_user_id_logged_at', 'food_entries', ['user_id', 'logged_at'], unique=False)
+    op.create_index('uq_habit_completions_habit_id_completion_date', 'habit_completions', ['habit_id', 'completion_date'], unique=True)
+    op.create_index('uq_sleep_entries_user_id_date', 'sleep_entries', ['user_id', 'date'], unique=True)
+    op.create_index('ix_todos_user_id_is_completed_priority_created_at', 'todos', ['user_id', 'is_completed', 'priority', 'created_at'], unique=False)
+    op.create_index('ix_habits_user_id_is_active_created_at', 'habits', ['user_id', 'is_active', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_habits_user_id_is_active_created_at', table_name='habits')
+    op.drop_index('ix_todos_user_id_is_completed_priority_created_at', table_name='todos')
+    op.drop_index('uq_sleep_entries_user_id_date', table_name='sleep_entries')
+    op.drop_index('uq_habit_completions_habit_id_completion_date', table_name='habit_completions')
+    op.drop_index('ix_food_entries_user_id_logged_at', table_name='food_entries')
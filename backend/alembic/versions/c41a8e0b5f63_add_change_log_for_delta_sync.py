@@ -0,0 +1,50 @@
+"""Add change log for delta sync
+
+Revision ID: c41a8e0b5f63
+Revises: 9d3e6f2a7c18
+Create Date: 2026-10-17 13:41:07.285519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = 'c41a8e0b5f63'
+down_revision = '9d3e6f2a7c18'
+branch_labels = None
+depends_on = None
+
+SYNCED_TABLES = {
+    'food_entries': 'updated_at',
+    'sleep_entries': 'updated_at',
+    'habits': 'updated_at',
+    'habit_completions': 'created_at',
+    'todos': 'updated_at',
+}
+
+
+def upgrade() -> None:
+    op.create_table('change_log',
+    sa.Column('seq', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+    sa.Column('user_id', mysql.CHAR(length=36), nullable=False),
+    sa.Column('entity', sa.String(length=32), nullable=False),
+    sa.Column('entity_id', mysql.CHAR(length=36), nullable=False),
+    sa.Column('op', sa.String(length=8), nullable=False),
+    sa.Column('changed_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('seq')
+    )
+    op.create_index('ix_change_log_user_id_seq', 'change_log', ['user_id', 'seq'], unique=False)
+    
+    # Existing rows become the first changes, so a full sync from 0 sees them
+    for table, timestamp in SYNCED_TABLES.items():
+        op.execute(
+            f"INSERT INTO change_log (user_id, entity, entity_id, op, changed_at) "
+            f"SELECT user_id, '{table}', id, 'upsert', {timestamp} FROM {table} ORDER BY {timestamp}"
+        )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_change_log_user_id_seq', table_name='change_log')
+    op.drop_table('change_log')
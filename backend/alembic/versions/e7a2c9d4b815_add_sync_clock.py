@@ -0,0 +1,30 @@
+"""Add sync clock ordering change log writes by commit
+
+Revision ID: e7a2c9d4b815
+Revises: c41a8e0b5f63
+Create Date: 2026-10-17 16:05:42.518307
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e7a2c9d4b815'
+down_revision = 'c41a8e0b5f63'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    sync_clock = op.create_table('sync_clock',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('commits', sa.BigInteger(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    # The single row every change log writer locks until it commits
+    op.bulk_insert(sync_clock, [{'id': 1, 'commits': 0}])
+
+
+def downgrade() -> None:
+    op.drop_table('sync_clock')
@@ -1,10 +1,25 @@
-from fastapi import APIRouter
-from app.api.v1.endpoints import auth, food, sleep, habits, todos
+from fastapi import APIRouter, Depends
+from app.api.v1.endpoints import auth, food, sleep, habits, todos, sync, export, imports, batch, dashboard, admin
+from app.core.auth_cache import invalidate_shared_principals
+from app.core.dependencies import require_admin
+from app.core.response_cache import invalidate_cached_responses
 
 api_router = APIRouter()
 
-api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
-api_router.include_router(food.router, prefix="/food", tags=["Food Tracking"])
-api_router.include_router(sleep.router, prefix="/sleep", tags=["Sleep Tracking"])
-api_router.include_router(habits.router, prefix="/habits", tags=["Habits"])
-api_router.include_router(todos.router, prefix="/todos", tags=["Todos"])
\ No newline at end of file
+# Routers whose writes start new response cache generations for the domains they change
+invalidates_cache = [Depends(invalidate_cached_responses)]
+
+# Routers whose writes change a user's status or password; all workers drop their cached copies
+invalidates_principals = [Depends(invalidate_shared_principals)]
+
+api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"], dependencies=invalidates_principals)
+api_router.include_router(food.router, prefix="/food", tags=["Food Tracking"], dependencies=invalidates_cache)
+api_router.include_router(sleep.router, prefix="/sleep", tags=["Sleep Tracking"], dependencies=invalidates_cache)
+api_router.include_router(habits.router, prefix="/habits", tags=["Habits"], dependencies=invalidates_cache)
+api_router.include_router(todos.router, prefix="/todos", tags=["Todos"], dependencies=invalidates_cache)
+api_router.include_router(sync.router, prefix="/sync", tags=["Sync"])
+api_router.include_router(export.router, prefix="/export", tags=["Export"])
+api_router.include_router(imports.router, prefix="/import", tags=["Import"], dependencies=invalidates_cache)
+api_router.include_router(batch.router, prefix="/batch", tags=["Batch"])
+api_router.include_router(dashboard.router, prefix="/dashboard", tags=["Dashboard"])
+api_router.include_router(admin.router, prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
\ No newline at end of file
@@ -0,0 +1,40 @@
+import asyncio
+from fastapi import APIRouter, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from typing import Any, Dict, List
+from app.core.loop_monitor import recent_stalls
+from app.core.profiler import list_profiles, profile_path
+
+router = APIRouter()
+
+
+@router.get("/profiles")
+async def get_profiles() -> List[Dict[str, Any]]:
+    """List kept request profiles, newest first."""
+    return await asyncio.to_thread(list_profiles)
+
+
+@router.get("/profiles/{profile_id}/{kind}", response_class=PlainTextResponse)
+async def get_profile(profile_id: str, kind: str):
+    """Download a profile's collapsed stacks ("collapsed") or allocation top ("allocations")."""
+    path = await asyncio.to_thread(profile_path, profile_id, kind)
+    if path is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Profile not found"
+        )
+    return PlainTextResponse(await asyncio.to_thread(path.read_text))
+
+
+@router.get("/stalls")
+async def get_stalls() -> List[Dict[str, Any]]:
+    """List recent event loop stalls with the route and stack that caused them."""
+    return [
+        {
+            "route": stall.route,
+            "location": stall.location,
+            "lag_ms": round(stall.lag * 1000, 1) if stall.lag is not None else None,
+            "stack": stall.stack,
+        }
+        for stall in recent_stalls()
+    ]
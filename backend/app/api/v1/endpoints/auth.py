@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
 from datetime import datetime, timedelta
-from app.db.base import get_db
+from app.db.base import get_async_db
 from app.core.security import (
-    verify_password, get_password_hash,
+    verify_password_async, get_password_hash_async,
     create_access_token, create_refresh_token,
     decode_token, create_password_reset_token,
     verify_password_reset_token
@@ -21,11 +22,11 @@ router = APIRouter()
 @router.post("/register", response_model=UserResponse)
 async def register(
     user_data: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Register a new user."""
     # Check if username already exists
-    existing_username = db.query(User).filter(User.username == user_data.username).first()
+    existing_username = await db.scalar(select(User).filter(User.username == user_data.username))
     if existing_username:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -33,7 +34,7 @@ async def register(
         )
     
     # Check if email already exists
-    existing_email = db.query(User).filter(User.email == user_data.email).first()
+    existing_email = await db.scalar(select(User).filter(User.email == user_data.email))
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -41,7 +42,7 @@ async def register(
         )
     
     # Create new user
-    hashed_password = get_password_hash(user_data.password)
+    hashed_password = await get_password_hash_async(user_data.password)
     new_user = User(
         username=user_data.username,
         email=user_data.email,
@@ -49,8 +50,8 @@ async def register(
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     return new_user
 
@@ -58,13 +59,13 @@ async def register(
 @router.post("/login", response_model=TokenResponse)
 async def login(
     user_credentials: UserLogin,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Login and get access tokens."""
     # Find user by email
-    user = db.query(User).filter(User.email == user_credentials.email).first()
+    user = await db.scalar(select(User).filter(User.email == user_credentials.email))
     
-    if not user or not verify_password(user_credentials.password, user.password_hash):
+    if not user or not await verify_password_async(user_credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
@@ -90,7 +91,7 @@ async def login(
 @router.post("/refresh-token", response_model=TokenResponse)
 async def refresh_token(
     token_data: RefreshTokenRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Refresh access token using refresh token."""
     credentials_exception = HTTPException(
@@ -110,7 +111,7 @@ async def refresh_token(
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    user = await db.scalar(select(User).filter(User.id == user_id))
     if user is None or not user.is_active:
         raise credentials_exception
     
@@ -134,10 +135,10 @@ async def logout():
 @router.post("/reset-password")
 async def reset_password_request(
     reset_data: PasswordResetRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Request password reset token."""
-    user = db.query(User).filter(User.email == reset_data.email).first()
+    user = await db.scalar(select(User).filter(User.email == reset_data.email))
     
     # Always return success to prevent email enumeration
     if user and user.is_active:
@@ -152,7 +153,7 @@ async def reset_password_request(
 @router.post("/reset-password/confirm")
 async def reset_password_confirm(
     reset_data: PasswordResetConfirm,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Confirm password reset with token."""
     email = verify_password_reset_token(reset_data.token)
@@ -162,7 +163,7 @@ async def reset_password_confirm(
             detail="Invalid or expired reset token"
         )
     
-    user = db.query(User).filter(User.email == email).first()
+    user = await db.scalar(select(User).filter(User.email == email))
     if not user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -170,10 +171,10 @@ async def reset_password_confirm(
         )
     
     # Update password
-    user.password_hash = get_password_hash(reset_data.new_password)
+    user.password_hash = await get_password_hash_async(reset_data.new_password)
     user.updated_at = datetime.utcnow()
     
-    db.commit()
+    await db.commit()
     
     return {"message": "Password successfully reset"}
 
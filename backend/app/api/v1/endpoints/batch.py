@@ -0,0 +1,37 @@
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from app.core.config import settings
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.services.batch import run_batch
+from app.schemas.batch import BatchRequest, BatchResponse
+
+router = APIRouter()
+
+
+@router.post("", response_model=BatchResponse)
+async def batch(
+    request: Request,
+    batch_request: BatchRequest,
+    current_user: User = Depends(get_current_user)
+):
+    """Run several GET requests in one round trip.
+    
+    The caller is authenticated once for the whole batch. Sub-requests run
+    concurrently (up to BATCH_CONCURRENCY), each through the normal route
+    with its own pooled session; results come back in request order with
+    their own status, headers and body.
+    """
+    if len(batch_request.requests) > settings.BATCH_MAX_REQUESTS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {settings.BATCH_MAX_REQUESTS} requests per batch"
+        )
+    
+    body = await run_batch(
+        request.app,
+        request.scope,
+        current_user,
+        [(item.id, item.path) for item in batch_request.requests],
+        settings.BATCH_CONCURRENCY
+    )
+    return Response(content=body, media_type="application/json")
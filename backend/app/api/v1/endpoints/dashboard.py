@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.base import get_async_db
+from app.core.dependencies import get_current_user
+from app.core.query_budget import query_budget
+from app.models.user import User
+from app.services.dashboard import get_dashboard
+from app.schemas.dashboard import DashboardResponse
+
+router = APIRouter()
+
+
+@router.get("", response_model=DashboardResponse, dependencies=[Depends(query_budget(5))])
+async def dashboard(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get today's home screen: active habits, open todos, calories by meal and last night's sleep.
+    
+    The encoded payload is kept in the response cache per user and dropped
+    as soon as one of the user's food, sleep, habit or todo writes commits.
+    """
+    return Response(content=await get_dashboard(db, current_user.id), media_type="application/json")
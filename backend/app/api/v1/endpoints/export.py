@@ -0,0 +1,45 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from datetime import date
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.services.export import EXPORT_TABLES, stream_export
+
+router = APIRouter()
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+@router.get("")
+async def export_data(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    tables: Optional[str] = Query(None, description="Comma-separated subset of tables"),
+    compress: bool = True,
+    current_user: User = Depends(get_current_user)
+):
+    """Stream all of the user's data as gzip-compressed NDJSON or CSV."""
+    selected = None
+    if tables:
+        selected = [table.strip() for table in tables.split(",") if table.strip()]
+        known = {table for table, *_ in EXPORT_TABLES}
+        unknown = [table for table in selected if table not in known]
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown tables: {', '.join(unknown)}"
+            )
+    
+    filename = f"habito-export-{date.today().isoformat()}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if compress:
+        filename += ".gz"
+        media_type = "application/gzip"
+    
+    # The generator opens its own session: yield dependencies are closed
+    # before a streaming body is sent
+    return StreamingResponse(
+        stream_export(current_user.id, format, compress, selected),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
@@ -1,31 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
 from typing import List, Optional
 from datetime import datetime, date, timedelta
-from app.db.base import get_db
+from app.db.base import get_async_db
 from app.core.dependencies import get_current_user, PaginationParams
+from app.core.pagination import paginate
+from app.core.response_cache import CachedResponse, cached_response, conditional_get
+from app.core.singleflight import single_flight
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.models.food import FoodEntry, MealCategory
+from app.services.food_rollups import (
+    add_entry_to_rollup, remove_entry_from_rollup, entry_contribution, move_entry_in_rollups,
+    get_daily_rollup_summary, get_range_rollup_summaries
+)
+from app.services.food_search import search_foods
 from app.schemas.food import (
     FoodEntryCreate, FoodEntryUpdate, FoodEntryResponse,
-    DailySummaryResponse
+    DailySummaryResponse, RangeSummaryResponse, FoodSearchResponse
 )
 
 router = APIRouter()
 
 
-@router.get("/entries", response_model=List[FoodEntryResponse])
+@router.get(
+    "/entries",
+    response_model=List[FoodEntryResponse],
+    dependencies=[Depends(query_budget(2)), Depends(conditional_get("food"))]
+)
 async def get_food_entries(
+    response: Response,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     meal_category: Optional[MealCategory] = None,
     pagination: PaginationParams = Depends(),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's food entries with optional filters."""
-    query = db.query(FoodEntry).filter(FoodEntry.user_id == current_user.id)
+    query = select(FoodEntry).filter(FoodEntry.user_id == current_user.id)
     
     if date_from:
         query = query.filter(FoodEntry.logged_at >= date_from)
@@ -34,10 +48,11 @@ async def get_food_entries(
     if meal_category:
         query = query.filter(FoodEntry.meal_category == meal_category)
     
-    entries = query.order_by(FoodEntry.logged_at.desc())\
-                   .offset(pagination.skip)\
-                   .limit(pagination.limit)\
-                   .all()
+    entries = await paginate(
+        db, query,
+        [(FoodEntry.logged_at, True), (FoodEntry.id, True)],
+        pagination, response
+    )
     
     return entries
 
@@ -46,7 +61,7 @@ async def get_food_entries(
 async def create_food_entry(
     entry_data: FoodEntryCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new food entry."""
     new_entry = FoodEntry(
@@ -60,8 +75,9 @@ async def create_food_entry(
     )
     
     db.add(new_entry)
-    db.commit()
-    db.refresh(new_entry)
+    await add_entry_to_rollup(db, new_entry)
+    await db.commit()
+    await db.refresh(new_entry)
     
     return new_entry
 
@@ -70,15 +86,15 @@ async def create_food_entry(
 async def get_food_entry(
     entry_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific food entry."""
-    entry = db.query(FoodEntry).filter(
+    entry = await db.scalar(select(FoodEntry).filter(
         and_(
             FoodEntry.id == entry_id,
             FoodEntry.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not entry:
         raise HTTPException(
@@ -94,15 +110,15 @@ async def update_food_entry(
     entry_id: str,
     entry_data: FoodEntryUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a food entry."""
-    entry = db.query(FoodEntry).filter(
+    entry = await db.scalar(select(FoodEntry).filter(
         and_(
             FoodEntry.id == entry_id,
             FoodEntry.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not entry:
         raise HTTPException(
@@ -110,15 +126,19 @@ async def update_food_entry(
             detail="Food entry not found"
         )
     
+    old_day, old_contribution = entry.logged_at.date(), entry_contribution(entry)
+    
     # Update fields if provided
     update_data = entry_data.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(entry, field, value)
     
     entry.updated_at = datetime.utcnow()
+    # Move the entry's contribution out of its old day and into its new one
+    await move_entry_in_rollups(db, entry, old_day, old_contribution)
     
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     
     return entry
 
@@ -127,15 +147,15 @@ async def update_food_entry(
 async def delete_food_entry(
     entry_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a food entry."""
-    entry = db.query(FoodEntry).filter(
+    entry = await db.scalar(select(FoodEntry).filter(
         and_(
             FoodEntry.id == entry_id,
             FoodEntry.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not entry:
         raise HTTPException(
@@ -143,76 +163,69 @@ async def delete_food_entry(
             detail="Food entry not found"
         )
     
-    db.delete(entry)
-    db.commit()
+    await remove_entry_from_rollup(db, entry)
+    await db.delete(entry)
+    await db.commit()
 
 
-@router.get("/daily-summary", response_model=DailySummaryResponse)
+@router.get("/daily-summary", response_model=DailySummaryResponse, dependencies=[Depends(query_budget(2))])
+@single_flight("target_date")
 async def get_daily_summary(
     target_date: Optional[date] = None,
+    cached: CachedResponse = Depends(cached_response("food")),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get daily nutrition summary."""
+    if cached.hit is not None:
+        return cached.hit
+    
     if not target_date:
         target_date = date.today()
     
-    start_time = datetime.combine(target_date, datetime.min.time())
-    end_time = datetime.combine(target_date, datetime.max.time())
+    summary = await get_daily_rollup_summary(db, current_user.id, target_date)
     
-    entries = db.query(FoodEntry).filter(
-        and_(
-            FoodEntry.user_id == current_user.id,
-            FoodEntry.logged_at >= start_time,
-            FoodEntry.logged_at <= end_time
+    return await cached.store(DailySummaryResponse(date=target_date.isoformat(), **summary))
+
+
+@router.get(
+    "/range-summary",
+    response_model=RangeSummaryResponse,
+    dependencies=[Depends(query_budget(2)), Depends(conditional_get("food"))]
+)
+async def get_range_summary(
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get nutrition totals and per-day summaries for a date range."""
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="'to' must not be before 'from'"
+        )
+    if (date_to - date_from).days > 366:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Date range cannot exceed 366 days"
         )
-    ).all()
-    
-    # Calculate summaries
-    total_calories = sum(entry.calories for entry in entries)
-    meal_breakdown = {}
-    nutritional_summary = {
-        "carbs": 0,
-        "protein": 0,
-        "fat": 0,
-        "fiber": 0,
-        "sugar": 0,
-        "sodium": 0
-    }
-    
-    for entry in entries:
-        # Meal breakdown
-        category = entry.meal_category.value
-        meal_breakdown[category] = meal_breakdown.get(category, 0) + entry.calories
-        
-        # Nutritional summary
-        if entry.nutritional_info:
-            for nutrient, value in entry.nutritional_info.items():
-                if nutrient in nutritional_summary and value:
-                    nutritional_summary[nutrient] += value
-    
-    return DailySummaryResponse(
-        date=target_date.isoformat(),
-        total_calories=total_calories,
-        meal_breakdown=meal_breakdown,
-        entries_count=len(entries),
-        nutritional_summary=nutritional_summary
+    
+    totals, days = await get_range_rollup_summaries(db, current_user.id, date_from, date_to)
+    
+    return RangeSummaryResponse(
+        date_from=date_from.isoformat(),
+        date_to=date_to.isoformat(),
+        days=[DailySummaryResponse(date=day.isoformat(), **summary) for day, summary in days],
+        **totals
     )
 
 
-@router.get("/search")
+@router.get("/search", response_model=FoodSearchResponse)
 async def search_food(
-    query: str = Query(..., min_length=1),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    query: str = Query(..., min_length=1, max_length=100),
+    pagination: PaginationParams = Depends(),
+    current_user: User = Depends(get_current_user)
 ):
-    """Search for food items (placeholder for food database integration)."""
-    # This is a placeholder for food database search
-    # In production, this would integrate with a nutrition API
-    return {
-        "results": [
-            {"name": "Apple", "calories": 95, "serving": "1 medium"},
-            {"name": "Banana", "calories": 105, "serving": "1 medium"},
-            {"name": "Orange", "calories": 62, "serving": "1 medium"}
-        ]
-    }
\ No newline at end of file
+    """Search the food database by name, tolerating prefixes and typos."""
+    return search_foods(query, skip=pagination.skip, limit=pagination.limit)
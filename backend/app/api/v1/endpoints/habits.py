@@ -1,117 +1,54 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
-from datetime import datetime, date, timedelta
-from app.db.base import get_db
+from datetime import datetime, date
+from app.db.base import get_async_db
 from app.core.dependencies import get_current_user
+from app.core.response_cache import CachedResponse, cached_response
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.models.habit import Habit, HabitCompletion
+from app.services.habit_bitmap import read_bitmap
+from app.services.habits import build_habit_response, get_habits_with_today_status
+from app.services.streaks import apply_completion_added, apply_completion_removed
 from app.schemas.habit import (
     HabitCreate, HabitUpdate, HabitResponse,
-    HabitCompletionCreate, HabitCompletionResponse
+    HabitCompletionCreate, HabitCompletionResponse, HabitCalendarResponse
 )
 
 router = APIRouter()
 
 
-def update_habit_streak(habit: Habit, db: Session):
-    """Update habit streak based on completions."""
-    today = date.today()
-    yesterday = today - timedelta(days=1)
-    
-    # Check if completed today
-    today_completion = db.query(HabitCompletion).filter(
-        and_(
-            HabitCompletion.habit_id == habit.id,
-            HabitCompletion.completion_date == today
-        )
-    ).first()
-    
-    # Check if completed yesterday
-    yesterday_completion = db.query(HabitCompletion).filter(
-        and_(
-            HabitCompletion.habit_id == habit.id,
-            HabitCompletion.completion_date == yesterday
-        )
-    ).first()
-    
-    if today_completion:
-        if yesterday_completion:
-            # Continue streak
-            habit.current_streak = habit.current_streak + 1 if habit.current_streak >= 0 else 1
-        else:
-            # Start new streak
-            habit.current_streak = 1
-    else:
-        if not yesterday_completion:
-            # Streak broken
-            habit.current_streak = 0
-    
-    # Update longest streak
-    if habit.current_streak > habit.longest_streak:
-        habit.longest_streak = habit.current_streak
-    
-    db.commit()
-
-
-@router.get("/", response_model=List[HabitResponse])
+@router.get("/", response_model=List[HabitResponse], dependencies=[Depends(query_budget(2))])
 async def get_habits(
     is_active: Optional[bool] = None,
+    cached: CachedResponse = Depends(cached_response("habits")),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's habits."""
-    query = db.query(Habit).filter(Habit.user_id == current_user.id)
-    
-    if is_active is not None:
-        query = query.filter(Habit.is_active == is_active)
-    
-    habits = query.order_by(Habit.created_at.desc()).all()
+    if cached.hit is not None:
+        return cached.hit
     
-    # Check if each habit is completed today
-    today = date.today()
-    habit_responses = []
-    
-    for habit in habits:
-        completion = db.query(HabitCompletion).filter(
-            and_(
-                HabitCompletion.habit_id == habit.id,
-                HabitCompletion.completion_date == today
-            )
-        ).first()
-        
-        habit_dict = {
-            "id": habit.id,
-            "user_id": habit.user_id,
-            "name": habit.name,
-            "description": habit.description,
-            "current_streak": habit.current_streak,
-            "longest_streak": habit.longest_streak,
-            "is_active": habit.is_active,
-            "created_at": habit.created_at,
-            "updated_at": habit.updated_at,
-            "is_completed_today": completion is not None
-        }
-        habit_responses.append(HabitResponse(**habit_dict))
-    
-    return habit_responses
+    return await cached.store(await get_habits_with_today_status(db, current_user.id, is_active=is_active))
 
 
 @router.post("/", response_model=HabitResponse, status_code=status.HTTP_201_CREATED)
 async def create_habit(
     habit_data: HabitCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new habit."""
     # Check if user has reached habit limit (3 active habits)
-    active_habits_count = db.query(func.count(Habit.id)).filter(
+    active_habits_count = await db.scalar(select(func.count(Habit.id)).filter(
         and_(
             Habit.user_id == current_user.id,
             Habit.is_active == True
         )
-    ).scalar()
+    ))
     
     if active_habits_count >= 3:
         raise HTTPException(
@@ -126,28 +63,44 @@ async def create_habit(
     )
     
     db.add(new_habit)
-    db.commit()
-    db.refresh(new_habit)
+    await db.commit()
+    await db.refresh(new_habit)
     
-    return HabitResponse(
-        **new_habit.__dict__,
-        is_completed_today=False
-    )
+    return build_habit_response(new_habit, is_completed_today=False)
 
 
 @router.get("/{habit_id}", response_model=HabitResponse)
 async def get_habit(
     habit_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific habit."""
-    habit = db.query(Habit).filter(
+    habits = await get_habits_with_today_status(db, current_user.id, habit_id=habit_id)
+    
+    if not habits:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Habit not found"
+        )
+    
+    return habits[0]
+
+
+@router.get("/{habit_id}/calendar", response_model=HabitCalendarResponse)
+async def get_habit_calendar(
+    habit_id: str,
+    year: Optional[int] = Query(None, ge=1970, le=9999),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get a year of daily completions for a heatmap, served from the completion bitmap."""
+    habit = await db.scalar(select(Habit).filter(
         and_(
             Habit.id == habit_id,
             Habit.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not habit:
         raise HTTPException(
@@ -155,18 +108,26 @@ async def get_habit(
             detail="Habit not found"
         )
     
-    # Check if completed today
     today = date.today()
-    completion = db.query(HabitCompletion).filter(
-        and_(
-            HabitCompletion.habit_id == habit.id,
-            HabitCompletion.completion_date == today
-        )
-    ).first()
-    
-    return HabitResponse(
-        **habit.__dict__,
-        is_completed_today=completion is not None
+    year = year or today.year
+    # A legacy habit's bitmap is built in memory; recompute_streaks --missing-only stores them
+    bitmap = await read_bitmap(db, habit)
+    
+    start = date(year, 1, 1)
+    end = date(year, 12, 31)
+    days_in_year = (end - start).days + 1
+    flags = bitmap.last_n_days(days_in_year, end)
+    # Only days up to today count towards the completion rate
+    elapsed_end = min(end, today)
+    
+    return HabitCalendarResponse(
+        habit_id=habit.id,
+        year=year,
+        days=[int(flag) for flag in flags],
+        completed_days=bitmap.count(start, end),
+        completion_rate=round(bitmap.completion_rate(start, elapsed_end), 4) if elapsed_end >= start else 0.0,
+        current_streak=bitmap.current_streak(today),
+        longest_streak=bitmap.longest_streak()
     )
 
 
@@ -175,15 +136,15 @@ async def update_habit(
     habit_id: str,
     habit_data: HabitUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a habit."""
-    habit = db.query(Habit).filter(
+    habit = await db.scalar(select(Habit).filter(
         and_(
             Habit.id == habit_id,
             Habit.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not habit:
         raise HTTPException(
@@ -193,12 +154,12 @@ async def update_habit(
     
     # If activating a habit, check limit
     if habit_data.is_active is True and not habit.is_active:
-        active_habits_count = db.query(func.count(Habit.id)).filter(
+        active_habits_count = await db.scalar(select(func.count(Habit.id)).filter(
             and_(
                 Habit.user_id == current_user.id,
                 Habit.is_active == True
             )
-        ).scalar()
+        ))
         
         if active_habits_count >= 3:
             raise HTTPException(
@@ -213,37 +174,26 @@ async def update_habit(
     
     habit.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(habit)
+    await db.commit()
     
-    # Check if completed today
-    today = date.today()
-    completion = db.query(HabitCompletion).filter(
-        and_(
-            HabitCompletion.habit_id == habit.id,
-            HabitCompletion.completion_date == today
-        )
-    ).first()
-    
-    return HabitResponse(
-        **habit.__dict__,
-        is_completed_today=completion is not None
-    )
+    # Reload with today's completion flag
+    habits = await get_habits_with_today_status(db, current_user.id, habit_id=habit.id)
+    return habits[0]
 
 
 @router.delete("/{habit_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_habit(
     habit_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a habit."""
-    habit = db.query(Habit).filter(
+    habit = await db.scalar(select(Habit).filter(
         and_(
             Habit.id == habit_id,
             Habit.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not habit:
         raise HTTPException(
@@ -251,8 +201,8 @@ async def delete_habit(
             detail="Habit not found"
         )
     
-    db.delete(habit)
-    db.commit()
+    await db.delete(habit)
+    await db.commit()
 
 
 @router.post("/{habit_id}/complete", response_model=HabitCompletionResponse)
@@ -260,15 +210,16 @@ async def complete_habit(
     habit_id: str,
     completion_data: Optional[HabitCompletionCreate] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark a habit as complete for a specific date."""
-    habit = db.query(Habit).filter(
+    # Lock the habit row so concurrent completions don't overwrite each other's bitmap
+    habit = await db.scalar(select(Habit).filter(
         and_(
             Habit.id == habit_id,
             Habit.user_id == current_user.id
         )
-    ).first()
+    ).with_for_update())
     
     if not habit:
         raise HTTPException(
@@ -276,15 +227,15 @@ async def complete_habit(
             detail="Habit not found"
         )
     
-    completion_date = completion_data.completion_date if completion_data else date.today()
+    completion_date = (completion_data and completion_data.completion_date) or date.today()
     
     # Check if already completed for this date
-    existing_completion = db.query(HabitCompletion).filter(
+    existing_completion = await db.scalar(select(HabitCompletion).filter(
         and_(
             HabitCompletion.habit_id == habit_id,
             HabitCompletion.completion_date == completion_date
         )
-    ).first()
+    ))
     
     if existing_completion:
         raise HTTPException(
@@ -300,12 +251,20 @@ async def complete_habit(
     )
     
     db.add(new_completion)
-    db.commit()
     
-    # Update streak
-    update_habit_streak(habit, db)
+    # Update streaks in the same transaction
+    await apply_completion_added(db, habit, completion_date)
     
-    db.refresh(new_completion)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request completed the habit after our check
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Habit already completed for {completion_date}"
+        )
+    await db.refresh(new_completion)
     
     return new_completion
 
@@ -315,19 +274,19 @@ async def uncomplete_habit(
     habit_id: str,
     completion_date: Optional[date] = None,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Remove completion for a habit on a specific date."""
     if not completion_date:
         completion_date = date.today()
     
-    completion = db.query(HabitCompletion).filter(
+    completion = await db.scalar(select(HabitCompletion).filter(
         and_(
             HabitCompletion.habit_id == habit_id,
             HabitCompletion.user_id == current_user.id,
             HabitCompletion.completion_date == completion_date
         )
-    ).first()
+    ))
     
     if not completion:
         raise HTTPException(
@@ -335,11 +294,12 @@ async def uncomplete_habit(
             detail="Habit completion not found"
         )
     
-    habit = db.query(Habit).filter(Habit.id == habit_id).first()
+    habit = await db.scalar(select(Habit).filter(Habit.id == habit_id).with_for_update())
     
-    db.delete(completion)
-    db.commit()
+    await db.delete(completion)
     
-    # Update streak
+    # Update streaks in the same transaction
     if habit:
-        update_habit_streak(habit, db)
\ No newline at end of file
+        await apply_completion_removed(db, habit, completion_date)
+    
+    await db.commit()
\ No newline at end of file
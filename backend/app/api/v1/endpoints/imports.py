@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Depends, Path, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+from app.db.base import get_async_db
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.services.imports import import_rows
+from app.schemas.imports import ImportResponse
+
+router = APIRouter()
+
+
+@router.post("/{kind}", response_model=ImportResponse)
+async def import_data(
+    request: Request,
+    kind: str = Path(..., pattern="^(food|sleep|habits)$"),
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Import food, sleep or habit history from a CSV or NDJSON request body.
+    
+    The body is parsed as it streams in (gzip with Content-Encoding: gzip).
+    The format defaults from Content-Type. Valid rows are imported in
+    batches; invalid ones are listed in the report with their row number.
+    """
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    compressed = request.headers.get("content-encoding", "").lower() == "gzip"
+    
+    return await import_rows(db, current_user.id, kind, request.stream(), format, compressed)
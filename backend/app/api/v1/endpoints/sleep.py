@@ -1,10 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func
+from sqlalchemy.exc import IntegrityError
 from typing import List, Optional
 from datetime import datetime, date, timedelta
-from app.db.base import get_db
+from app.db.base import get_async_db
 from app.core.dependencies import get_current_user, PaginationParams
+from app.core.pagination import paginate
+from app.core.response_cache import CachedResponse, cached_response, conditional_get
+from app.core.singleflight import single_flight
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.models.sleep import SleepEntry
 from app.schemas.sleep import (
@@ -24,26 +29,32 @@ def calculate_duration(bedtime: datetime, wake_time: datetime) -> float:
     return round(duration.total_seconds() / 3600, 2)
 
 
-@router.get("/entries", response_model=List[SleepEntryResponse])
+@router.get(
+    "/entries",
+    response_model=List[SleepEntryResponse],
+    dependencies=[Depends(query_budget(2)), Depends(conditional_get("sleep"))]
+)
 async def get_sleep_entries(
+    response: Response,
     date_from: Optional[date] = None,
     date_to: Optional[date] = None,
     pagination: PaginationParams = Depends(),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's sleep entries with optional filters."""
-    query = db.query(SleepEntry).filter(SleepEntry.user_id == current_user.id)
+    query = select(SleepEntry).filter(SleepEntry.user_id == current_user.id)
     
     if date_from:
         query = query.filter(SleepEntry.date >= date_from)
     if date_to:
         query = query.filter(SleepEntry.date <= date_to)
     
-    entries = query.order_by(SleepEntry.date.desc())\
-                   .offset(pagination.skip)\
-                   .limit(pagination.limit)\
-                   .all()
+    entries = await paginate(
+        db, query,
+        [(SleepEntry.date, True), (SleepEntry.id, True)],
+        pagination, response
+    )
     
     return entries
 
@@ -52,7 +63,7 @@ async def get_sleep_entries(
 async def create_sleep_entry(
     entry_data: SleepEntryCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new sleep entry."""
     # Calculate duration
@@ -62,12 +73,12 @@ async def create_sleep_entry(
     sleep_date = entry_data.wake_time.date()
     
     # Check if entry already exists for this date
-    existing_entry = db.query(SleepEntry).filter(
+    existing_entry = await db.scalar(select(SleepEntry).filter(
         and_(
             SleepEntry.user_id == current_user.id,
             SleepEntry.date == sleep_date
         )
-    ).first()
+    ))
     
     if existing_entry:
         raise HTTPException(
@@ -86,8 +97,16 @@ async def create_sleep_entry(
     )
     
     db.add(new_entry)
-    db.commit()
-    db.refresh(new_entry)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request created the entry after our check
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Sleep entry already exists for {sleep_date}"
+        )
+    await db.refresh(new_entry)
     
     return new_entry
 
@@ -96,15 +115,15 @@ async def create_sleep_entry(
 async def get_sleep_entry(
     entry_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific sleep entry."""
-    entry = db.query(SleepEntry).filter(
+    entry = await db.scalar(select(SleepEntry).filter(
         and_(
             SleepEntry.id == entry_id,
             SleepEntry.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not entry:
         raise HTTPException(
@@ -120,15 +139,15 @@ async def update_sleep_entry(
     entry_id: str,
     entry_data: SleepEntryUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a sleep entry."""
-    entry = db.query(SleepEntry).filter(
+    entry = await db.scalar(select(SleepEntry).filter(
         and_(
             SleepEntry.id == entry_id,
             SleepEntry.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not entry:
         raise HTTPException(
@@ -146,7 +165,18 @@ async def update_sleep_entry(
         entry.duration_hours = calculate_duration(bedtime, wake_time)
         
         # Update date based on new wake time
-        if "wake_time" in update_data:
+        if "wake_time" in update_data and wake_time.date() != entry.date:
+            existing_entry = await db.scalar(select(SleepEntry.id).filter(
+                and_(
+                    SleepEntry.user_id == current_user.id,
+                    SleepEntry.date == wake_time.date()
+                )
+            ))
+            if existing_entry:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Sleep entry already exists for {wake_time.date()}"
+                )
             entry.date = wake_time.date()
     
     for field, value in update_data.items():
@@ -160,8 +190,8 @@ async def update_sleep_entry(
     
     entry.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(entry)
+    await db.commit()
+    await db.refresh(entry)
     
     return entry
 
@@ -170,15 +200,15 @@ async def update_sleep_entry(
 async def delete_sleep_entry(
     entry_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a sleep entry."""
-    entry = db.query(SleepEntry).filter(
+    entry = await db.scalar(select(SleepEntry).filter(
         and_(
             SleepEntry.id == entry_id,
             SleepEntry.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not entry:
         raise HTTPException(
@@ -186,17 +216,22 @@ async def delete_sleep_entry(
             detail="Sleep entry not found"
         )
     
-    db.delete(entry)
-    db.commit()
+    await db.delete(entry)
+    await db.commit()
 
 
-@router.get("/weekly-summary", response_model=WeeklySummaryResponse)
+@router.get("/weekly-summary", response_model=WeeklySummaryResponse, dependencies=[Depends(query_budget(2))])
+@single_flight("start_date")
 async def get_weekly_summary(
     start_date: Optional[date] = None,
+    cached: CachedResponse = Depends(cached_response("sleep")),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get weekly sleep summary."""
+    if cached.hit is not None:
+        return cached.hit
+    
     if not start_date:
         # Default to current week (Monday to Sunday)
         today = date.today()
@@ -204,13 +239,13 @@ async def get_weekly_summary(
     
     end_date = start_date + timedelta(days=6)
     
-    entries = db.query(SleepEntry).filter(
+    entries = (await db.scalars(select(SleepEntry).filter(
         and_(
             SleepEntry.user_id == current_user.id,
             SleepEntry.date >= start_date,
             SleepEntry.date <= end_date
         )
-    ).order_by(SleepEntry.date).all()
+    ).order_by(SleepEntry.date))).all()
     
     # Calculate averages
     if entries:
@@ -232,11 +267,11 @@ async def get_weekly_summary(
             "wake_time": entry.wake_time.isoformat()
         })
     
-    return WeeklySummaryResponse(
+    return await cached.store(WeeklySummaryResponse(
         week_start=start_date,
         week_end=end_date,
         average_duration=round(avg_duration, 2),
         average_quality=round(avg_quality, 1) if avg_quality else None,
         total_entries=len(entries),
         daily_data=daily_data
-    )
\ No newline at end of file
+    ))
\ No newline at end of file
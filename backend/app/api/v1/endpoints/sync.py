@@ -0,0 +1,79 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_
+from app.db.base import get_async_db
+from app.core.dependencies import get_current_user
+from app.core.query_budget import query_budget
+from app.models.user import User
+from app.models.habit import Habit
+from app.models.sync import ChangeLog, SYNCED_MODELS, DELETE
+from app.services.habits import get_habits_with_today_status
+from app.schemas.sync import SyncChanges, SyncDeletions, SyncResponse
+
+router = APIRouter()
+
+MODELS_BY_ENTITY = {model.__tablename__: model for model in SYNCED_MODELS}
+
+
+# The log page, one query per synced model and a cold principal load
+@router.get("", response_model=SyncResponse, dependencies=[Depends(query_budget(len(SYNCED_MODELS) + 2))])
+async def sync(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=1000),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Get rows created, updated or deleted since a watermark.
+    
+    Changes are read from the change log in sequence order, `limit` log
+    entries per page. Pass the returned watermark as `since` until
+    `has_more` is false; start from 0 for a full download. Transactions
+    insert their log entries in commit order (see SyncClock), so a change
+    committed later always gets a higher seq than the watermark returned.
+    """
+    log = (await db.scalars(
+        select(ChangeLog).filter(
+            and_(
+                ChangeLog.user_id == current_user.id,
+                ChangeLog.seq > since
+            )
+        ).order_by(ChangeLog.seq).limit(limit + 1)
+    )).all()
+    
+    has_more = len(log) > limit
+    log = log[:limit]
+    
+    # Only the latest operation per row in this page matters
+    latest = {}
+    for change in log:
+        latest[(change.entity, change.entity_id)] = change.op
+    
+    upserts = {entity: [] for entity in MODELS_BY_ENTITY}
+    deleted = {entity: [] for entity in MODELS_BY_ENTITY}
+    for (entity, entity_id), op in latest.items():
+        (deleted if op == DELETE else upserts)[entity].append(entity_id)
+    
+    changes = {}
+    for entity, ids in upserts.items():
+        if not ids:
+            continue
+        if entity == Habit.__tablename__:
+            changes[entity] = await get_habits_with_today_status(db, current_user.id, habit_ids=ids)
+            continue
+        model = MODELS_BY_ENTITY[entity]
+        # Rows deleted after this page are skipped; their tombstones follow
+        changes[entity] = (await db.scalars(
+            select(model).filter(
+                and_(
+                    model.id.in_(ids),
+                    model.user_id == current_user.id
+                )
+            )
+        )).all()
+    
+    return SyncResponse(
+        changes=SyncChanges(**changes),
+        deleted=SyncDeletions(**deleted),
+        watermark=log[-1].seq if log else since,
+        has_more=has_more
+    )
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, func
 from typing import List, Optional
 from datetime import datetime
-from app.db.base import get_db
+from app.db.base import get_async_db
 from app.core.dependencies import get_current_user, PaginationParams
+from app.core.pagination import paginate
+from app.core.response_cache import CachedResponse, cached_response
+from app.core.query_budget import query_budget
 from app.models.user import User
 from app.models.todo import Todo
 from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse
@@ -12,16 +15,21 @@ from app.schemas.todo import TodoCreate, TodoUpdate, TodoResponse
 router = APIRouter()
 
 
-@router.get("/", response_model=List[TodoResponse])
+@router.get("/", response_model=List[TodoResponse], dependencies=[Depends(query_budget(2))])
 async def get_todos(
+    response: Response,
     is_completed: Optional[bool] = None,
     priority: Optional[int] = None,
     pagination: PaginationParams = Depends(),
+    cached: CachedResponse = Depends(cached_response("todos")),
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get user's todos with optional filters."""
-    query = db.query(Todo).filter(Todo.user_id == current_user.id)
+    if cached.hit is not None:
+        return cached.hit
+    
+    query = select(Todo).filter(Todo.user_id == current_user.id)
     
     if is_completed is not None:
         query = query.filter(Todo.is_completed == is_completed)
@@ -29,29 +37,30 @@ async def get_todos(
     if priority is not None:
         query = query.filter(Todo.priority == priority)
     
-    todos = query.order_by(Todo.priority, Todo.created_at.desc())\
-                 .offset(pagination.skip)\
-                 .limit(pagination.limit)\
-                 .all()
+    todos = await paginate(
+        db, query,
+        [(Todo.priority, False), (Todo.created_at, True), (Todo.id, True)],
+        pagination, response
+    )
     
-    return todos
+    return await cached.store(todos, response)
 
 
 @router.post("/", response_model=TodoResponse, status_code=status.HTTP_201_CREATED)
 async def create_todo(
     todo_data: TodoCreate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Create a new todo."""
     # Check if user has reached todo limit (3 priority todos)
-    active_todos_count = db.query(func.count(Todo.id)).filter(
+    active_todos_count = await db.scalar(select(func.count(Todo.id)).filter(
         and_(
             Todo.user_id == current_user.id,
             Todo.is_completed == False,
             Todo.priority <= 3
         )
-    ).scalar()
+    ))
     
     if active_todos_count >= 3:
         raise HTTPException(
@@ -68,8 +77,8 @@ async def create_todo(
     )
     
     db.add(new_todo)
-    db.commit()
-    db.refresh(new_todo)
+    await db.commit()
+    await db.refresh(new_todo)
     
     return new_todo
 
@@ -78,15 +87,15 @@ async def create_todo(
 async def get_todo(
     todo_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get a specific todo."""
-    todo = db.query(Todo).filter(
+    todo = await db.scalar(select(Todo).filter(
         and_(
             Todo.id == todo_id,
             Todo.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not todo:
         raise HTTPException(
@@ -102,15 +111,15 @@ async def update_todo(
     todo_id: str,
     todo_data: TodoUpdate,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update a todo."""
-    todo = db.query(Todo).filter(
+    todo = await db.scalar(select(Todo).filter(
         and_(
             Todo.id == todo_id,
             Todo.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not todo:
         raise HTTPException(
@@ -135,8 +144,8 @@ async def update_todo(
     
     todo.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(todo)
+    await db.commit()
+    await db.refresh(todo)
     
     return todo
 
@@ -145,15 +154,15 @@ async def update_todo(
 async def delete_todo(
     todo_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Delete a todo."""
-    todo = db.query(Todo).filter(
+    todo = await db.scalar(select(Todo).filter(
         and_(
             Todo.id == todo_id,
             Todo.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not todo:
         raise HTTPException(
@@ -161,23 +170,23 @@ async def delete_todo(
             detail="Todo not found"
         )
     
-    db.delete(todo)
-    db.commit()
+    await db.delete(todo)
+    await db.commit()
 
 
 @router.post("/{todo_id}/complete", response_model=TodoResponse)
 async def complete_todo(
     todo_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark a todo as complete."""
-    todo = db.query(Todo).filter(
+    todo = await db.scalar(select(Todo).filter(
         and_(
             Todo.id == todo_id,
             Todo.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not todo:
         raise HTTPException(
@@ -195,8 +204,8 @@ async def complete_todo(
     todo.completed_at = datetime.utcnow()
     todo.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(todo)
+    await db.commit()
+    await db.refresh(todo)
     
     return todo
 
@@ -205,15 +214,15 @@ async def complete_todo(
 async def uncomplete_todo(
     todo_id: str,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Mark a todo as incomplete."""
-    todo = db.query(Todo).filter(
+    todo = await db.scalar(select(Todo).filter(
         and_(
             Todo.id == todo_id,
             Todo.user_id == current_user.id
         )
-    ).first()
+    ))
     
     if not todo:
         raise HTTPException(
@@ -231,7 +240,7 @@ async def uncomplete_todo(
     todo.completed_at = None
     todo.updated_at = datetime.utcnow()
     
-    db.commit()
-    db.refresh(todo)
+    await db.commit()
+    await db.refresh(todo)
     
     return todo
\ No newline at end of file
@@ -0,0 +1 @@
+# Commands package initialization
\ No newline at end of file
@@ -0,0 +1,89 @@
+"""Rebuild completion bitmaps and current/longest streaks for every habit.
+
+Usage:
+    python -m app.commands.recompute_streaks [--chunk-size 500] [--missing-only]
+
+--missing-only backfills just the habits that have no bitmap yet.
+"""
+import argparse
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from app.core.response_cache import invalidate_users
+from app.db.base import SessionLocal
+from app.models.habit import Habit, HabitCompletion
+from app.models.sync import record_changes
+from app.services.habit_bitmap import CompletionBitmap
+
+logger = logging.getLogger(__name__)
+
+
+def recompute_all_streaks(
+    db: Session,
+    chunk_size: int = 500,
+    today: Optional[date] = None,
+    missing_only: bool = False
+) -> int:
+    """Rebuild bitmaps and streaks for all habits (or those without a bitmap), one chunk per commit."""
+    today = today or date.today()
+    processed = 0
+    last_id = ""
+    while True:
+        query = select(Habit.id, Habit.user_id).filter(Habit.id > last_id)
+        if missing_only:
+            query = query.filter(Habit.completion_bitmap.is_(None))
+        habits = db.execute(query.order_by(Habit.id).limit(chunk_size)).all()
+        if not habits:
+            break
+        habit_ids = [habit_id for habit_id, _ in habits]
+        
+        dates_by_habit = defaultdict(list)
+        for habit_id, completion_date in db.execute(
+            select(HabitCompletion.habit_id, HabitCompletion.completion_date)
+            .filter(HabitCompletion.habit_id.in_(habit_ids))
+        ):
+            dates_by_habit[habit_id].append(completion_date)
+        
+        rows = []
+        for habit_id in habit_ids:
+            bitmap = CompletionBitmap.from_dates(dates_by_habit[habit_id])
+            rows.append({
+                "id": habit_id,
+                "completion_bitmap": bitmap.to_bytes(),
+                "bitmap_origin": bitmap.origin,
+                "current_streak": bitmap.current_streak(today),
+                "longest_streak": bitmap.longest_streak()
+            })
+        db.execute(update(Habit), rows)
+        # Core bulk updates bypass the flush hook, so log them for delta sync
+        for habit_id, user_id in habits:
+            record_changes(db, user_id, Habit.__tablename__, [habit_id])
+        db.commit()
+        invalidate_users({user_id for _, user_id in habits}, ["habits"])
+        
+        processed += len(habit_ids)
+        last_id = habit_ids[-1]
+        logger.info(f"Recomputed streaks for {processed} habits")
+    return processed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild habit bitmaps and streaks from completions.")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--missing-only", action="store_true", help="Only backfill habits without a bitmap.")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        total = recompute_all_streaks(db, chunk_size=args.chunk_size, missing_only=args.missing_only)
+    finally:
+        db.close()
+    logger.info(f"Done: {total} habits")
+
+
+if __name__ == "__main__":
+    main()
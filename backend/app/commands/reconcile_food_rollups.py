@@ -0,0 +1,113 @@
+"""Rebuild food_daily_rollups from the raw food entries.
+
+Usage:
+    python -m app.commands.reconcile_food_rollups [--chunk-size 200]
+"""
+import argparse
+import logging
+from datetime import date
+from typing import Dict, List, Tuple
+from sqlalchemy import select, delete, func, Date
+from sqlalchemy.orm import Session
+from app.core.response_cache import invalidate_users
+from app.db.base import SessionLocal
+from app.models.food import FoodEntry, FoodDailyRollup
+from app.models.user import User
+from app.services.food_rollups import new_rollup, entry_contribution, apply_contribution
+from app.services.food_summary import JSON_AGGREGATE_DIALECTS, NUTRIENTS, summary_columns
+
+logger = logging.getLogger(__name__)
+
+Rollups = Dict[Tuple[str, date], FoodDailyRollup]
+
+
+def _summed_rollups(db: Session, user_ids: List[str]) -> Rollups:
+    """Rollups from one GROUP BY user, day and meal, with nutrients summed by the database."""
+    day = func.date(FoodEntry.logged_at, type_=Date)
+    rows = db.execute(
+        select(FoodEntry.user_id, day.label("day"), FoodEntry.meal_category,
+               *summary_columns(db.get_bind().dialect.name))
+        .filter(FoodEntry.user_id.in_(user_ids))
+        .group_by(FoodEntry.user_id, day, FoodEntry.meal_category)
+    )
+    rollups = {}
+    for row in rows:
+        key = (row.user_id, row.day)
+        if key not in rollups:
+            rollups[key] = new_rollup(*key)
+        meal = row.meal_category.value
+        calories = int(row.calories or 0)
+        contribution = {
+            "entries_count": row.entries_count,
+            "total_calories": calories,
+            f"{meal}_calories": calories,
+            f"{meal}_count": row.entries_count,
+        }
+        contribution.update({nutrient: float(getattr(row, nutrient) or 0) for nutrient in NUTRIENTS})
+        apply_contribution(rollups[key], contribution, 1)
+    return rollups
+
+
+def _loaded_rollups(db: Session, user_ids: List[str]) -> Rollups:
+    """Rollups summed in Python from every entry (dialects without JSON sums)."""
+    rollups = {}
+    entries = db.scalars(
+        select(FoodEntry).filter(FoodEntry.user_id.in_(user_ids)).execution_options(yield_per=1000)
+    )
+    for entry in entries:
+        key = (entry.user_id, entry.logged_at.date())
+        if key not in rollups:
+            rollups[key] = new_rollup(*key)
+        apply_contribution(rollups[key], entry_contribution(entry), 1)
+    return rollups
+
+
+def reconcile_food_rollups(db: Session, chunk_size: int = 200) -> int:
+    """Replace every user's rollups with totals recomputed from their entries.
+
+    The database sums each user, day and meal where it has JSON functions;
+    otherwise entries are loaded and summed with the incremental path's
+    per-entry contribution. One chunk of users per transaction. Returns the
+    number of rollup rows written.
+    """
+    summed = db.get_bind().dialect.name in JSON_AGGREGATE_DIALECTS
+    written = 0
+    last_id = ""
+    while True:
+        user_ids = db.scalars(
+            select(User.id).filter(User.id > last_id).order_by(User.id).limit(chunk_size)
+        ).all()
+        if not user_ids:
+            break
+        
+        rollups = _summed_rollups(db, user_ids) if summed else _loaded_rollups(db, user_ids)
+        
+        db.execute(delete(FoodDailyRollup).filter(FoodDailyRollup.user_id.in_(user_ids)))
+        db.add_all(rollups.values())
+        db.commit()
+        db.expunge_all()
+        # Daily summaries and the dashboard are served from the rollups
+        invalidate_users(user_ids, ["food"])
+        
+        written += len(rollups)
+        last_id = user_ids[-1]
+        logger.info(f"Reconciled {written} rollup rows")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild daily food rollups from food entries.")
+    parser.add_argument("--chunk-size", type=int, default=200)
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO)
+    db = SessionLocal()
+    try:
+        total = reconcile_food_rollups(db, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+    logger.info(f"Done: {total} rollup rows")
+
+
+if __name__ == "__main__":
+    main()
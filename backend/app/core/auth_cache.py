@@ -0,0 +1,204 @@
+import logging
+import secrets
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Optional, Set
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PrincipalSnapshot:
+    """Lightweight, session-independent copy of an authenticated user row."""
+    id: str
+    username: str
+    email: str
+    is_active: bool
+    is_verified: bool
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_user(cls, user: User) -> "PrincipalSnapshot":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            is_active=bool(user.is_active),
+            is_verified=bool(user.is_verified),
+            created_at=user.created_at,
+            updated_at=user.updated_at
+        )
+
+
+# Decoded access-token claims, keyed by the raw token
+token_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+# (generation, user snapshot), keyed by user id
+principal_cache = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+# Cached tokens of each user id, so their claims can be dropped with the snapshot
+user_tokens = TTLCache(
+    maxsize=settings.AUTH_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_CACHE_TTL_SECONDS
+)
+
+# Per-user generations shared by all workers; without Redis only the committing
+# worker drops its entries, which is enough for a single worker
+shared_generations = aioredis.from_url(settings.REDIS_URL) if settings.REDIS_URL else None
+
+# A generation outlives every entry cached under the one it replaced
+GENERATION_TTL_SECONDS = settings.AUTH_CACHE_TTL_SECONDS * 10
+
+
+def get_cached_claims(token: str) -> Optional[Dict[str, Any]]:
+    """Return previously decoded claims for token, if cached."""
+    return token_cache.get(token)
+
+
+def cache_claims(token: str, payload: Dict[str, Any]) -> None:
+    """Cache decoded claims, never beyond the token's own expiry."""
+    exp = payload.get("exp")
+    ttl = None
+    if exp is not None:
+        ttl = exp - datetime.now(timezone.utc).timestamp()
+        if ttl <= 0:
+            return
+    token_cache.set(token, payload, ttl=ttl)
+    user_id = payload.get("sub")
+    if user_id is not None:
+        tokens = user_tokens.get(user_id)
+        if tokens is None:
+            tokens = set()
+            user_tokens.set(user_id, tokens)
+        tokens.add(token)
+
+
+async def principal_generation(user_id: str) -> Optional[str]:
+    """Return the user's shared generation; None when there is none yet or no Redis.
+
+    When Redis fails the user's local entries are dropped instead, so the
+    request reads the user row rather than trusting a possibly revoked copy.
+    """
+    if shared_generations is None:
+        return None
+    try:
+        generation = await shared_generations.get(f"auth:{user_id}:gen")
+    except RedisError:
+        logger.warning("Auth generation lookup failed", exc_info=True)
+        invalidate_principal(user_id)
+        return None
+    return generation.decode() if generation is not None else None
+
+
+async def bump_principal_generations(user_ids: Iterable[str]) -> None:
+    """Start new generations, so every worker drops its entries for these users."""
+    if shared_generations is None:
+        return
+    try:
+        async with shared_generations.pipeline(transaction=False) as pipe:
+            for user_id in user_ids:
+                pipe.set(f"auth:{user_id}:gen", secrets.token_hex(8), ex=GENERATION_TTL_SECONDS)
+            await pipe.execute()
+    except RedisError:
+        # Other workers then only drop their entries by TTL
+        logger.error("Auth generation invalidation failed", exc_info=True)
+
+
+def get_cached_principal(user_id: str, generation: Optional[str] = None) -> Optional[PrincipalSnapshot]:
+    """Return the cached snapshot for user_id if it was cached under generation.
+
+    A snapshot from an older generation is dropped along with the user's tokens.
+    """
+    item = principal_cache.get(user_id)
+    if item is None:
+        return None
+    cached_generation, snapshot = item
+    if cached_generation != generation:
+        invalidate_principal(user_id)
+        return None
+    return snapshot
+
+
+def cache_principal(snapshot: PrincipalSnapshot, generation: Optional[str] = None) -> None:
+    """Cache a user snapshot under the generation read before loading it."""
+    principal_cache.set(snapshot.id, (generation, snapshot))
+
+
+def invalidate_principal(user_id: str) -> None:
+    """Drop the cached snapshot and token claims for user_id on this worker."""
+    principal_cache.pop(user_id)
+    for token in user_tokens.get(user_id) or ():
+        token_cache.pop(token)
+    user_tokens.pop(user_id)
+
+
+def auth_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Return hit/miss counters for the token and principal caches."""
+    return {"tokens": token_cache.stats(), "principals": principal_cache.stats()}
+
+
+# Invalidate snapshots once a change to a user's status or credentials commits.
+# Collecting in after_flush and acting in after_commit avoids re-caching a row
+# that another request read before the transaction finished.
+_INVALIDATING_ATTRS = ("is_active", "password_hash")
+_PENDING_KEY = "habito_invalidated_principals"
+
+# Users invalidated by commits of the current request, for the other workers
+_pending_generations: ContextVar[Optional[Set[str]]] = ContextVar("pending_generations", default=None)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changed_principals(session, flush_context):
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in session.dirty:
+        if isinstance(obj, User):
+            state = inspect(obj)
+            if any(state.attrs[attr].history.has_changes() for attr in _INVALIDATING_ATTRS):
+                pending.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            pending.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_principals(session):
+    pending = _pending_generations.get()
+    for user_id in session.info.pop(_PENDING_KEY, ()):
+        invalidate_principal(user_id)
+        if pending is not None:
+            pending.add(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_principals(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+async def invalidate_shared_principals():
+    """Router dependency starting new generations for the users a request changed.
+
+    Runs after the handler and before the response is sent, so once the
+    client sees the change no worker serves the users' old snapshots or claims.
+    """
+    pending: Set[str] = set()
+    _pending_generations.set(pending)
+    try:
+        yield
+    finally:
+        if pending:
+            await bump_principal_generations(pending)
@@ -1,6 +1,6 @@
 from typing import List, Optional
 from pydantic_settings import BaseSettings
-from pydantic import AnyHttpUrl, field_validator
+from pydantic import AnyHttpUrl, field_validator, model_validator
 import secrets
 import json
 
@@ -19,6 +19,8 @@ class Settings(BaseSettings):
     DB_USER: str = "root"
     DB_PASSWORD: str = "password"
     DB_NAME: str = "habito_db"
+    # Async driver URL; derived from DATABASE_URL when not set
+    ASYNC_DATABASE_URL: Optional[str] = None
     
     # JWT
     SECRET_KEY: str = secrets.token_urlsafe(32)
@@ -26,6 +28,59 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 1440  # 24 hours
     REFRESH_TOKEN_EXPIRE_DAYS: int = 30
     
+    # Password hashing executor ("thread" or "process")
+    PASSWORD_HASH_EXECUTOR: str = "thread"
+    PASSWORD_HASH_WORKERS: int = 4
+    # Hashing jobs allowed to run or wait before requests are rejected with 503
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    
+    # Authenticated-principal cache (TTL of 0 disables it)
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Food search dataset (CSV); defaults to the bundled app/data/foods.csv
+    FOOD_DATABASE_PATH: Optional[str] = None
+    
+    # /batch: sub-requests accepted per call and run at the same time
+    BATCH_MAX_REQUESTS: int = 20
+    BATCH_CONCURRENCY: int = 4
+    
+    # /dashboard sections use one pooled connection each; unset means only on server databases.
+    # The payload is cached by the response cache below
+    DASHBOARD_CONCURRENT_QUERIES: Optional[bool] = None
+    
+    # Response cache for read-heavy GETs: "memory", "redis" or "none"; unset means Redis
+    # when REDIS_URL is set, otherwise none. "memory" is per process, so for a single
+    # worker only: other workers would serve their copies until the TTL. MAX_BYTES bounds it
+    RESPONSE_CACHE_BACKEND: Optional[str] = None
+    RESPONSE_CACHE_TTL_SECONDS: int = 300
+    RESPONSE_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    
+    # Concurrent identical summary requests share one computation; waiting longer answers 504
+    SINGLE_FLIGHT_TIMEOUT_SECONDS: float = 10.0
+    
+    # Per-request SQL stats (Server-Timing header, logs). A statement shape run this many
+    # times in one request is reported as a likely N+1 loop; strict mode (the test suite)
+    # raises on that or on exceeding an endpoint's query_budget instead of logging
+    QUERY_REPEAT_THRESHOLD: int = 3
+    QUERY_BUDGET_STRICT: bool = False
+    
+    # Event loop watchdog: a stall longer than the threshold is logged and counted with the
+    # blocking stack and route (0 disables it); strict mode (the test suite) fails the request
+    LOOP_LAG_THRESHOLD_SECONDS: float = 0.1
+    LOOP_LAG_STRICT: bool = False
+    
+    # Operator endpoints under /admin require this key in X-Admin-Key (unset disables them)
+    ADMIN_API_KEY: Optional[str] = None
+    
+    # Request profiler, only installed when enabled: profiles PROFILE_SAMPLE_RATE of requests
+    # and any request with an X-Profile header signed with ADMIN_API_KEY, keeping the newest
+    # PROFILE_MAX_KEPT profiles in PROFILE_DIR
+    PROFILER_ENABLED: bool = False
+    PROFILE_SAMPLE_RATE: float = 0.0
+    PROFILE_DIR: str = "profiles"
+    PROFILE_MAX_KEPT: int = 100
+    
     # CORS
     BACKEND_CORS_ORIGINS: List[str] = ["http://localhost:3000"]
     
@@ -38,6 +93,30 @@ class Settings(BaseSettings):
             return [i.strip() for i in v.split(",")]
         return v
     
+    @field_validator("PROFILE_MAX_KEPT")
+    @classmethod
+    def keep_at_least_one_profile(cls, v: int) -> int:
+        # Pruning keeps the newest PROFILE_MAX_KEPT; 0 would delete each profile as it is written
+        if v < 1:
+            raise ValueError("PROFILE_MAX_KEPT must be at least 1")
+        return v
+    
+    @model_validator(mode="after")
+    def assemble_async_database_url(self) -> "Settings":
+        if not self.ASYNC_DATABASE_URL:
+            url = self.DATABASE_URL
+            for sync_prefix, async_prefix in (
+                ("mysql+pymysql://", "mysql+aiomysql://"),
+                ("mysql://", "mysql+aiomysql://"),
+                ("sqlite+pysqlite://", "sqlite+aiosqlite://"),
+                ("sqlite://", "sqlite+aiosqlite://"),
+            ):
+                if url.startswith(sync_prefix):
+                    url = async_prefix + url[len(sync_prefix):]
+                    break
+            self.ASYNC_DATABASE_URL = url
+        return self
+    
     # Redis
     REDIS_URL: Optional[str] = None
     
@@ -1,10 +1,16 @@
-from fastapi import Depends, HTTPException, status
+import hmac
+from fastapi import Depends, Header, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
+from sqlalchemy import select
 from jose import JWTError
 from typing import Optional
-from app.db.base import get_db
+from app.core.config import settings
+from app.db.base import AsyncSessionLocal
 from app.core.security import decode_token
+from app.core.auth_cache import (
+    PrincipalSnapshot, get_cached_claims, cache_claims,
+    get_cached_principal, cache_principal, principal_generation
+)
 from app.models.user import User
 
 
@@ -12,10 +18,21 @@ security = HTTPBearer()
 
 
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get the current authenticated user."""
+    request: Request,
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> PrincipalSnapshot:
+    """Get the current authenticated user.
+    
+    Decoded claims and a snapshot of the user row are cached, so a warm
+    request neither decodes the JWT nor checks out a database connection.
+    With Redis, one GET of the user's generation tells whether another
+    worker invalidated them. Sub-requests of a batch reuse the principal
+    the batch authenticated.
+    """
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+    
     token = credentials.credentials
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -23,9 +40,12 @@ async def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
     
-    payload = decode_token(token)
-    if payload is None:
-        raise credentials_exception
+    payload = get_cached_claims(token)
+    decoded = payload is None
+    if decoded:
+        payload = decode_token(token)
+        if payload is None:
+            raise credentials_exception
     
     if payload.get("type") != "access":
         raise credentials_exception
@@ -34,9 +54,18 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
     
-    user = db.query(User).filter(User.id == user_id).first()
+    # Read before the row, so a change committed meanwhile is not cached as current
+    generation = await principal_generation(user_id)
+    user = get_cached_principal(user_id, generation)
     if user is None:
-        raise credentials_exception
+        async with AsyncSessionLocal() as db:
+            db_user = await db.scalar(select(User).filter(User.id == user_id))
+            if db_user is None:
+                raise credentials_exception
+            user = PrincipalSnapshot.from_user(db_user)
+        cache_principal(user, generation)
+    if decoded:
+        cache_claims(token, payload)
     
     if not user.is_active:
         raise HTTPException(
@@ -48,8 +77,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: User = Depends(get_current_user)
-) -> User:
+    current_user: PrincipalSnapshot = Depends(get_current_user)
+) -> PrincipalSnapshot:
     """Get the current active user."""
     if not current_user.is_active:
         raise HTTPException(
@@ -59,12 +88,26 @@ async def get_current_active_user(
     return current_user
 
 
+async def require_admin(x_admin_key: Optional[str] = Header(None)) -> None:
+    """Allow only requests carrying ADMIN_API_KEY in X-Admin-Key; nobody when it is unset."""
+    if not settings.ADMIN_API_KEY or x_admin_key is None or not hmac.compare_digest(
+        x_admin_key.encode(), settings.ADMIN_API_KEY.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin key required"
+        )
+
+
 class PaginationParams:
     """Common pagination parameters."""
     def __init__(
         self,
         skip: int = 0,
-        limit: int = 20
+        limit: int = 20,
+        # Keyset cursor from X-Next-Cursor; takes precedence over skip
+        cursor: Optional[str] = None
     ):
         self.skip = skip
-        self.limit = min(limit, 100)  # Max 100 items per page
\ No newline at end of file
+        self.limit = min(limit, 100)  # Max 100 items per page
+        self.cursor = cursor
@@ -0,0 +1,245 @@
+import asyncio
+import gc
+import logging
+import sys
+import threading
+import time
+import traceback
+import weakref
+from collections import deque
+from pathlib import Path
+from types import FrameType
+from typing import Any, Deque, Dict, List, Optional, Tuple
+from starlette.types import ASGIApp, Receive, Scope, Send
+from app.core.config import settings
+from app.core.metrics import Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+CHECK_INTERVAL_SECONDS = 0.02
+STACK_LIMIT = 15
+RECENT_STALLS = 100
+# Frames from files under the project, other than libraries, are "our" code
+PROJECT_ROOT = str(Path(__file__).resolve().parents[2])
+
+LAG_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+loop_lag = Histogram(
+    "event_loop_lag_seconds", "How late the event loop ran a timer; time nothing else could run.",
+    buckets=LAG_BUCKETS
+)
+loop_blocked = Counter(
+    "event_loop_blocked_total", "Stalls over LOOP_LAG_THRESHOLD_SECONDS, by route and blocking line.",
+    ("route", "location")
+)
+
+
+class _GcClock:
+    """Time spent in garbage collection, which pauses every thread and is no route's fault."""
+
+    def __init__(self):
+        self.total = 0.0
+        self.started: Optional[float] = None
+
+    def callback(self, phase: str, info: Dict[str, Any]) -> None:
+        if phase == "start":
+            self.started = time.monotonic()
+        elif self.started is not None:
+            self.total += time.monotonic() - self.started
+            self.started = None
+
+    def now(self) -> float:
+        started = self.started
+        return self.total + (time.monotonic() - started if started is not None else 0.0)
+
+
+gc_clock = _GcClock()
+gc.callbacks.append(gc_clock.callback)
+
+
+class EventLoopBlocked(AssertionError):
+    """Raised in strict mode when a request blocked the event loop past the threshold."""
+
+
+class Stall:
+    """A stretch of time in which the event loop ran one piece of code without yielding."""
+
+    def __init__(self, route: str, location: str, stack: List[str], started_at: float, started_gc: float):
+        self.route = route
+        self.location = location
+        self.stack = stack
+        self.started_at = started_at
+        self.started_gc = started_gc
+        self.lag: Optional[float] = None
+
+    def finish(self) -> None:
+        """Record how long the loop was blocked, less GC pauses, and log it once the loop runs again."""
+        if self.lag is None:
+            self.lag = time.monotonic() - self.started_at - (gc_clock.now() - self.started_gc)
+            logger.warning(f"{self.describe()}\n" + "".join(self.stack))
+
+    def describe(self) -> str:
+        lag = f"{self.lag * 1000:.0f} ms" if self.lag is not None else "over the threshold"
+        return f"{self.route} blocked the event loop for {lag} at {self.location}"
+
+
+def _location(frame: FrameType) -> str:
+    # The innermost project line: library frames below it are what it called
+    innermost = frame
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(PROJECT_ROOT) and "site-packages" not in filename:
+            innermost = frame
+            break
+        frame = frame.f_back
+    return f"{Path(innermost.f_code.co_filename).name}:{innermost.f_lineno} in {innermost.f_code.co_name}"
+
+
+def _route_from_scope(scope: Optional[Scope]) -> Optional[str]:
+    if scope is None:
+        return None
+    # Before routing (middleware, dependencies of the app) only the method is known
+    route = scope.get("route")
+    return f"{scope['method']} {route.path}" if route is not None else f"{scope['method']} (unrouted)"
+
+
+def _route_from_stack(frame: FrameType, endpoints: Dict[Any, str]) -> Optional[str]:
+    while frame is not None:
+        route = endpoints.get(frame.f_code)
+        if route is not None:
+            return route
+        frame = frame.f_back
+    return None
+
+
+class LoopWatchdog:
+    """Measure one event loop's scheduling lag and catch the code that blocks it.
+
+    A task on the loop sleeps CHECK_INTERVAL_SECONDS at a time and records
+    how late it woke. A thread checks the task's heartbeat; once it is older
+    than the threshold, the loop is stuck in one call, so the thread takes the
+    loop thread's stack right then and blames the request being served.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, threshold: float):
+        self.loop = loop
+        self.threshold = threshold
+        self.thread_id = threading.get_ident()
+        self.requests: "weakref.WeakKeyDictionary[asyncio.Task, Scope]" = weakref.WeakKeyDictionary()
+        self.endpoints: Dict[Any, str] = {}
+        self.recent: Deque[Stall] = deque(maxlen=RECENT_STALLS)
+        self.stalls = 0
+        # Set as one tuple, so the watching thread never reads half an update
+        self._beat = (time.monotonic(), gc_clock.now())
+        self._stall: Optional[Stall] = None
+        self._stopped = threading.Event()
+
+    def start(self) -> None:
+        self._task = self.loop.create_task(self._tick())
+        threading.Thread(target=self._watch, name="loop-watchdog", daemon=True).start()
+
+    async def _tick(self) -> None:
+        try:
+            while True:
+                self._beat = (time.monotonic(), gc_clock.now())
+                await asyncio.sleep(CHECK_INTERVAL_SECONDS)
+                lag = max(time.monotonic() - self._beat[0] - CHECK_INTERVAL_SECONDS, 0.0)
+                loop_lag.observe(lag)
+                stall, self._stall = self._stall, None
+                if stall is not None:
+                    stall.finish()
+        finally:
+            self._stopped.set()
+
+    def _watch(self) -> None:
+        captured = None
+        while not self._stopped.wait(CHECK_INTERVAL_SECONDS):
+            if self.loop.is_closed():
+                return
+            beat = self._beat
+            # A collection stops the loop too, but blaming the line it interrupted would be wrong
+            blocked = time.monotonic() - beat[0] - (gc_clock.now() - beat[1])
+            # One capture per stall: the heartbeat only moves once the loop is free again
+            if beat != captured and blocked > CHECK_INTERVAL_SECONDS + self.threshold:
+                captured = beat
+                self._capture(beat)
+
+    def _capture(self, beat: Tuple[float, float]) -> None:
+        frame = sys._current_frames().get(self.thread_id)
+        if frame is None:
+            return
+        # Tasks a handler spawns are not in self.requests; their stack may still hold the endpoint
+        task = asyncio.current_task(self.loop)
+        scope = self.requests.get(task) if task is not None else None
+        route = _route_from_scope(scope) or _route_from_stack(frame, self.endpoints)
+        stack = traceback.format_stack(frame, limit=STACK_LIMIT)
+        stall = Stall(route or "unknown", _location(frame), stack, beat[0] + CHECK_INTERVAL_SECONDS, beat[1])
+        self.recent.append(stall)
+        self.stalls += 1
+        self._stall = stall
+        loop_blocked.inc((stall.route, stall.location))
+
+
+_watchdogs: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LoopWatchdog]" = weakref.WeakKeyDictionary()
+
+
+def _endpoint_codes(app: Any) -> Dict[Any, str]:
+    codes = {}
+    for route in getattr(getattr(app, "router", None), "routes", []):
+        endpoint = getattr(route, "endpoint", None)
+        while endpoint is not None:
+            code = getattr(endpoint, "__code__", None)
+            if code is not None:
+                codes[code] = f"{next(iter(getattr(route, 'methods', None) or ['']))} {route.path}".strip()
+            endpoint = getattr(endpoint, "__wrapped__", None)
+    return codes
+
+
+def running_watchdog(app: Any = None) -> LoopWatchdog:
+    """The running loop's watchdog, started on first use; each test client runs its own loop."""
+    loop = asyncio.get_running_loop()
+    watchdog = _watchdogs.get(loop)
+    if watchdog is None:
+        watchdog = _watchdogs[loop] = LoopWatchdog(loop, settings.LOOP_LAG_THRESHOLD_SECONDS)
+        watchdog.endpoints = _endpoint_codes(app)
+        watchdog.start()
+    return watchdog
+
+
+def recent_stalls() -> List[Stall]:
+    """Stalls caught on every monitored loop, oldest first per loop."""
+    return [stall for watchdog in list(_watchdogs.values()) for stall in watchdog.recent]
+
+
+class LoopLagMiddleware:
+    """Start the watchdog and tell it which route each request task serves.
+
+    With LOOP_LAG_STRICT (the test suite), a request during which the loop
+    stalled raises EventLoopBlocked naming the blocking line.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not settings.LOOP_LAG_THRESHOLD_SECONDS:
+            await self.app(scope, receive, send)
+            return
+
+        watchdog = running_watchdog(scope.get("app"))
+        task = asyncio.current_task()
+        watchdog.requests[task] = scope
+        stalls_before = watchdog.stalls
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            watchdog.requests.pop(task, None)
+        new_stalls = watchdog.stalls - stalls_before
+        if not new_stalls:
+            return
+        # The watchdog's own timer may not run again before a test client's loop closes
+        stalls = list(watchdog.recent)[-new_stalls:]
+        for stall in stalls:
+            stall.finish()
+        if settings.LOOP_LAG_STRICT:
+            raise EventLoopBlocked("; ".join(stall.describe() for stall in stalls))
@@ -0,0 +1,345 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Pool waits are normally sub-millisecond; the top buckets catch exhaustion
+CHECKOUT_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+PASSWORD_HASH_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+Labels = Tuple[str, ...]
+
+
+class Sample(NamedTuple):
+    suffix: str
+    labels: Dict[str, str]
+    value: float
+
+
+class Family(NamedTuple):
+    name: str
+    kind: str
+    documentation: str
+    samples: List[Sample]
+
+
+class _PerThread:
+    """Values kept per thread, so updates never contend on a lock.
+
+    A thread's first update registers its values under a lock; after that it
+    only writes to its own dict. Readers copy and sum every thread's values.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        self._factory = factory
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._shards: List[Any] = []
+
+    def local(self) -> Any:
+        try:
+            return self._local.value
+        except AttributeError:
+            value = self._factory()
+            with self._lock:
+                self._shards.append(value)
+            self._local.value = value
+            return value
+
+    def shards(self) -> List[Any]:
+        with self._lock:
+            return list(self._shards)
+
+
+class Registry:
+    """Metrics and scrape-time collectors rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._metrics: List["Metric"] = []
+        self._collectors: List[Callable[[], Iterable[Family]]] = []
+
+    def register(self, metric: "Metric") -> None:
+        self._metrics.append(metric)
+
+    def collector(self, fn: Callable[[], Iterable[Family]]) -> Callable[[], Iterable[Family]]:
+        """Register fn to produce families from existing stats at scrape time."""
+        self._collectors.append(fn)
+        return fn
+
+    def collect(self) -> List[Family]:
+        families = [metric.collect() for metric in self._metrics]
+        for collector in self._collectors:
+            families.extend(collector())
+        return families
+
+    def render(self) -> str:
+        lines = []
+        for family in self.collect():
+            lines.append(f"# HELP {family.name} {_escape(family.documentation, help_text=True)}")
+            lines.append(f"# TYPE {family.name} {family.kind}")
+            for sample in family.samples:
+                lines.append(f"{family.name}{sample.suffix}{_format_labels(sample.labels)} {_format_value(sample.value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+
+class Metric:
+    """A named metric whose label values are passed positionally as a tuple."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: Registry = registry):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = _PerThread(dict)
+        registry.register(self)
+
+    def _labels(self, values: Labels) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def _merged(self) -> Dict[Labels, float]:
+        merged: Dict[Labels, float] = {}
+        for shard in self._values.shards():
+            for labels, value in shard.copy().items():
+                merged[labels] = merged.get(labels, 0) + value
+        return merged
+
+    def collect(self) -> Family:
+        samples = [Sample("", self._labels(labels), value) for labels, value in sorted(self._merged().items())]
+        return Family(self.name, self.kind, self.documentation, samples)
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, labels: Labels = (), amount: float = 1) -> None:
+        values = self._values.local()
+        values[labels] = values.get(labels, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        return self._merged().get(labels, 0)
+
+
+class Gauge(Counter):
+    """A value that goes up and down; inc and dec must happen on the same thread."""
+
+    kind = "gauge"
+
+    def dec(self, labels: Labels = (), amount: float = 1) -> None:
+        self.inc(labels, -amount)
+
+
+class Histogram(Metric):
+    """Observations counted into fixed buckets, as in prometheus_client.
+
+    Each label set holds one count per bucket (the last one for +Inf) and
+    the running sum; cumulative counts are computed when scraped.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry: Registry = registry):
+        super().__init__(name, documentation, labelnames, registry)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        values = self._values.local()
+        counts = values.get(labels)
+        if counts is None:
+            counts = values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        counts[bisect_left(self.buckets, value)] += 1
+        counts[-1] += value
+
+    def _merged(self) -> Dict[Labels, List[float]]:
+        merged: Dict[Labels, List[float]] = {}
+        for shard in self._values.shards():
+            for labels, counts in shard.copy().items():
+                total = merged.setdefault(labels, [0] * len(counts))
+                for i, count in enumerate(list(counts)):
+                    total[i] += count
+        return merged
+
+    def count(self, labels: Labels = ()) -> int:
+        counts = self._merged().get(labels)
+        return int(sum(counts[:-1])) if counts else 0
+
+    def collect(self) -> Family:
+        samples = []
+        for labels, counts in sorted(self._merged().items()):
+            names = self._labels(labels)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append(Sample("_bucket", {**names, "le": _format_value(bound)}, cumulative))
+            samples.append(Sample("_sum", names, counts[-1]))
+            samples.append(Sample("_count", names, cumulative))
+        return Family(self.name, self.kind, self.documentation, samples)
+
+
+def _escape(value: str, help_text: bool = False) -> str:
+    value = value.replace("\\", "\\\\").replace("\n", "\\n")
+    return value if help_text else value.replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, int) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def family(name: str, kind: str, documentation: str, values: Iterable[Tuple[Dict[str, str], float]]) -> Family:
+    """Build a family of unsuffixed samples, for collectors reporting existing stats."""
+    return Family(name, kind, documentation, [Sample("", labels, value) for labels, value in values])
+
+
+# HTTP
+http_requests = Counter(
+    "http_requests_total", "Requests answered, by method, route template and status.", ("method", "route", "status")
+)
+http_request_errors = Counter(
+    "http_request_errors_total", "Requests answered with a 5xx status or an exception.", ("method", "route")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "Time from receiving a request to sending its last byte.", ("method", "route")
+)
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress", "Requests being handled.", ("method",)
+)
+
+# Database pool
+db_pool_checkout_wait = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for the pool to hand out a connection, including opening new ones.",
+    ("engine",),
+    buckets=CHECKOUT_BUCKETS
+)
+
+# Password hashing
+password_hash_duration = Histogram(
+    "password_hash_seconds", "Time a bcrypt job ran on the hashing executor.", ("operation",),
+    buckets=PASSWORD_HASH_BUCKETS
+)
+password_hash_queue = Histogram(
+    "password_hash_queue_seconds", "Time a bcrypt job waited for a free hashing worker.", ("operation",),
+    buckets=PASSWORD_HASH_BUCKETS
+)
+
+
+class MetricsMiddleware:
+    """Count requests and time them per route template (not per URL, to bound label values).
+
+    Everything is updated on the event loop thread, so no update takes a lock.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = (scope["method"],)
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        except BaseException:
+            status_code = 500
+            raise
+        finally:
+            elapsed = time.perf_counter() - started_at
+            http_requests_in_progress.dec(method)
+            route = scope.get("route")
+            labels = (method[0], route.path if route is not None else "unmatched")
+            http_request_duration.observe(elapsed, labels)
+            http_requests.inc(labels + (str(status_code),))
+            if status_code >= 500:
+                http_request_errors.inc(labels)
+
+
+_pools: Dict[str, Any] = {}
+
+
+def _time_checkouts(pool: Any, name: str) -> None:
+    do_get = pool._do_get
+    labels = (name,)
+
+    def timed_do_get():
+        started_at = time.perf_counter()
+        try:
+            return do_get()
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - started_at, labels)
+
+    pool._do_get = timed_do_get
+    _pools[name] = pool
+
+
+def instrument_pool(engine: Engine, name: str) -> None:
+    """Time connection checkouts from engine's pool and report its size when scraped.
+
+    SQLAlchemy has no event for the start of a checkout, so the pool's
+    internal _do_get (the wait for a free or new connection) is wrapped.
+    """
+    _time_checkouts(engine.pool, name)
+
+    # dispose() replaces the pool
+    @event.listens_for(engine, "engine_disposed")
+    def _instrument_new_pool(disposed):
+        _time_checkouts(engine.pool, name)
+
+
+@registry.collector
+def _pool_metrics() -> List[Family]:
+    # NullPool (aiosqlite) and friends keep no connections, so only QueuePools report sizes
+    pools = [(name, pool) for name, pool in sorted(_pools.items()) if isinstance(pool, QueuePool)]
+    return [
+        family("db_pool_size", "gauge", "Connections the pool keeps open.",
+               (({"engine": name}, pool.size()) for name, pool in pools)),
+        family("db_pool_checked_out", "gauge", "Connections currently checked out.",
+               (({"engine": name}, pool.checkedout()) for name, pool in pools)),
+        family("db_pool_overflow", "gauge", "Connections open beyond the pool size.",
+               (({"engine": name}, max(pool.overflow(), 0)) for name, pool in pools)),
+    ]
+
+
+def cache_families(caches: Dict[str, Dict[str, Any]]) -> List[Family]:
+    """Hit, miss, ratio and size families for caches described by their stats() dicts."""
+    return [
+        family("cache_hits_total", "counter", "Cache lookups that found an entry.",
+               (({"cache": name}, stats["hits"]) for name, stats in caches.items())),
+        family("cache_misses_total", "counter", "Cache lookups that found nothing.",
+               (({"cache": name}, stats["misses"]) for name, stats in caches.items())),
+        family("cache_hit_ratio", "gauge", "Hits over lookups since start.",
+               (({"cache": name}, stats["hit_ratio"]) for name, stats in caches.items())),
+        family("cache_entries", "gauge", "Entries currently cached.",
+               (({"cache": name}, stats["size"]) for name, stats in caches.items() if "size" in stats)),
+    ]
@@ -0,0 +1,84 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from typing import Any, List, Sequence, Tuple
+from fastapi import HTTPException, Response, status
+from sqlalchemy import Select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.dependencies import PaginationParams
+
+# Response header carrying the cursor for the next page; absent on the last page
+CURSOR_HEADER = "X-Next-Cursor"
+
+# (column, descending) pairs; the last key must be unique (normally the primary key)
+SortKeys = Sequence[Tuple[Any, bool]]
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode sort-key values of the last row on a page as an opaque token."""
+    payload = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_keys: SortKeys) -> List[Any]:
+    """Decode a cursor back into values typed like the sort columns."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        payload = json.loads(raw)
+        if not isinstance(payload, list) or len(payload) != len(sort_keys):
+            raise ValueError
+        values = []
+        for (column, _), value in zip(sort_keys, payload):
+            python_type = column.type.python_type
+            if python_type in (datetime, date):
+                value = python_type.fromisoformat(value)
+            elif not isinstance(value, python_type):
+                raise ValueError
+            values.append(value)
+        return values
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def after_cursor(sort_keys: SortKeys, values: Sequence[Any]):
+    """Condition selecting rows that sort strictly after the cursor row."""
+    clauses = []
+    for i, (column, descending) in enumerate(sort_keys):
+        equal = [key == value for (key, _), value in zip(sort_keys[:i], values[:i])]
+        clauses.append(and_(*equal, column < values[i] if descending else column > values[i]))
+    # Redundant inclusive bound on the leading key lets the planner seek the index
+    first, descending = sort_keys[0]
+    return and_(first <= values[0] if descending else first >= values[0], or_(*clauses))
+
+
+async def paginate(
+    db: AsyncSession,
+    query: Select,
+    sort_keys: SortKeys,
+    pagination: PaginationParams,
+    response: Response
+) -> List[Any]:
+    """Load one page of query ordered by sort_keys.
+
+    With a cursor the page starts after the cursor row (an index range seek);
+    otherwise `skip` is applied as before. When more rows follow, the next
+    cursor is returned in the X-Next-Cursor header.
+    """
+    if pagination.cursor:
+        query = query.filter(after_cursor(sort_keys, decode_cursor(pagination.cursor, sort_keys)))
+    elif pagination.skip:
+        query = query.offset(pagination.skip)
+
+    order = [column.desc() if descending else column.asc() for column, descending in sort_keys]
+    rows = (await db.scalars(query.order_by(*order).limit(pagination.limit + 1))).all()
+
+    if len(rows) > pagination.limit:
+        rows = rows[:pagination.limit]
+        last = rows[-1]
+        response.headers[CURSOR_HEADER] = encode_cursor([getattr(last, column.key) for column, _ in sort_keys])
+    return rows
@@ -0,0 +1,233 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+import random
+import re
+import sys
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = b"x-profile"
+SAMPLE_INTERVAL_SECONDS = 0.001
+ALLOCATION_TOP = 50
+PROFILE_ID = re.compile(r"^[0-9]{8}T[0-9]{12}-[0-9a-f]{8}$")
+
+
+def sign_profile_request(method: str, path: str, expires_at: int) -> str:
+    """X-Profile header value asking for one profile of `method path` until expires_at (unix time)."""
+    message = f"{expires_at}:{method.upper()} {path}".encode()
+    signature = hmac.new(settings.ADMIN_API_KEY.encode(), message, hashlib.sha256).hexdigest()
+    return f"{expires_at}:{signature}"
+
+
+def _signed(scope: Scope, value: str) -> bool:
+    if not settings.ADMIN_API_KEY:
+        return False
+    expires_at, _, signature = value.partition(":")
+    if not expires_at.isdigit() or int(expires_at) < time.time():
+        return False
+    expected = sign_profile_request(scope["method"], scope["path"], int(expires_at))
+    return hmac.compare_digest(expected, f"{expires_at}:{signature}")
+
+
+class StackSampler:
+    """Sample one thread's Python stack from a background thread into collapsed-stack counts.
+
+    Sampling the event loop thread also records whatever other tasks run
+    while the profiled request waits; idle time shows up as the selector.
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL_SECONDS):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None:
+                code = frame.f_code
+                names.append(f"{code.co_name} ({_short_path(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def collapsed(self) -> str:
+        """Stacks in the collapsed format read by flamegraph.pl and speedscope."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def _short_path(filename: str) -> str:
+    for marker in ("site-packages/", "backend/"):
+        index = filename.rfind(marker)
+        if index != -1:
+            return filename[index + len(marker):]
+    return filename.replace(";", "_")
+
+
+def _allocation_top(snapshot: tracemalloc.Snapshot) -> str:
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ))
+    stats = snapshot.statistics("lineno")
+    lines = [f"{'KiB':>10}{'blocks':>10}  line"]
+    for stat in stats[:ALLOCATION_TOP]:
+        frame = stat.traceback[0]
+        lines.append(f"{stat.size / 1024:>10.1f}{stat.count:>10}  {_short_path(frame.filename)}:{frame.lineno}")
+    return "\n".join(lines) + "\n"
+
+
+def _write_profile(directory: Path, meta: Dict[str, Any], collapsed: str, allocations: Optional[str]) -> None:
+    directory.mkdir(parents=True, exist_ok=True)
+    profile_id = meta["id"]
+    (directory / f"{profile_id}.collapsed").write_text(collapsed)
+    if allocations is not None:
+        (directory / f"{profile_id}.alloc.txt").write_text(allocations)
+    # The metadata goes last, so a listed profile is always complete
+    (directory / f"{profile_id}.json").write_text(json.dumps(meta))
+    for stale in sorted(directory.glob("*.json"))[:-settings.PROFILE_MAX_KEPT]:
+        for path in directory.glob(f"{stale.stem}.*"):
+            path.unlink(missing_ok=True)
+
+
+def _finish_profile(directory: Path, meta: Dict[str, Any], sampler: StackSampler, trace_memory: bool) -> None:
+    """Snapshot allocations (stopping tracemalloc if the profile started it) and write the profile."""
+    allocations = None
+    if trace_memory:
+        try:
+            allocations = _allocation_top(tracemalloc.take_snapshot())
+        finally:
+            tracemalloc.stop()
+    _write_profile(directory, meta, sampler.collapsed(), allocations)
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Metadata of the kept profiles, newest first."""
+    directory = Path(settings.PROFILE_DIR)
+    profiles = []
+    for path in sorted(directory.glob("*.json"), reverse=True):
+        try:
+            profiles.append(json.loads(path.read_text()))
+        except (OSError, ValueError):
+            continue
+    return profiles
+
+
+def profile_path(profile_id: str, kind: str) -> Optional[Path]:
+    """Path of a profile's "collapsed" stacks or "allocations" top, if it exists."""
+    if not PROFILE_ID.match(profile_id) or kind not in ("collapsed", "allocations"):
+        return None
+    suffix = ".collapsed" if kind == "collapsed" else ".alloc.txt"
+    path = Path(settings.PROFILE_DIR) / f"{profile_id}{suffix}"
+    return path if path.is_file() else None
+
+
+class ProfilerMiddleware:
+    """Profile PROFILE_SAMPLE_RATE of requests, and any request with a signed X-Profile header.
+
+    A profile is a sampled stack of the event loop thread for the length of
+    the request plus a tracemalloc snapshot of what it allocated, written to
+    PROFILE_DIR. One request is profiled at a time; others pass through.
+    Only installed when PROFILER_ENABLED, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self._active = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or self._active:
+            await self.app(scope, receive, send)
+            return
+
+        trigger = self._trigger(scope)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        self._active = True
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        sampler = StackSampler(threading.get_ident())
+        trace_memory = not tracemalloc.is_tracing()
+        if trace_memory:
+            tracemalloc.start()
+        sampler.start()
+        started_at = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - started_at
+            sampler.stop()
+            try:
+                await self._save(scope, trigger, status_code, duration, sampler, trace_memory)
+            finally:
+                # Held until tracemalloc is stopped, so the next profile starts it afresh
+                self._active = False
+
+    @staticmethod
+    def _trigger(scope: Scope) -> Optional[str]:
+        for name, value in scope["headers"]:
+            if name == PROFILE_HEADER:
+                return "signed" if _signed(scope, value.decode("latin-1")) else None
+        if settings.PROFILE_SAMPLE_RATE and random.random() < settings.PROFILE_SAMPLE_RATE:
+            return "sampled"
+        return None
+
+    @staticmethod
+    async def _save(scope: Scope, trigger: str, status_code: int, duration: float,
+                    sampler: StackSampler, trace_memory: bool) -> None:
+        now = datetime.now(timezone.utc)
+        route = scope.get("route")
+        meta = {
+            "id": f"{now:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}",
+            "created_at": now.isoformat(),
+            "method": scope["method"],
+            "path": scope["path"],
+            "route": route.path if route is not None else None,
+            "status": status_code,
+            "duration_ms": round(duration * 1000, 3),
+            "samples": sum(sampler.stacks.values()),
+            "trigger": trigger,
+        }
+        try:
+            # Snapshotting traces and writing files both take long enough to stall the loop
+            await asyncio.to_thread(_finish_profile, Path(settings.PROFILE_DIR), meta, sampler, trace_memory)
+        except OSError:
+            logger.error("Could not write profile", exc_info=True)
+
+
+if __name__ == "__main__":
+    # python -m app.core.profiler GET /api/v1/habits/ [ttl_seconds]
+    method, path = sys.argv[1], sys.argv[2]
+    ttl = int(sys.argv[3]) if len(sys.argv) > 3 else 300
+    print(sign_profile_request(method, path, int(time.time()) + ttl))
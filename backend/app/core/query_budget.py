@@ -0,0 +1,142 @@
+import logging
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple, Type, Union
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Bind parameter lists such as "IN (?, ?, ?)" or multi-row VALUES, folded to one shape
+_PARAMETER_LIST = re.compile(r"\(\s*(?:\?|%s|%\(\w+\)s|:\w+)(?:\s*,\s*(?:\?|%s|%\(\w+\)s|:\w+))+\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a SQL statement so executions differing only in list lengths compare equal."""
+    return _PARAMETER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class QueryBudgetExceeded(AssertionError):
+    """Raised in strict mode when a request breaks its query budget or repeats a statement."""
+
+
+class QueryStats:
+    """SQL statements run on behalf of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.shapes: Counter = Counter()
+        self.budget: Optional[int] = None
+
+    def record(self, statement: str, duration: float, executemany: bool) -> None:
+        self.count += 1
+        self.duration += duration
+        # N+1 loops are reads; writes legitimately repeat shapes (one change_log
+        # insert per flush) and executemany is batched already
+        if not executemany and statement.lstrip()[:6].upper() == "SELECT":
+            self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self) -> List[Tuple[str, int]]:
+        """SELECT shapes run at least QUERY_REPEAT_THRESHOLD times, i.e. likely N+1 loops."""
+        return [(shape, n) for shape, n in self.shapes.most_common() if n >= settings.QUERY_REPEAT_THRESHOLD]
+
+    def violations(self) -> List[str]:
+        problems = []
+        if self.budget is not None and self.count > self.budget:
+            problems.append(f"{self.count} queries exceed the budget of {self.budget}")
+        problems.extend(f"{n}x {shape[:200]}" for shape, n in self.repeated())
+        return problems
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.duration * 1000:.2f};desc="{self.count} queries"'
+
+
+_current_stats: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[QueryStats]:
+    """Stats of the request being handled, if any."""
+    return _current_stats.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the execution context, which is dropped with a statement that raises
+    context._query_started_at = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = context._query_started_at
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.record(statement, time.perf_counter() - started_at, executemany)
+
+
+def instrument_engine(engine: Union[Engine, Type[Engine]]) -> None:
+    """Count and time the statements an engine (or every engine) runs for the current request."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def query_budget(limit: int):
+    """Route dependency declaring the most queries a request may run.
+
+    Auth lookups count, so budgets include the principal load of a cold cache.
+    """
+    def declare() -> None:
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.budget = limit
+
+    return declare
+
+
+class QueryStatsMiddleware:
+    """Report each request's query count and DB time as a Server-Timing header and in the logs.
+
+    Repeated statement shapes and exceeded budgets are logged as warnings,
+    or raised as QueryBudgetExceeded with QUERY_BUDGET_STRICT (the test suite).
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        _current_stats.set(stats)
+        started_at = time.perf_counter()
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                self._check(scope, stats)
+                headers = MutableHeaders(scope=message)
+                total = f"total;dur={(time.perf_counter() - started_at) * 1000:.2f}"
+                headers.append("Server-Timing", f"{stats.server_timing()}, {total}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            logger.debug(
+                f"{scope['method']} {scope['path']}: {stats.count} queries in {stats.duration * 1000:.2f} ms"
+            )
+
+    @staticmethod
+    def _check(scope: Scope, stats: QueryStats) -> None:
+        problems = stats.violations()
+        if not problems:
+            return
+        message = f"{scope['method']} {scope['path']}: " + "; ".join(problems)
+        if settings.QUERY_BUDGET_STRICT:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -0,0 +1,455 @@
+import asyncio
+import hashlib
+import itertools
+import json
+import logging
+import secrets
+import time
+from collections import OrderedDict
+from contextvars import ContextVar
+from datetime import date
+from typing import Any, Dict, Iterable, Optional, Set, Tuple
+from fastapi import Depends, HTTPException, Request, Response, status
+from pydantic import TypeAdapter
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.dependencies import get_current_user
+from app.core.pagination import CURSOR_HEADER
+from app.models.sync import on_committed_changes
+
+logger = logging.getLogger(__name__)
+
+# Change log entities -> cache domain whose responses they can change
+ENTITY_DOMAINS = {
+    "food_entries": "food",
+    "sleep_entries": "sleep",
+    "habits": "habits",
+    "habit_completions": "habits",
+    "todos": "todos",
+}
+
+# Summarizes every domain above, so any of their writes invalidates it
+DASHBOARD_DOMAIN = "dashboard"
+
+# Response headers stored with a cached body
+CACHED_HEADERS = (CURSOR_HEADER,)
+
+# Sent with every ETag: per-user data that clients must revalidate before reuse
+CACHE_CONTROL = "private, no-cache"
+
+# A generation outlives the entries stored under it; losing one only causes misses
+GENERATION_TTL_FACTOR = 10
+
+# Larger responses are not worth holding in memory or shipping to Redis
+MAX_ENTRY_BYTES = 1024 * 1024
+
+
+class MemoryBackend:
+    """In-process LRU bounded by the total size of the cached bodies."""
+
+    name = "memory"
+
+    def __init__(self, max_bytes: int, ttl: int):
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, str, bytes]]" = OrderedDict()
+        # Fresh generations come from a counter behind a per-process prefix, so one
+        # that was evicted (or issued before a restart, as an ETag) is never reissued
+        self._prefix = secrets.token_hex(4)
+        self._counter = itertools.count(1)
+        self._generations = TTLCache(maxsize=100000, ttl=ttl * GENERATION_TTL_FACTOR)
+
+    def _next_generation(self) -> str:
+        return f"{self._prefix}.{next(self._counter)}"
+
+    def _generation(self, namespace: str) -> str:
+        generation = self._generations.get(namespace)
+        if generation is None:
+            generation = self._next_generation()
+            self._generations.set(namespace, generation)
+        return generation
+
+    async def generation(self, namespace: str) -> str:
+        return self._generation(namespace)
+
+    def _discard(self, key: str) -> None:
+        _, _, value = self._entries.pop(key)
+        self._bytes -= len(key) + len(value)
+
+    async def lookup(self, namespace: str, key: str) -> Tuple[str, Optional[bytes]]:
+        generation = self._generation(namespace)
+        item = self._entries.get(key)
+        if item is None:
+            return generation, None
+        expires_at, stored_generation, value = item
+        if expires_at <= time.monotonic() or stored_generation != generation:
+            self._discard(key)
+            return generation, None
+        self._entries.move_to_end(key)
+        return generation, value
+
+    async def store(self, namespace: str, key: str, generation: str, value: bytes, ttl: int) -> None:
+        if key in self._entries:
+            self._discard(key)
+        self._entries[key] = (time.monotonic() + ttl, generation, value)
+        self._bytes += len(key) + len(value)
+        while self._bytes > self.max_bytes and self._entries:
+            self._discard(next(iter(self._entries)))
+            self.evictions += 1
+
+    async def invalidate(self, namespaces: Iterable[str]) -> None:
+        for namespace in namespaces:
+            self._generations.set(namespace, self._next_generation())
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._generations.clear()
+        self._bytes = 0
+        self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "evictions": self.evictions,
+        }
+
+
+class RedisBackend:
+    """Shared cache in Redis; size it with the server's maxmemory and an allkeys-lru policy.
+
+    Entries are stored as b"<generation>\\n<value>" and fetched together with
+    the namespace generation in one MGET round trip.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, ttl: int):
+        self.generation_ttl = ttl * GENERATION_TTL_FACTOR
+        self._client = aioredis.from_url(url)
+
+    async def _start_generation(self, generation_key: str) -> str:
+        # Random rather than counted, so a generation lost to eviction is not reissued
+        await self._client.set(generation_key, secrets.token_hex(8), ex=self.generation_ttl, nx=True)
+        return (await self._client.get(generation_key)).decode()
+
+    async def generation(self, namespace: str) -> str:
+        generation = await self._client.get(f"{namespace}:gen")
+        if generation is None:
+            return await self._start_generation(f"{namespace}:gen")
+        return generation.decode()
+
+    async def lookup(self, namespace: str, key: str) -> Tuple[str, Optional[bytes]]:
+        generation_key = f"{namespace}:gen"
+        generation, item = await self._client.mget(generation_key, key)
+        if generation is None:
+            return await self._start_generation(generation_key), None
+        generation = generation.decode()
+        if item is None:
+            return generation, None
+        stored_generation, _, value = item.partition(b"\n")
+        if stored_generation.decode() != generation:
+            return generation, None
+        return generation, value
+
+    async def store(self, namespace: str, key: str, generation: str, value: bytes, ttl: int) -> None:
+        await self._client.set(key, generation.encode() + b"\n" + value, ex=ttl)
+
+    async def invalidate(self, namespaces: Iterable[str]) -> None:
+        async with self._client.pipeline(transaction=False) as pipe:
+            for namespace in namespaces:
+                pipe.set(f"{namespace}:gen", secrets.token_hex(8), ex=self.generation_ttl)
+            await pipe.execute()
+
+    async def clear(self) -> None:
+        async for key in self._client.scan_iter(match="rc:*", count=1000):
+            await self._client.delete(key)
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+
+class ResponseCache:
+    """Encoded GET responses keyed per user and domain, with per-domain hit counters.
+
+    Every (user, domain) namespace has a generation that is replaced when a
+    write to that domain commits; entries stored under an older generation
+    are never served again, and generations double as ETag version stamps.
+    Backend errors count as misses.
+    """
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.not_modified: Dict[str, int] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None and self.ttl > 0
+
+    async def generation(self, namespace: str) -> Optional[str]:
+        """Return the current generation of namespace, or None when the backend failed."""
+        try:
+            return await self.backend.generation(namespace)
+        except RedisError:
+            logger.warning("Response cache generation lookup failed", exc_info=True)
+            return None
+
+    async def lookup(self, namespace: str, key: str, domain: str) -> Tuple[Optional[str], Optional[bytes]]:
+        """Return (generation, cached value); the generation is None when the backend failed."""
+        try:
+            generation, value = await self.backend.lookup(namespace, key)
+        except RedisError:
+            logger.warning("Response cache lookup failed", exc_info=True)
+            generation, value = None, None
+        counters = self.misses if value is None else self.hits
+        counters[domain] = counters.get(domain, 0) + 1
+        return generation, value
+
+    async def store(self, namespace: str, key: str, generation: str, value: bytes) -> None:
+        """Store value under the generation read before it was computed."""
+        if len(value) > MAX_ENTRY_BYTES:
+            return
+        try:
+            await self.backend.store(namespace, key, generation, value, self.ttl)
+        except RedisError:
+            logger.warning("Response cache store failed", exc_info=True)
+
+    async def invalidate(self, namespaces: Iterable[str]) -> None:
+        """Start new generations for the given namespaces."""
+        try:
+            await self.backend.invalidate(namespaces)
+        except RedisError:
+            # Entries are then only dropped by their TTL
+            logger.error("Response cache invalidation failed", exc_info=True)
+
+    async def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        await self.backend.clear()
+        self.hits.clear()
+        self.misses.clear()
+        self.not_modified.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return per-domain hit/miss and 304 counters and backend usage."""
+        domains = {}
+        for domain in sorted(set(self.hits) | set(self.misses) | set(self.not_modified)):
+            hits, misses = self.hits.get(domain, 0), self.misses.get(domain, 0)
+            domains[domain] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+                "not_modified": self.not_modified.get(domain, 0),
+            }
+        return {
+            "backend": self.backend.name if self.backend else None,
+            "ttl": self.ttl,
+            "domains": domains,
+            **(self.backend.stats() if self.backend else {}),
+        }
+
+
+def create_backend(name: Optional[str]):
+    """Build the configured backend; unset means Redis when REDIS_URL is set, otherwise none.
+
+    The memory backend must be asked for: its generations are per process, so
+    with several workers a write would leave the others serving stale copies.
+    """
+    name = name or ("redis" if settings.REDIS_URL else "none")
+    if name == "none":
+        return None
+    if name == "redis":
+        if not settings.REDIS_URL:
+            raise ValueError("RESPONSE_CACHE_BACKEND=redis requires REDIS_URL")
+        return RedisBackend(settings.REDIS_URL, settings.RESPONSE_CACHE_TTL_SECONDS)
+    if name == "memory":
+        return MemoryBackend(settings.RESPONSE_CACHE_MAX_BYTES, settings.RESPONSE_CACHE_TTL_SECONDS)
+    raise ValueError(f"Unknown RESPONSE_CACHE_BACKEND: {name}")
+
+
+response_cache = ResponseCache(
+    create_backend(settings.RESPONSE_CACHE_BACKEND),
+    settings.RESPONSE_CACHE_TTL_SECONDS
+)
+
+
+def response_cache_stats() -> Dict[str, Any]:
+    """Return response cache hit ratios and usage."""
+    return response_cache.stats()
+
+
+def cache_namespace(user_id: str, domain: str) -> str:
+    return f"rc:{user_id}:{domain}"
+
+
+# Event loop of synchronous callers; one for the process keeps Redis connections on it
+_sync_runner: Optional[asyncio.Runner] = None
+
+
+def invalidate_users(user_ids: Iterable[str], domains: Iterable[str]) -> None:
+    """Start new generations for the users' domains and their dashboards from synchronous code.
+
+    For maintenance commands, whose bulk writes bypass the request dependency
+    below; call it after each commit, outside any running event loop.
+    """
+    global _sync_runner
+    if not response_cache.enabled:
+        return
+    namespaces = [
+        cache_namespace(user_id, domain)
+        for user_id in set(user_ids)
+        for domain in (*domains, DASHBOARD_DOMAIN)
+    ]
+    if namespaces:
+        if _sync_runner is None:
+            _sync_runner = asyncio.Runner()
+        _sync_runner.run(response_cache.invalidate(namespaces))
+
+
+# (user_id, domain) namespaces changed by commits of the current request
+_pending_invalidations: ContextVar[Optional[Set[str]]] = ContextVar("pending_invalidations", default=None)
+
+
+@on_committed_changes
+def _collect_invalidations(changes: Set[Tuple[str, str]]) -> None:
+    pending = _pending_invalidations.get()
+    if pending is not None:
+        for user_id, entity in changes:
+            if entity in ENTITY_DOMAINS:
+                pending.add(cache_namespace(user_id, ENTITY_DOMAINS[entity]))
+                pending.add(cache_namespace(user_id, DASHBOARD_DOMAIN))
+
+
+async def invalidate_cached_responses():
+    """Router dependency starting new cache generations for the domains a request wrote to.
+
+    Runs after the handler and before the response is sent, so a client
+    never reads its own write's stale response back.
+    """
+    pending: Set[str] = set()
+    _pending_invalidations.set(pending)
+    try:
+        yield
+    finally:
+        if pending and response_cache.enabled:
+            await response_cache.invalidate(pending)
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+class ConditionalGet:
+    """The current user's version stamp for a GET in a domain, served as a strong ETag.
+
+    The ETag hashes the domain generation with the request key (path, sorted
+    query string and today's date, since summaries default to and habits
+    flag completions for the current day), so it changes with every
+    committed write to the domain and differs between URLs.
+    """
+
+    def __init__(self, request: Request, domain: str, user_id: str):
+        self.request = request
+        self.domain = domain
+        self.namespace = cache_namespace(user_id, domain)
+        query = "&".join(sorted(request.url.query.split("&"))) if request.url.query else ""
+        self.key = f"{self.namespace}:{date.today().isoformat()}:{request.url.path}?{query}"
+        self.generation: Optional[str] = None
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """ETag headers for the response; empty while no generation is known."""
+        if self.generation is None:
+            return {}
+        digest = hashlib.blake2b(f"{self.generation}:{self.key}".encode(), digest_size=12).hexdigest()
+        return {"ETag": f'"{digest}"', "Cache-Control": CACHE_CONTROL}
+
+    def check(self) -> None:
+        """Raise 304 Not Modified when If-None-Match holds the current ETag."""
+        if_none_match = self.request.headers.get("if-none-match")
+        headers = self.headers
+        if if_none_match and headers and _matches(if_none_match, headers["ETag"]):
+            response_cache.not_modified[self.domain] = response_cache.not_modified.get(self.domain, 0) + 1
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def conditional_get(domain: str):
+    """Dependency factory answering If-None-Match for the current user's view of domain.
+
+    Runs before the handler, so an unchanged poll costs one generation read
+    and no rows are fetched or serialized.
+    """
+    async def check(
+        request: Request,
+        response: Response,
+        current_user=Depends(get_current_user)
+    ) -> ConditionalGet:
+        conditional = ConditionalGet(request, domain, current_user.id)
+        if response_cache.enabled:
+            conditional.generation = await response_cache.generation(conditional.namespace)
+            conditional.check()
+            response.headers.update(conditional.headers)
+        return conditional
+
+    return check
+
+
+class CachedResponse(ConditionalGet):
+    """A handler's view of its cache entry: a hit to return, or a slot to store into."""
+
+    _adapters: Dict[Any, TypeAdapter] = {}
+
+    def __init__(self, request: Request, domain: str, user_id: str):
+        super().__init__(request, domain, user_id)
+        self.hit: Optional[Response] = None
+
+    def _decode(self, value: bytes) -> Response:
+        head, _, body = value.partition(b"\n")
+        return Response(content=body, media_type="application/json", headers={**json.loads(head), **self.headers})
+
+    def _encode(self, payload: Any) -> bytes:
+        response_model = self.request.scope["route"].response_model
+        adapter = self._adapters.get(response_model)
+        if adapter is None:
+            adapter = self._adapters[response_model] = TypeAdapter(response_model)
+        return adapter.dump_json(adapter.validate_python(payload, from_attributes=True))
+
+    async def store(self, payload: Any, response: Optional[Response] = None) -> Response:
+        """Encode payload with the route's response model, cache it and return it as a response."""
+        headers = {}
+        if response is not None:
+            headers = {name: response.headers[name] for name in CACHED_HEADERS if name in response.headers}
+        body = self._encode(payload)
+        if self.generation is not None:
+            head = json.dumps(headers, separators=(",", ":")).encode()
+            await response_cache.store(self.namespace, self.key, self.generation, head + b"\n" + body)
+        return Response(content=body, media_type="application/json", headers={**headers, **self.headers})
+
+
+def cached_response(domain: str):
+    """Dependency factory looking up the current user's cached response for a GET in domain.
+
+    Answers If-None-Match like conditional_get before fetching the entry.
+    """
+    async def lookup(request: Request, current_user=Depends(get_current_user)) -> CachedResponse:
+        cached = CachedResponse(request, domain, current_user.id)
+        if response_cache.enabled:
+            if "if-none-match" in request.headers:
+                cached.generation = await response_cache.generation(cached.namespace)
+                cached.check()
+            generation, value = await response_cache.lookup(cached.namespace, cached.key, domain)
+            # A write may have committed since the check; the ETag must match the body
+            cached.generation = generation
+            if value is not None:
+                cached.hit = cached._decode(value)
+        return cached
+
+    return lookup
@@ -1,12 +1,21 @@
+import asyncio
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Callable, Tuple
+from fastapi import HTTPException, status
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.metrics import password_hash_duration, password_hash_queue
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# Executor for CPU-bound password hashing, created on first use
+_password_executor: Optional[Executor] = None
+_password_jobs_pending = 0
+
 
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
@@ -49,6 +58,72 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def get_password_executor() -> Executor:
+    """Get the executor used for password hashing."""
+    global _password_executor
+    if _password_executor is None:
+        if settings.PASSWORD_HASH_EXECUTOR == "process":
+            _password_executor = ProcessPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS)
+        else:
+            _password_executor = ThreadPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                thread_name_prefix="password-hash"
+            )
+    return _password_executor
+
+
+def shutdown_password_executor() -> None:
+    """Shut down the password hashing executor, if it was started."""
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+
+
+def password_jobs_pending() -> int:
+    """Hashing jobs running or waiting on the executor."""
+    return _password_jobs_pending
+
+
+async def _run_password_job(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a hashing function on the executor, rejecting work when saturated."""
+    global _password_jobs_pending
+    if _password_jobs_pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry shortly",
+            headers={"Retry-After": "1"}
+        )
+    _password_jobs_pending += 1
+    try:
+        loop = asyncio.get_running_loop()
+        started_at = time.perf_counter()
+        result, duration = await loop.run_in_executor(get_password_executor(), _timed, func, *args)
+    finally:
+        _password_jobs_pending -= 1
+    labels = (func.__name__,)
+    password_hash_duration.observe(duration, labels)
+    password_hash_queue.observe(max(time.perf_counter() - started_at - duration, 0.0), labels)
+    return result
+
+
+def _timed(func: Callable[..., Any], *args: Any) -> Tuple[Any, float]:
+    # Runs on the worker (possibly another process), so only the hashing itself is timed
+    started_at = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started_at
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password on the hashing executor without blocking the event loop."""
+    return await _run_password_job(verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """Hash a password on the hashing executor without blocking the event loop."""
+    return await _run_password_job(get_password_hash, password)
+
+
 def create_password_reset_token(email: str) -> str:
     """Create a password reset token."""
     data = {"sub": email, "type": "password_reset"}
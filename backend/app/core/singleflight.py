@@ -0,0 +1,116 @@
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+from fastapi import HTTPException, Response, status
+from app.core.config import settings
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller (the leader) runs the computation in its own task, so
+    anything it borrowed, like its database session, is never used after it
+    returns. Later callers wait for the leader's result or exception. If
+    the leader is cancelled, a waiter takes over and runs the computation.
+    """
+
+    def __init__(self):
+        self.executions = 0
+        self.shared = 0
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], timeout: Optional[float] = None) -> T:
+        """Return fn()'s result, sharing one execution among concurrent callers of key.
+
+        Raises asyncio.TimeoutError when no result arrives within timeout
+        seconds; a timed-out leader's error is shared with its waiters.
+        """
+        while True:
+            future = self._calls.get(key)
+            if future is None:
+                return await self._lead(key, fn, timeout)
+            self.shared += 1
+            try:
+                return await asyncio.wait_for(asyncio.shield(future), timeout)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+
+    async def _lead(self, key: Hashable, fn: Callable[[], Awaitable[T]], timeout: Optional[float]) -> T:
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        self.executions += 1
+        # An explicit task: from Python 3.12 wait_for runs a bare coroutine inline
+        task = asyncio.ensure_future(fn())
+        try:
+            result = await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.CancelledError:
+            # Waiters retry rather than inherit a cancellation that was not theirs
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Marks the exception retrieved when nobody was waiting for it
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            if not task.done():
+                # Stop the computation before returning, so it never outlives what it borrowed
+                task.cancel()
+                await asyncio.wait({task})
+
+    def stats(self) -> Dict[str, Any]:
+        """Return executions and the calls that shared one."""
+        return {"executions": self.executions, "shared": self.shared, "in_flight": len(self._calls)}
+
+
+summary_flights = SingleFlight()
+
+
+def _copy(result: Any) -> Any:
+    # A Response is sent (and given background tasks) per request, so each caller gets its own
+    if isinstance(result, Response):
+        return Response(
+            content=result.body,
+            status_code=result.status_code,
+            headers=dict(result.headers),
+            media_type=result.media_type
+        )
+    return result
+
+
+def single_flight(*params: str, timeout: Optional[float] = None):
+    """Decorator sharing one execution of an endpoint among concurrent identical requests.
+
+    Requests are identical when they come from the same user (the handler's
+    `current_user`) and have equal values for `params`. Waiting longer than
+    `timeout` (SINGLE_FLIGHT_TIMEOUT_SECONDS by default) answers 504.
+    """
+    def decorator(handler: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        @functools.wraps(handler)
+        async def wrapper(**kwargs):
+            key = (handler.__module__, handler.__qualname__, kwargs["current_user"].id) + tuple(
+                kwargs.get(name) for name in params
+            )
+            try:
+                result = await summary_flights.do(
+                    key,
+                    lambda: handler(**kwargs),
+                    settings.SINGLE_FLIGHT_TIMEOUT_SECONDS if timeout is None else timeout
+                )
+            except asyncio.TimeoutError:
+                raise HTTPException(
+                    status_code=status.HTTP_504_GATEWAY_TIMEOUT,
+                    detail="Computation timed out"
+                )
+            return _copy(result)
+
+        return wrapper
+
+    return decorator
@@ -1,9 +1,13 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.core.metrics import instrument_pool
+from app.core.query_budget import instrument_engine
 
-# Create database engine
+# Create database engine (used for migrations, startup and maintenance commands)
 engine = create_engine(
     settings.DATABASE_URL,
     pool_pre_ping=True,
@@ -12,8 +16,34 @@ engine = create_engine(
     echo=settings.DEBUG
 )
 
-# Create session factory
+# Create async database engine (used by request handlers).
+# aiosqlite uses a NullPool, so pool sizing only applies to server databases.
+async_pool_options = {}
+if not settings.ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_pool_options = {"pool_size": 10, "max_overflow": 20}
+
+async_engine = create_async_engine(
+    settings.ASYNC_DATABASE_URL,
+    pool_pre_ping=True,
+    echo=settings.DEBUG,
+    **async_pool_options
+)
+
+# Count and time every statement against the request that issued it; listening on
+# the Engine class covers both engines above and any created later (e.g. by tests)
+instrument_engine(Engine)
+
+# Checkout wait and pool usage, reported by /metrics
+instrument_pool(engine, "sync")
+instrument_pool(async_engine.sync_engine, "async")
+
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False
+)
 
 # Create base class for models
 Base = declarative_base()
@@ -25,4 +55,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """Dependency to get an async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
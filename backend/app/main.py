@@ -1,12 +1,23 @@
-from fastapi import FastAPI, Request, status
+from fastapi import FastAPI, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
 from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.db.base import Base, engine
+from app.core.security import password_jobs_pending, shutdown_password_executor
+from app.core.pagination import CURSOR_HEADER
+from app.core.auth_cache import auth_cache_stats
+from app.core.response_cache import response_cache_stats
+from app.core.query_budget import QueryStatsMiddleware
+from app.core.profiler import ProfilerMiddleware
+from app.core.loop_monitor import LoopLagMiddleware
+from app.core.metrics import CONTENT_TYPE, MetricsMiddleware, cache_families, family, registry
+from app.core.singleflight import summary_flights
+from app.services.food_search import get_food_search_index
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,8 +39,22 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[CURSOR_HEADER, "ETag", "Server-Timing"],
 )
 
+# Report per-request query counts and DB time
+app.add_middleware(QueryStatsMiddleware)
+
+# Catch handlers that block the event loop
+app.add_middleware(LoopLagMiddleware)
+
+# Sampled and on-demand request profiles
+if settings.PROFILER_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# Outermost, so request timings include the other middleware
+app.add_middleware(MetricsMiddleware)
+
 
 # Exception handlers
 @app.exception_handler(RequestValidationError)
@@ -40,7 +65,8 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
         content={
             "success": False,
             "message": "Validation error",
-            "errors": exc.errors()
+            # Validator errors carry the raised exception in ctx, which json cannot encode
+            "errors": jsonable_encoder(exc.errors())
         }
     )
 
@@ -48,13 +74,17 @@ async def validation_exception_handler(request: Request, exc: RequestValidationE
 @app.exception_handler(StarletteHTTPException)
 async def http_exception_handler(request: Request, exc: StarletteHTTPException):
     """Handle HTTP exceptions."""
+    if exc.status_code == status.HTTP_304_NOT_MODIFIED:
+        # A 304 carries its validators but never a body
+        return Response(status_code=exc.status_code, headers=getattr(exc, "headers", None))
     return JSONResponse(
         status_code=exc.status_code,
         content={
             "success": False,
             "message": exc.detail,
             "errors": []
-        }
+        },
+        headers=getattr(exc, "headers", None)
     )
 
 
@@ -87,15 +117,45 @@ async def root():
 # Health check endpoint
 @app.get("/health")
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint, with cache hit ratios."""
     return {
         "success": True,
         "status": "healthy",
         "service": settings.APP_NAME,
-        "version": settings.APP_VERSION
+        "version": settings.APP_VERSION,
+        "caches": {"auth": auth_cache_stats(), "responses": response_cache_stats()}
     }
 
 
+# Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Metrics in the Prometheus text format."""
+    return PlainTextResponse(registry.render(), media_type=CONTENT_TYPE)
+
+
+@registry.collector
+def _service_metrics():
+    auth = auth_cache_stats()
+    caches = {"auth_tokens": auth["tokens"], "auth_principals": auth["principals"]}
+    responses = response_cache_stats()
+    for domain, stats in responses["domains"].items():
+        caches[f"responses_{domain}"] = stats
+    flights = summary_flights.stats()
+    return cache_families(caches) + [
+        family("response_cache_not_modified_total", "counter", "Conditional GETs answered with 304.",
+               (({"domain": domain}, stats["not_modified"]) for domain, stats in responses["domains"].items())),
+        family("response_cache_bytes", "gauge", "Encoded responses held by the memory backend.",
+               [({}, responses["bytes"])] if "bytes" in responses else []),
+        family("single_flight_executions_total", "counter", "Summary computations run.",
+               [({}, flights["executions"])]),
+        family("single_flight_shared_total", "counter", "Summary requests that shared a running computation.",
+               [({}, flights["shared"])]),
+        family("password_hash_jobs_pending", "gauge", "Hashing jobs running or waiting for a worker.",
+               [({}, password_jobs_pending())]),
+    ]
+
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -110,11 +170,15 @@ async def startup_event():
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
         raise
+    
+    index = get_food_search_index()
+    logger.info(f"Food search index loaded with {len(index)} foods")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
+    shutdown_password_executor()
     logger.info("Application shutting down")
 
 
@@ -1,15 +1,19 @@
 from app.models.user import User
-from app.models.food import FoodEntry, MealCategory
+from app.models.food import FoodEntry, FoodDailyRollup, MealCategory
 from app.models.sleep import SleepEntry
 from app.models.habit import Habit, HabitCompletion
 from app.models.todo import Todo
+from app.models.sync import ChangeLog, SyncClock
 
 __all__ = [
     "User",
     "FoodEntry",
+    "FoodDailyRollup",
     "MealCategory",
     "SleepEntry",
     "Habit",
     "HabitCompletion",
     "Todo",
+    "ChangeLog",
+    "SyncClock",
 ]
\ No newline at end of file
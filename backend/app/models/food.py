@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Enum, JSON
+from sqlalchemy import Column, String, Integer, Float, DateTime, Date, ForeignKey, Enum, JSON, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -16,6 +16,9 @@ class MealCategory(str, enum.Enum):
 
 class FoodEntry(Base):
     __tablename__ = "food_entries"
+    __table_args__ = (
+        Index("ix_food_entries_user_id_logged_at", "user_id", "logged_at"),
+    )
     
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(CHAR(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -29,4 +32,29 @@ class FoodEntry(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
     # Relationships
-    user = relationship("User", back_populates="food_entries")
\ No newline at end of file
+    user = relationship("User", back_populates="food_entries")
+
+
+class FoodDailyRollup(Base):
+    """Per-user, per-day nutrition totals maintained alongside food entries."""
+    __tablename__ = "food_daily_rollups"
+    
+    user_id = Column(CHAR(36), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    date = Column(Date, primary_key=True)
+    entries_count = Column(Integer, default=0, nullable=False)
+    total_calories = Column(Integer, default=0, nullable=False)
+    breakfast_calories = Column(Integer, default=0, nullable=False)
+    breakfast_count = Column(Integer, default=0, nullable=False)
+    lunch_calories = Column(Integer, default=0, nullable=False)
+    lunch_count = Column(Integer, default=0, nullable=False)
+    dinner_calories = Column(Integer, default=0, nullable=False)
+    dinner_count = Column(Integer, default=0, nullable=False)
+    snack_calories = Column(Integer, default=0, nullable=False)
+    snack_count = Column(Integer, default=0, nullable=False)
+    carbs = Column(Float, default=0, nullable=False)
+    protein = Column(Float, default=0, nullable=False)
+    fat = Column(Float, default=0, nullable=False)
+    fiber = Column(Float, default=0, nullable=False)
+    sugar = Column(Float, default=0, nullable=False)
+    sodium = Column(Float, default=0, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
\ No newline at end of file
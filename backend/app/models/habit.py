@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, Text, Date
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, Text, Date, LargeBinary, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -8,6 +8,9 @@ from app.db.base import Base
 
 class Habit(Base):
     __tablename__ = "habits"
+    __table_args__ = (
+        Index("ix_habits_user_id_is_active_created_at", "user_id", "is_active", "created_at"),
+    )
     
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(CHAR(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -16,6 +19,9 @@ class Habit(Base):
     current_streak = Column(Integer, default=0, nullable=False)
     longest_streak = Column(Integer, default=0, nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
+    # Day-indexed completion bitset (bit i = bitmap_origin + i days), kept in sync with completions
+    completion_bitmap = Column(LargeBinary, nullable=True)
+    bitmap_origin = Column(Date, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
     
@@ -26,6 +32,9 @@ class Habit(Base):
 
 class HabitCompletion(Base):
     __tablename__ = "habit_completions"
+    __table_args__ = (
+        Index("uq_habit_completions_habit_id_completion_date", "habit_id", "completion_date", unique=True),
+    )
     
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     habit_id = Column(CHAR(36), ForeignKey("habits.id", ondelete="CASCADE"), nullable=False)
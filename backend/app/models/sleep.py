@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, Date, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, Float, DateTime, Date, ForeignKey, Text, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -8,6 +8,9 @@ from app.db.base import Base
 
 class SleepEntry(Base):
     __tablename__ = "sleep_entries"
+    __table_args__ = (
+        Index("uq_sleep_entries_user_id_date", "user_id", "date", unique=True),
+    )
     
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(CHAR(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
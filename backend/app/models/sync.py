@@ -0,0 +1,174 @@
+from sqlalchemy import Column, String, Integer, BigInteger, DateTime, Index, DDL, event, insert, update
+from sqlalchemy.dialects.mysql import CHAR
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, SessionTransaction
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import uuid
+from app.db.base import Base
+from app.models.food import FoodEntry
+from app.models.sleep import SleepEntry
+from app.models.habit import Habit, HabitCompletion
+from app.models.todo import Todo
+
+# Models whose changes are logged for delta sync, keyed by table name in the log
+SYNCED_MODELS = (FoodEntry, SleepEntry, Habit, HabitCompletion, Todo)
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Callbacks run after a commit with the (user_id, entity) pairs it changed
+_commit_listeners: List[Callable[[Set[Tuple[str, str]]], None]] = []
+_COMMITTED_CHANGES_KEY = "habito_logged_changes"
+_FLUSHED_CHANGE_ROWS_KEY = "habito_flushed_change_rows"
+_PENDING_CHANGE_ROWS_KEY = "habito_pending_change_rows"
+
+
+class ChangeLog(Base):
+    """Append-only log of synced row changes; seq is the sync watermark."""
+    __tablename__ = "change_log"
+    __table_args__ = (
+        Index("ix_change_log_user_id_seq", "user_id", "seq"),
+    )
+    
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    user_id = Column(CHAR(36), nullable=False)
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(CHAR(36), nullable=False)
+    op = Column(String(8), nullable=False)
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class SyncClock(Base):
+    """Single row every transaction writing change log rows updates just before it commits.
+
+    The row lock is held until commit, so transactions insert their change
+    rows one at a time in commit order: a seq is never committed after a
+    higher one, and a client past a watermark cannot miss a change.
+    """
+    __tablename__ = "sync_clock"
+    
+    id = Column(Integer, primary_key=True)
+    commits = Column(BigInteger, nullable=False, default=0)
+
+
+event.listen(SyncClock.__table__, "after_create", DDL("INSERT INTO sync_clock (id, commits) VALUES (1, 0)"))
+
+
+def _defer_change_rows(session: Session, rows: Iterable[Dict[str, Any]]) -> None:
+    # Tagged with the innermost savepoint, so rolling it back drops them
+    savepoint = session.get_nested_transaction()
+    session.info.setdefault(_PENDING_CHANGE_ROWS_KEY, []).extend((savepoint, row) for row in rows)
+
+
+def record_changes(
+    session: Union[Session, AsyncSession],
+    user_id: str,
+    entity: str,
+    entity_ids: Iterable[str],
+    op: str = UPSERT
+) -> None:
+    """Log changes made outside the ORM unit of work (e.g. Core bulk writes) when the session commits."""
+    session = getattr(session, "sync_session", session)
+    _defer_change_rows(session, (
+        {"user_id": user_id, "entity": entity, "entity_id": entity_id, "op": op}
+        for entity_id in entity_ids
+    ))
+
+
+@event.listens_for(Session, "before_flush")
+def _log_synced_changes(session, flush_context, instances):
+    changes = []
+    for obj in session.new:
+        if isinstance(obj, SYNCED_MODELS):
+            if obj.id is None:
+                # Assign the primary key now so the log row can reference it
+                obj.id = str(uuid.uuid4())
+            changes.append((obj, UPSERT))
+    for obj in session.dirty:
+        if isinstance(obj, SYNCED_MODELS) and session.is_modified(obj, include_collections=False):
+            changes.append((obj, UPSERT))
+    for obj in session.deleted:
+        if isinstance(obj, SYNCED_MODELS):
+            changes.append((obj, DELETE))
+    
+    # Deferred by _defer_flushed_changes once the flush succeeds
+    session.info[_FLUSHED_CHANGE_ROWS_KEY] = [
+        {"user_id": obj.user_id, "entity": obj.__tablename__, "entity_id": obj.id, "op": op}
+        for obj, op in changes
+    ]
+
+
+def on_committed_changes(listener: Callable[[Set[Tuple[str, str]]], None]) -> Callable[[Set[Tuple[str, str]]], None]:
+    """Register a callback for the (user_id, entity) pairs of every committed change log write.
+
+    Every synced write goes through the change log, so this sees ORM flushes
+    and record_changes alike.
+    """
+    _commit_listeners.append(listener)
+    return listener
+
+
+@event.listens_for(Session, "after_flush")
+def _defer_flushed_changes(session, flush_context):
+    rows = session.info.pop(_FLUSHED_CHANGE_ROWS_KEY, None)
+    if rows:
+        _defer_change_rows(session, rows)
+
+
+@event.listens_for(Session, "before_commit")
+def _write_change_log(session):
+    """Insert the transaction's change rows last, behind the sync clock's row lock.
+
+    Numbering rows as they are flushed would let a transaction that flushed
+    early but commits late (a long import, a wait on a row lock) publish a
+    seq below one a client has already synced past.
+    """
+    if session.in_nested_transaction():
+        return
+    # Log the final flush's changes too; it would otherwise run after this hook
+    session.flush()
+    pending = session.info.pop(_PENDING_CHANGE_ROWS_KEY, None)
+    if not pending:
+        return
+    connection = session.connection()
+    connection.execute(update(SyncClock.__table__).where(SyncClock.id == 1).values(commits=SyncClock.commits + 1))
+    now = datetime.utcnow()
+    rows = [{**row, "changed_at": now} for _, row in pending]
+    connection.execute(insert(ChangeLog.__table__), rows)
+    session.info.setdefault(_COMMITTED_CHANGES_KEY, set()).update((row["user_id"], row["entity"]) for row in rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_logged_changes(session):
+    if session.in_nested_transaction():
+        return
+    changes = session.info.pop(_COMMITTED_CHANGES_KEY, None)
+    if changes:
+        for listener in _commit_listeners:
+            listener(changes)
+
+
+def _within(transaction: Optional[SessionTransaction], savepoint: SessionTransaction) -> bool:
+    while transaction is not None:
+        if transaction is savepoint:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_savepoint_changes(session, previous_transaction):
+    if previous_transaction.nested and _PENDING_CHANGE_ROWS_KEY in session.info:
+        session.info[_PENDING_CHANGE_ROWS_KEY] = [
+            (savepoint, row) for savepoint, row in session.info[_PENDING_CHANGE_ROWS_KEY]
+            if not _within(savepoint, previous_transaction)
+        ]
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_logged_changes(session):
+    if session.in_nested_transaction():
+        return
+    session.info.pop(_PENDING_CHANGE_ROWS_KEY, None)
+    session.info.pop(_COMMITTED_CHANGES_KEY, None)
\ No newline at end of file
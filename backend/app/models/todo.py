@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, Text
+from sqlalchemy import Column, String, Integer, DateTime, Boolean, ForeignKey, Text, Index
 from sqlalchemy.dialects.mysql import CHAR
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -8,6 +8,9 @@ from app.db.base import Base
 
 class Todo(Base):
     __tablename__ = "todos"
+    __table_args__ = (
+        Index("ix_todos_user_id_is_completed_priority_created_at", "user_id", "is_completed", "priority", "created_at"),
+    )
     
     id = Column(CHAR(36), primary_key=True, default=lambda: str(uuid.uuid4()))
     user_id = Column(CHAR(36), ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
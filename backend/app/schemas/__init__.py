@@ -5,7 +5,8 @@ from app.schemas.user import (
 )
 from app.schemas.food import (
     FoodEntryCreate, FoodEntryUpdate, FoodEntryResponse,
-    DailySummaryResponse, NutritionalInfo
+    DailySummaryResponse, RangeSummaryResponse, NutritionalInfo,
+    FoodSearchItem, FoodSearchResponse
 )
 from app.schemas.sleep import (
     SleepEntryCreate, SleepEntryUpdate, SleepEntryResponse,
@@ -13,11 +14,24 @@ from app.schemas.sleep import (
 )
 from app.schemas.habit import (
     HabitCreate, HabitUpdate, HabitResponse,
-    HabitCompletionCreate, HabitCompletionResponse
+    HabitCompletionCreate, HabitCompletionResponse, HabitCalendarResponse,
+    HabitHistoryImport
 )
 from app.schemas.todo import (
     TodoCreate, TodoUpdate, TodoResponse
 )
+from app.schemas.sync import (
+    SyncChanges, SyncDeletions, SyncResponse
+)
+from app.schemas.imports import (
+    ImportRowError, ImportResponse
+)
+from app.schemas.batch import (
+    BatchRequestItem, BatchRequest, BatchResponseItem, BatchResponse
+)
+from app.schemas.dashboard import (
+    DashboardHabit, DashboardTodo, DashboardFood, DashboardSleep, DashboardResponse
+)
 
 __all__ = [
     # User schemas
@@ -26,13 +40,23 @@ __all__ = [
     "RefreshTokenRequest",
     # Food schemas
     "FoodEntryCreate", "FoodEntryUpdate", "FoodEntryResponse",
-    "DailySummaryResponse", "NutritionalInfo",
+    "DailySummaryResponse", "RangeSummaryResponse", "NutritionalInfo",
+    "FoodSearchItem", "FoodSearchResponse",
     # Sleep schemas
     "SleepEntryCreate", "SleepEntryUpdate", "SleepEntryResponse",
     "WeeklySummaryResponse",
     # Habit schemas
     "HabitCreate", "HabitUpdate", "HabitResponse",
-    "HabitCompletionCreate", "HabitCompletionResponse",
+    "HabitCompletionCreate", "HabitCompletionResponse", "HabitCalendarResponse",
+    "HabitHistoryImport",
     # Todo schemas
     "TodoCreate", "TodoUpdate", "TodoResponse",
+    # Sync schemas
+    "SyncChanges", "SyncDeletions", "SyncResponse",
+    # Import schemas
+    "ImportRowError", "ImportResponse",
+    # Batch schemas
+    "BatchRequestItem", "BatchRequest", "BatchResponseItem", "BatchResponse",
+    # Dashboard schemas
+    "DashboardHabit", "DashboardTodo", "DashboardFood", "DashboardSleep", "DashboardResponse",
 ]
\ No newline at end of file
@@ -0,0 +1,23 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, Optional
+
+
+class BatchRequestItem(BaseModel):
+    id: Optional[str] = None  # Echoed back to match responses to requests
+    method: str = Field("GET", pattern="^GET$")
+    path: str = Field(..., min_length=1, description="Path under /api/v1, with query string")
+
+
+class BatchRequest(BaseModel):
+    requests: List[BatchRequestItem] = Field(..., min_length=1)
+
+
+class BatchResponseItem(BaseModel):
+    id: Optional[str]
+    status: int
+    headers: Dict[str, str]
+    body: Any
+
+
+class BatchResponse(BaseModel):
+    responses: List[BatchResponseItem]
@@ -0,0 +1,38 @@
+from pydantic import BaseModel
+from datetime import datetime, date
+from typing import Dict, List, Optional
+
+
+class DashboardHabit(BaseModel):
+    id: str
+    name: str
+    current_streak: int
+    is_completed_today: bool
+
+
+class DashboardTodo(BaseModel):
+    id: str
+    title: str
+    priority: int
+    due_date: Optional[datetime] = None
+
+
+class DashboardFood(BaseModel):
+    total_calories: int
+    entries_count: int
+    meal_breakdown: Dict[str, int]
+
+
+class DashboardSleep(BaseModel):
+    bedtime: datetime
+    wake_time: datetime
+    duration_hours: float
+    quality_rating: Optional[int] = None
+
+
+class DashboardResponse(BaseModel):
+    date: date
+    habits: List[DashboardHabit]
+    todos: List[DashboardTodo]
+    food: DashboardFood
+    sleep: Optional[DashboardSleep] = None  # Last night's sleep (the entry dated today)
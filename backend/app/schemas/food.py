@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from app.models.food import MealCategory
 
 
@@ -50,4 +50,31 @@ class DailySummaryResponse(BaseModel):
     total_calories: int
     meal_breakdown: Dict[str, int]
     entries_count: int
-    nutritional_summary: Dict[str, float]
\ No newline at end of file
+    nutritional_summary: Dict[str, float]
+
+
+class RangeSummaryResponse(BaseModel):
+    date_from: str
+    date_to: str
+    total_calories: int
+    meal_breakdown: Dict[str, int]
+    entries_count: int
+    nutritional_summary: Dict[str, float]
+    days: List[DailySummaryResponse]
+
+
+class FoodSearchItem(BaseModel):
+    id: int
+    food_name: str
+    serving: str
+    quantity: float
+    calories: int
+    nutritional_info: Dict[str, float]
+    score: float
+
+
+class FoodSearchResponse(BaseModel):
+    results: List[FoodSearchItem]
+    total: int
+    skip: int
+    limit: int
\ No newline at end of file
@@ -1,6 +1,22 @@
-from pydantic import BaseModel, Field
-from datetime import datetime, date
-from typing import Optional
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime, date, timedelta
+from typing import List, Optional
+
+# Completions are stored as a bitmap from the earliest completed day, so an
+# unbounded date could grow it to hundreds of KB; this caps it at a few KB
+COMPLETION_DATE_HORIZON = date(2000, 1, 1)
+
+
+def check_completion_date(value: Optional[date]) -> Optional[date]:
+    """Reject completion dates in the future or before COMPLETION_DATE_HORIZON."""
+    if value is None:
+        return value
+    # One day of slack for clients whose local date is ahead of the server's
+    if value > date.today() + timedelta(days=1):
+        raise ValueError("completion_date cannot be in the future")
+    if value < COMPLETION_DATE_HORIZON:
+        raise ValueError(f"completion_date cannot be before {COMPLETION_DATE_HORIZON}")
+    return value
 
 
 class HabitBase(BaseModel):
@@ -35,6 +51,8 @@ class HabitResponse(HabitBase):
 class HabitCompletionCreate(BaseModel):
     habit_id: str
     completion_date: Optional[date] = None
+    
+    _check_completion_date = field_validator("completion_date")(check_completion_date)
 
 
 class HabitCompletionResponse(BaseModel):
@@ -45,4 +63,21 @@ class HabitCompletionResponse(BaseModel):
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class HabitHistoryImport(HabitBase):
+    """One imported completion; the habit is matched (or created) by name."""
+    completion_date: date
+    
+    _check_completion_date = field_validator("completion_date")(check_completion_date)
+
+
+class HabitCalendarResponse(BaseModel):
+    habit_id: str
+    year: int
+    days: List[int]  # 1 if completed, one entry per day of the year starting Jan 1
+    completed_days: int
+    completion_rate: float
+    current_streak: int
+    longest_streak: int
\ No newline at end of file
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List
+
+
+class ImportRowError(BaseModel):
+    row: int  # 1-based data row, not counting a CSV header
+    errors: List[str]
+
+
+class ImportResponse(BaseModel):
+    kind: str
+    rows: int
+    imported: int
+    failed: int
+    errors: List[ImportRowError]
+    errors_truncated: bool
@@ -0,0 +1,29 @@
+from pydantic import BaseModel
+from typing import List
+from app.schemas.food import FoodEntryResponse
+from app.schemas.sleep import SleepEntryResponse
+from app.schemas.habit import HabitResponse, HabitCompletionResponse
+from app.schemas.todo import TodoResponse
+
+
+class SyncChanges(BaseModel):
+    food_entries: List[FoodEntryResponse] = []
+    sleep_entries: List[SleepEntryResponse] = []
+    habits: List[HabitResponse] = []
+    habit_completions: List[HabitCompletionResponse] = []
+    todos: List[TodoResponse] = []
+
+
+class SyncDeletions(BaseModel):
+    food_entries: List[str] = []
+    sleep_entries: List[str] = []
+    habits: List[str] = []
+    habit_completions: List[str] = []
+    todos: List[str] = []
+
+
+class SyncResponse(BaseModel):
+    changes: SyncChanges
+    deleted: SyncDeletions
+    watermark: int
+    has_more: bool
@@ -0,0 +1,119 @@
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+from starlette.types import ASGIApp, Message, Scope
+from app.core.auth_cache import PrincipalSnapshot
+
+logger = logging.getLogger(__name__)
+
+API_PREFIX = "/api/v1"
+
+# Paths that cannot be batched: nested batches and non-JSON (streaming) responses
+EXCLUDED_PREFIXES = ("/batch", "/export")
+
+# Request headers forwarded from the batch call to every sub-request
+FORWARDED_HEADERS = {b"authorization", b"accept-language", b"user-agent"}
+
+# Response headers not worth repeating inside the batch body
+DROPPED_HEADERS = {"content-length", "content-type"}
+
+
+def is_batchable(path: str) -> bool:
+    """Whether a sub-request path (relative to /api/v1) may be part of a batch."""
+    route = urlsplit(path).path
+    return route.startswith("/") and not route.startswith(EXCLUDED_PREFIXES)
+
+
+async def dispatch(
+    app: ASGIApp,
+    parent: Scope,
+    principal: PrincipalSnapshot,
+    path: str
+) -> Tuple[int, Dict[str, str], bytes]:
+    """Run GET /api/v1{path} through the application in-process.
+
+    The sub-request goes through the usual middleware, routing, validation
+    and response models; it skips authentication by carrying the batch's
+    principal in its scope state. Returns (status, headers, raw body).
+    """
+    url = urlsplit(path)
+    scope = {
+        "type": "http",
+        "asgi": parent.get("asgi", {"version": "3.0"}),
+        "http_version": parent.get("http_version", "1.1"),
+        "method": "GET",
+        "scheme": parent.get("scheme", "http"),
+        "server": parent.get("server"),
+        "client": parent.get("client"),
+        "root_path": parent.get("root_path", ""),
+        "path": API_PREFIX + url.path,
+        "raw_path": (API_PREFIX + url.path).encode(),
+        "query_string": url.query.encode(),
+        "headers": [(name, value) for name, value in parent["headers"] if name in FORWARDED_HEADERS],
+        "state": {"principal": principal},
+    }
+    status_code = 500
+    headers: Dict[str, str] = {}
+    chunks: List[bytes] = []
+    done = asyncio.Event()
+    request_sent = False
+
+    async def receive() -> Message:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Only reached by handlers listening for a disconnect
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: Message) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            for name, value in message.get("headers", []):
+                name = name.decode("latin-1").lower()
+                if name not in DROPPED_HEADERS:
+                    headers[name] = value.decode("latin-1")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                done.set()
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # The error middleware has already sent the 500 response before re-raising
+        logger.exception(f"Batched request GET {path} failed")
+    return status_code, headers, b"".join(chunks)
+
+
+async def run_batch(
+    app: ASGIApp,
+    parent: Scope,
+    principal: PrincipalSnapshot,
+    items: List[Tuple[Optional[str], str]],
+    concurrency: int
+) -> bytes:
+    """Dispatch (id, path) sub-requests, at most `concurrency` at a time.
+
+    Returns the encoded BatchResponse, in request order. Sub-response
+    bodies are spliced in as they are rather than decoded and re-encoded.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(path: str) -> Tuple[int, Dict[str, str], bytes]:
+        if not is_batchable(path):
+            return 400, {}, json.dumps({"success": False, "message": f"Cannot batch {path}", "errors": []}).encode()
+        async with semaphore:
+            return await dispatch(app, parent, principal, path)
+
+    results = await asyncio.gather(*(run(path) for _, path in items))
+    parts = []
+    for (item_id, _), (status_code, headers, body) in zip(items, results):
+        head = json.dumps({"id": item_id, "status": status_code, "headers": headers}, separators=(",", ":"))
+        parts.append(head[:-1].encode() + b',"body":' + (body or b"null") + b"}")
+    return b'{"responses":[' + b",".join(parts) + b"]}"
+
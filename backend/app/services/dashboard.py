@@ -0,0 +1,111 @@
+import asyncio
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import settings
+from app.core.response_cache import DASHBOARD_DOMAIN, cache_namespace, response_cache
+from app.db.base import AsyncSessionLocal
+from app.models.sleep import SleepEntry
+from app.models.todo import Todo
+from app.schemas.dashboard import DashboardResponse
+from app.services.food_rollups import get_daily_rollup_summary
+from app.services.habits import get_habits_with_today_status
+
+
+async def _habits(db: AsyncSession, user_id: str, today: date) -> List[Dict[str, Any]]:
+    habits = await get_habits_with_today_status(db, user_id, is_active=True)
+    return [
+        {
+            "id": habit.id,
+            "name": habit.name,
+            "current_streak": habit.current_streak,
+            "is_completed_today": habit.is_completed_today,
+        }
+        for habit in habits
+    ]
+
+
+async def _todos(db: AsyncSession, user_id: str, today: date) -> List[Todo]:
+    return (await db.scalars(
+        select(Todo).filter(
+            and_(
+                Todo.user_id == user_id,
+                Todo.is_completed == False
+            )
+        ).order_by(Todo.priority, Todo.created_at.desc())
+    )).all()
+
+
+async def _food(db: AsyncSession, user_id: str, today: date) -> Dict[str, Any]:
+    return await get_daily_rollup_summary(db, user_id, today)
+
+
+async def _sleep(db: AsyncSession, user_id: str, today: date) -> Optional[SleepEntry]:
+    # Sleep entries are dated by wake time, so last night's sleep is today's entry
+    return await db.scalar(select(SleepEntry).filter(
+        and_(
+            SleepEntry.user_id == user_id,
+            SleepEntry.date == today
+        )
+    ))
+
+
+SECTIONS: Tuple[Tuple[str, Callable[[AsyncSession, str, date], Awaitable[Any]]], ...] = (
+    ("habits", _habits),
+    ("todos", _todos),
+    ("food", _food),
+    ("sleep", _sleep),
+)
+
+
+def concurrent_queries() -> bool:
+    """Whether dashboard sections run on separate connections."""
+    if settings.DASHBOARD_CONCURRENT_QUERIES is not None:
+        return settings.DASHBOARD_CONCURRENT_QUERIES
+    # aiosqlite opens a connection (and thread) per session and has no pool to borrow from
+    return not settings.ASYNC_DATABASE_URL.startswith("sqlite")
+
+
+async def load_dashboard(db: AsyncSession, user_id: str, today: date, concurrent: bool) -> Dict[str, Any]:
+    """Load every dashboard section; one query each.
+
+    With `concurrent`, the first section uses db and the others run at the
+    same time on their own sessions (and pooled connections).
+    """
+    if not concurrent:
+        results = [await load(db, user_id, today) for _, load in SECTIONS]
+    else:
+        async def run_isolated(load):
+            async with AsyncSessionLocal() as section_db:
+                return await load(section_db, user_id, today)
+
+        (_, first), *rest = SECTIONS
+        results = await asyncio.gather(first(db, user_id, today), *(run_isolated(load) for _, load in rest))
+    payload = {name: result for (name, _), result in zip(SECTIONS, results)}
+    payload["date"] = today
+    return payload
+
+
+async def get_dashboard(db: AsyncSession, user_id: str, today: Optional[date] = None) -> bytes:
+    """Encoded DashboardResponse for user_id, from the response cache when still valid.
+
+    Stored in the user's "dashboard" namespace, whose generation every food,
+    sleep, habit and todo write replaces, so with Redis all workers see the
+    invalidation.
+    """
+    today = today or date.today()
+    generation = None
+    if response_cache.enabled:
+        namespace = cache_namespace(user_id, DASHBOARD_DOMAIN)
+        key = f"{namespace}:{today.isoformat()}"
+        generation, body = await response_cache.lookup(namespace, key, DASHBOARD_DOMAIN)
+        if body is not None:
+            return body
+
+    payload = await load_dashboard(db, user_id, today, concurrent_queries())
+    body = DashboardResponse.model_validate(payload, from_attributes=True).model_dump_json().encode()
+    # Stored under the generation read before loading, so a write committed meanwhile wins
+    if generation is not None:
+        await response_cache.store(namespace, key, generation, body)
+    return body
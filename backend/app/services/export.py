@@ -0,0 +1,120 @@
+import csv
+import io
+import json
+import zlib
+from typing import Any, AsyncIterator, Dict, Iterable, Optional, Sequence, Tuple, Type
+from pydantic import BaseModel
+from sqlalchemy import select
+from app.db.base import AsyncSessionLocal
+from app.models.food import FoodEntry
+from app.models.sleep import SleepEntry
+from app.models.habit import Habit, HabitCompletion
+from app.models.todo import Todo
+from app.schemas.food import FoodEntryResponse
+from app.schemas.sleep import SleepEntryResponse
+from app.schemas.habit import HabitResponse, HabitCompletionResponse
+from app.schemas.todo import TodoResponse
+
+# Exported tables in order: (table name, model, schema, sort column)
+EXPORT_TABLES: Tuple[Tuple[str, Any, Type[BaseModel], Any], ...] = (
+    ("food_entries", FoodEntry, FoodEntryResponse, FoodEntry.logged_at),
+    ("sleep_entries", SleepEntry, SleepEntryResponse, SleepEntry.date),
+    ("habits", Habit, HabitResponse, Habit.created_at),
+    ("habit_completions", HabitCompletion, HabitCompletionResponse, HabitCompletion.completion_date),
+    ("todos", Todo, TodoResponse, Todo.created_at),
+)
+
+# Rows fetched per server-side cursor round trip
+YIELD_PER = 500
+# Uncompressed bytes buffered before each write to the response
+CHUNK_SIZE = 64 * 1024
+
+
+def export_columns(schema: Type[BaseModel]) -> Sequence[str]:
+    return [name for name in schema.model_fields if name != "is_completed_today"]
+
+
+async def iter_export_rows(
+    user_id: str,
+    tables: Optional[Iterable[str]] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (table, JSON-ready row) for every exported row of a user.
+
+    Rows are streamed from a server-side cursor YIELD_PER at a time, so
+    memory does not grow with the number of rows.
+    """
+    selected = set(tables) if tables else None
+    async with AsyncSessionLocal() as db:
+        for table, model, schema, sort_column in EXPORT_TABLES:
+            if selected is not None and table not in selected:
+                continue
+            columns = set(export_columns(schema))
+            # Plain column rows rather than ORM objects: nothing accumulates in the identity map
+            result = await db.stream(
+                select(model.__table__).filter(model.user_id == user_id)
+                .order_by(sort_column, model.id)
+                .execution_options(yield_per=YIELD_PER)
+            )
+            async for partition in result.mappings().partitions():
+                for values in partition:
+                    row = schema.model_validate(values).model_dump(mode="json", include=columns)
+                    yield table, row
+
+
+def _csv_line(values: Sequence[Any]) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(values)
+    return buffer.getvalue()
+
+
+def _csv_value(value: Any) -> Any:
+    return json.dumps(value) if isinstance(value, (dict, list)) else value
+
+
+async def stream_export(
+    user_id: str,
+    export_format: str = "ndjson",
+    compress: bool = True,
+    tables: Optional[Iterable[str]] = None
+) -> AsyncIterator[bytes]:
+    """Stream a user's data as NDJSON or CSV, gzip-compressed on the fly.
+
+    NDJSON lines carry a "table" key. CSV output starts a new header row,
+    prefixed with "table", whenever the table changes; exporting a single
+    table gives a plain CSV without the prefix column.
+    """
+    # wbits=31 writes a gzip header and trailer around the deflate stream
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    tables = list(tables) if tables else None
+    prefix_table = not (tables and len(set(tables)) == 1)
+    buffer = []
+    size = 0
+    current_table = None
+
+    async for table, row in iter_export_rows(user_id, tables):
+        if export_format == "csv":
+            prefix = [table] if prefix_table else []
+            if table != current_table:
+                current_table = table
+                header = _csv_line((["table"] if prefix_table else []) + list(row))
+                buffer.append(header)
+                size += len(header)
+            line = _csv_line(prefix + [_csv_value(value) for value in row.values()])
+        else:
+            line = json.dumps({"table": table, **row}, separators=(",", ":")) + "\n"
+        buffer.append(line)
+        size += len(line)
+
+        if size >= CHUNK_SIZE:
+            data = "".join(buffer).encode()
+            buffer, size = [], 0
+            if compressor:
+                data = compressor.compress(data)
+            if data:
+                yield data
+
+    data = "".join(buffer).encode()
+    if compressor:
+        data = compressor.compress(data) + compressor.flush()
+    if data:
+        yield data
@@ -0,0 +1,189 @@
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Tuple
+from sqlalchemy import select, insert, and_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.food import FoodEntry, FoodDailyRollup, MealCategory
+from app.services.food_summary import NUTRIENTS, empty_summary, nutrient_value
+
+COUNTER_COLUMNS = ["entries_count", "total_calories"] + [
+    f"{meal.value}_{suffix}" for meal in MealCategory for suffix in ("calories", "count")
+]
+
+
+def new_rollup(user_id: str, day: date) -> FoodDailyRollup:
+    """Create an all-zero rollup row."""
+    rollup = FoodDailyRollup(user_id=user_id, date=day)
+    for column in COUNTER_COLUMNS:
+        setattr(rollup, column, 0)
+    for nutrient in NUTRIENTS:
+        setattr(rollup, nutrient, 0.0)
+    return rollup
+
+
+def entry_contribution(entry: FoodEntry) -> Dict[str, float]:
+    """Rollup column deltas contributed by one food entry."""
+    meal = MealCategory(entry.meal_category).value
+    contribution = {
+        "entries_count": 1,
+        "total_calories": entry.calories,
+        f"{meal}_calories": entry.calories,
+        f"{meal}_count": 1,
+    }
+    info = entry.nutritional_info or {}
+    for nutrient in NUTRIENTS:
+        contribution[nutrient] = nutrient_value(info.get(nutrient))
+    return contribution
+
+
+def apply_contribution(rollup: FoodDailyRollup, contribution: Dict[str, float], sign: int) -> None:
+    """Add (sign=1) or subtract (sign=-1) an entry's contribution."""
+    for column, value in contribution.items():
+        total = getattr(rollup, column) + sign * value
+        setattr(rollup, column, round(total, 4) if column in NUTRIENTS else total)
+
+
+async def _locked_rollup(db: AsyncSession, user_id: str, day: date) -> FoodDailyRollup:
+    """Get the rollup row for (user_id, day) locked for update, creating it if missing."""
+    query = select(FoodDailyRollup).filter(
+        and_(
+            FoodDailyRollup.user_id == user_id,
+            FoodDailyRollup.date == day
+        )
+    ).with_for_update()
+    rollup = await db.scalar(query)
+    if rollup is None:
+        rollup = new_rollup(user_id, day)
+        try:
+            async with db.begin_nested():
+                db.add(rollup)
+        except IntegrityError:
+            # Another request created the row first
+            rollup = await db.scalar(query)
+    return rollup
+
+
+async def add_entry_to_rollup(db: AsyncSession, entry: FoodEntry) -> None:
+    """Count an entry (as currently loaded) in its day's rollup."""
+    rollup = await _locked_rollup(db, entry.user_id, entry.logged_at.date())
+    apply_contribution(rollup, entry_contribution(entry), 1)
+
+
+async def remove_entry_from_rollup(db: AsyncSession, entry: FoodEntry) -> None:
+    """Remove an entry (as currently loaded) from its day's rollup."""
+    rollup = await _locked_rollup(db, entry.user_id, entry.logged_at.date())
+    apply_contribution(rollup, entry_contribution(entry), -1)
+
+
+async def move_entry_in_rollups(
+    db: AsyncSession,
+    entry: FoodEntry,
+    old_day: date,
+    old_contribution: Dict[str, float]
+) -> None:
+    """Replace an entry's old contribution on old_day with its current one.
+
+    Both days' rollups are locked in date order, so two updates moving
+    entries between the same days in opposite directions cannot deadlock.
+    """
+    new_day = entry.logged_at.date()
+    rollups = {}
+    for day in sorted({old_day, new_day}):
+        rollups[day] = await _locked_rollup(db, entry.user_id, day)
+    apply_contribution(rollups[old_day], old_contribution, -1)
+    apply_contribution(rollups[new_day], entry_contribution(entry), 1)
+
+
+async def add_entries_to_rollups(db: AsyncSession, user_id: str, entries: Iterable[Tuple[date, Any]]) -> None:
+    """Count many new (day, entry) pairs of one user, locking each day's rollup once.
+
+    Contributions are summed per day first. Existing rollups are updated in
+    place; missing ones are inserted with one executemany.
+    """
+    totals: Dict[date, Dict[str, float]] = {}
+    for day, entry in entries:
+        total = totals.setdefault(day, {})
+        for column, value in entry_contribution(entry).items():
+            total[column] = total.get(column, 0) + value
+    if not totals:
+        return
+    
+    existing = (await db.scalars(
+        select(FoodDailyRollup).filter(
+            and_(
+                FoodDailyRollup.user_id == user_id,
+                FoodDailyRollup.date.in_(list(totals))
+            )
+        ).with_for_update()
+    )).all()
+    for rollup in existing:
+        apply_contribution(rollup, totals.pop(rollup.date), 1)
+    
+    if totals:
+        zero = {column: 0 for column in COUNTER_COLUMNS}
+        zero.update({nutrient: 0.0 for nutrient in NUTRIENTS})
+        now = datetime.utcnow()
+        # A concurrent insert of the same day surfaces as an IntegrityError
+        await db.execute(insert(FoodDailyRollup), [
+            {
+                **zero,
+                **{column: round(value, 4) if column in NUTRIENTS else value for column, value in total.items()},
+                "user_id": user_id,
+                "date": day,
+                "updated_at": now
+            }
+            for day, total in totals.items()
+        ])
+
+
+def rollup_summary(rollup: FoodDailyRollup) -> Dict[str, Any]:
+    """Daily summary fields from a rollup row."""
+    summary = empty_summary()
+    if rollup is None:
+        return summary
+    summary["total_calories"] = rollup.total_calories
+    summary["entries_count"] = rollup.entries_count
+    summary["meal_breakdown"] = {
+        meal.value: getattr(rollup, f"{meal.value}_calories")
+        for meal in MealCategory
+        if getattr(rollup, f"{meal.value}_count") > 0
+    }
+    summary["nutritional_summary"] = {nutrient: getattr(rollup, nutrient) for nutrient in NUTRIENTS}
+    return summary
+
+
+async def get_daily_rollup_summary(db: AsyncSession, user_id: str, day: date) -> Dict[str, Any]:
+    """Daily summary served by a single primary-key read."""
+    return rollup_summary(await db.get(FoodDailyRollup, (user_id, day)))
+
+
+async def get_range_rollup_summaries(
+    db: AsyncSession,
+    user_id: str,
+    date_from: date,
+    date_to: date
+) -> Tuple[Dict[str, Any], List[Tuple[date, Dict[str, Any]]]]:
+    """Totals and per-day summaries for days with entries between date_from and date_to."""
+    rollups = (await db.scalars(
+        select(FoodDailyRollup).filter(
+            and_(
+                FoodDailyRollup.user_id == user_id,
+                FoodDailyRollup.date >= date_from,
+                FoodDailyRollup.date <= date_to,
+                FoodDailyRollup.entries_count > 0
+            )
+        ).order_by(FoodDailyRollup.date)
+    )).all()
+    
+    totals = empty_summary()
+    days = []
+    for rollup in rollups:
+        summary = rollup_summary(rollup)
+        days.append((rollup.date, summary))
+        totals["total_calories"] += summary["total_calories"]
+        totals["entries_count"] += summary["entries_count"]
+        for meal, calories in summary["meal_breakdown"].items():
+            totals["meal_breakdown"][meal] = totals["meal_breakdown"].get(meal, 0) + calories
+        for nutrient, value in summary["nutritional_summary"].items():
+            totals["nutritional_summary"][nutrient] = round(totals["nutritional_summary"][nutrient] + value, 4)
+    return totals, days
@@ -0,0 +1,226 @@
+import csv
+import re
+import unicodedata
+from array import array
+from bisect import bisect_left
+from collections import defaultdict
+from operator import itemgetter
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from app.core.config import settings
+
+DEFAULT_FOOD_DATABASE = Path(__file__).resolve().parent.parent / "data" / "foods.csv"
+
+NUTRIENT_COLUMNS = ("carbs", "protein", "fat", "fiber", "sugar", "sodium")
+
+# Per-token match scores: exact beats prefix beats typo-tolerant matches
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.8
+FUZZY_SCORE = 0.6
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, accent-folded alphanumeric tokens of text."""
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
+    return _TOKEN_RE.findall(text.lower())
+
+
+def trigrams(token: str) -> set:
+    """Character trigrams of a token padded with boundary markers."""
+    padded = f"^{token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(token: str) -> int:
+    """Typos tolerated for a query token of this length."""
+    if len(token) < 4:
+        return 0
+    return 1 if len(token) < 8 else 2
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance, or limit + 1 once it exceeds limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class FoodSearchIndex:
+    """In-memory search over a nutrition dataset.
+
+    Foods are stored column-wise (names, servings and packed numeric arrays).
+    Every distinct token maps to a sorted posting array of food ids; the
+    sorted token list gives prefix matches by bisection, and a trigram index
+    over the distinct tokens gives candidates for typo-tolerant matches.
+    """
+
+    def __init__(self, rows: Iterable[Dict[str, Any]]):
+        self.names: List[str] = []
+        self.servings: List[str] = []
+        self.calories = array("i")
+        self.nutrients = {column: array("f") for column in NUTRIENT_COLUMNS}
+
+        # Food ids follow (token count, name) order, so equal scores rank by id
+        parsed = sorted(
+            (
+                (
+                    tokenize(row["name"]),
+                    row["name"].strip(),
+                    row.get("serving") or "1 serving",
+                    int(round(float(row.get("calories") or 0))),
+                    tuple(float(row.get(column) or 0) for column in NUTRIENT_COLUMNS)
+                )
+                for row in rows
+            ),
+            key=lambda item: (len(item[0]), item[1].lower())
+        )
+        postings = defaultdict(lambda: array("I"))
+        for food_id, (tokens, name, serving, calories, nutrients) in enumerate(parsed):
+            self.names.append(name)
+            self.servings.append(serving)
+            self.calories.append(calories)
+            for column, value in zip(NUTRIENT_COLUMNS, nutrients):
+                self.nutrients[column].append(value)
+            for token in dict.fromkeys(tokens):
+                postings[token].append(food_id)
+        del parsed
+
+        self.tokens: List[str] = sorted(postings)
+        self.postings: List[array] = [postings[token] for token in self.tokens]
+        grams = defaultdict(lambda: array("I"))
+        for index, token in enumerate(self.tokens):
+            for gram in trigrams(token):
+                grams[gram].append(index)
+        self.grams = dict(grams)
+
+    @classmethod
+    def from_csv(cls, path: Path) -> "FoodSearchIndex":
+        with open(path, newline="", encoding="utf-8") as handle:
+            return cls(csv.DictReader(handle))
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def _prefix_matches(self, token: str) -> Iterator[int]:
+        index = bisect_left(self.tokens, token)
+        while index < len(self.tokens) and self.tokens[index].startswith(token):
+            yield index
+            index += 1
+
+    def _fuzzy_matches(self, token: str, limit: int) -> Iterator[Tuple[int, int]]:
+        query_grams = trigrams(token)
+        overlaps: Dict[int, int] = defaultdict(int)
+        for gram in query_grams:
+            for index in self.grams.get(gram, ()):
+                overlaps[index] += 1
+        # Each edit destroys at most three trigrams
+        needed = max(1, len(query_grams) - 3 * limit)
+        for index, overlap in overlaps.items():
+            if overlap >= needed:
+                distance = edit_distance(token, self.tokens[index], limit)
+                if distance <= limit:
+                    yield index, distance
+
+    def match_token(self, token: str) -> Dict[int, float]:
+        """Best score per token id for one query token."""
+        matches: Dict[int, float] = {}
+        for index in self._prefix_matches(token):
+            candidate = self.tokens[index]
+            if candidate == token:
+                matches[index] = EXACT_SCORE
+            else:
+                matches[index] = PREFIX_SCORE + 0.1 * len(token) / len(candidate)
+        limit = max_edits(token)
+        if limit:
+            for index, distance in self._fuzzy_matches(token, limit):
+                if index not in matches:
+                    matches[index] = FUZZY_SCORE * (1 - distance / (len(token) + 1))
+        return matches
+
+    def _score_foods(self, token_scores: Dict[int, float]) -> Dict[int, float]:
+        scores: Dict[int, float] = {}
+        # Apply the weakest matches first so each food keeps its best score
+        for index, score in sorted(token_scores.items(), key=itemgetter(1)):
+            scores.update(dict.fromkeys(self.postings[index], score))
+        return scores
+
+    def _intersect(self, scores: Dict[int, float], token_scores: Dict[int, float]) -> Dict[int, float]:
+        """Keep foods in scores that also match token_scores, adding their best token score."""
+        matched = self._score_foods(token_scores)
+        return {food_id: scores[food_id] + matched[food_id] for food_id in scores.keys() & matched.keys()}
+
+    def search(self, query: str, skip: int = 0, limit: int = 20) -> Tuple[int, List[Tuple[int, float]]]:
+        """Return (total, [(food_id, score), ...]) for foods matching every query token."""
+        query_tokens = list(dict.fromkeys(tokenize(query)))
+        if not query_tokens:
+            return 0, []
+
+        per_token = [self.match_token(token) for token in query_tokens]
+        if not all(per_token):
+            return 0, []
+        # Start from the most selective token so intersections stay small
+        order = sorted(
+            range(len(per_token)),
+            key=lambda i: sum(len(self.postings[index]) for index in per_token[i])
+        )
+        scores = self._score_foods(per_token[order[0]])
+        for i in order[1:]:
+            scores = self._intersect(scores, per_token[i])
+
+        # Best score first; ties keep food id (shorter names first) order
+        count = len(query_tokens)
+        ranked = sorted(sorted(scores.items()), key=itemgetter(1), reverse=True)
+        return len(scores), [
+            (food_id, round(score / count, 4)) for food_id, score in ranked[skip:skip + limit]
+        ]
+
+    def food(self, food_id: int) -> Dict[str, Any]:
+        """One food as FoodEntryCreate-ready fields for a single serving."""
+        return {
+            "id": food_id,
+            "food_name": self.names[food_id],
+            "serving": self.servings[food_id],
+            "quantity": 1.0,
+            "calories": self.calories[food_id],
+            "nutritional_info": {
+                column: round(self.nutrients[column][food_id], 2) for column in NUTRIENT_COLUMNS
+            },
+        }
+
+
+_index: Optional[FoodSearchIndex] = None
+
+
+def get_food_search_index() -> FoodSearchIndex:
+    """Process-wide index, loaded from FOOD_DATABASE_PATH on first use."""
+    global _index
+    if _index is None:
+        _index = FoodSearchIndex.from_csv(Path(settings.FOOD_DATABASE_PATH or DEFAULT_FOOD_DATABASE))
+    return _index
+
+
+def search_foods(query: str, skip: int = 0, limit: int = 20) -> Dict[str, Any]:
+    """Search the food database and return a paginated result page."""
+    index = get_food_search_index()
+    total, hits = index.search(query, skip=skip, limit=limit)
+    results = []
+    for food_id, score in hits:
+        result = index.food(food_id)
+        result["score"] = score
+        results.append(result)
+    return {"results": results, "total": total, "skip": skip, "limit": limit}
@@ -0,0 +1,104 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+from sqlalchemy import select, func, and_, case
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.food import FoodEntry
+
+NUTRIENTS = ("carbs", "protein", "fat", "fiber", "sugar", "sodium")
+
+# Dialects whose JSON functions let the database sum nutritional_info values
+JSON_AGGREGATE_DIALECTS = {"mysql", "mariadb", "sqlite"}
+
+# JSON_TYPE names of numbers (SQLite, then MySQL); like nutrient_value, booleans
+# and strings count as 0
+JSON_NUMBER_TYPES = ("integer", "real", "INTEGER", "UNSIGNED INTEGER", "DOUBLE", "DECIMAL")
+
+
+def nutrient_value(value: Any) -> float:
+    """Numeric value of a nutritional_info field, or 0 for missing/non-numeric values."""
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return 0.0
+    return float(value)
+
+
+def empty_summary() -> Dict[str, Any]:
+    return {
+        "total_calories": 0,
+        "meal_breakdown": {},
+        "entries_count": 0,
+        "nutritional_summary": {nutrient: 0.0 for nutrient in NUTRIENTS},
+    }
+
+
+def summarize_entries(entries: Iterable[FoodEntry]) -> Dict[str, Any]:
+    """Summarize loaded entries in Python (fallback for dialects without JSON sums)."""
+    summary = empty_summary()
+    for entry in entries:
+        category = entry.meal_category.value
+        summary["total_calories"] += entry.calories
+        summary["entries_count"] += 1
+        summary["meal_breakdown"][category] = summary["meal_breakdown"].get(category, 0) + entry.calories
+
+        if entry.nutritional_info:
+            for nutrient in NUTRIENTS:
+                summary["nutritional_summary"][nutrient] += nutrient_value(entry.nutritional_info.get(nutrient))
+    return summary
+
+
+def _nutrient_sum(dialect: str, nutrient: str):
+    path = f'$."{nutrient}"'
+    if dialect == "sqlite":
+        json_type = func.json_type(FoodEntry.nutritional_info, path)
+    else:
+        json_type = func.json_type(func.json_extract(FoodEntry.nutritional_info, path))
+    return func.sum(
+        case((json_type.in_(JSON_NUMBER_TYPES), FoodEntry.nutritional_info[nutrient].as_float()), else_=0)
+    ).label(nutrient)
+
+
+def summary_columns(dialect: str) -> List[Any]:
+    """Aggregates of a food entry group: entries_count, calories and one sum per nutrient."""
+    return [
+        func.count(FoodEntry.id).label("entries_count"),
+        func.sum(FoodEntry.calories).label("calories"),
+        *(_nutrient_sum(dialect, nutrient) for nutrient in NUTRIENTS)
+    ]
+
+
+async def summarize_food_entries(
+    db: AsyncSession,
+    user_id: str,
+    start_time: datetime,
+    end_time: datetime
+) -> Dict[str, Any]:
+    """Summarize a user's food entries between start_time and end_time inclusive.
+
+    Aggregates with GROUP BY meal_category and JSON sums when the dialect
+    supports it, otherwise loads the entries and sums in Python.
+    """
+    in_range = and_(
+        FoodEntry.user_id == user_id,
+        FoodEntry.logged_at >= start_time,
+        FoodEntry.logged_at <= end_time
+    )
+    dialect = db.get_bind().dialect.name
+
+    if dialect not in JSON_AGGREGATE_DIALECTS:
+        entries = (await db.scalars(select(FoodEntry).filter(in_range))).all()
+        return summarize_entries(entries)
+
+    rows = (await db.execute(
+        select(FoodEntry.meal_category, *summary_columns(dialect))
+        .filter(in_range)
+        .group_by(FoodEntry.meal_category)
+    )).all()
+
+    summary = empty_summary()
+    for row in rows:
+        calories = int(row.calories or 0)
+        summary["total_calories"] += calories
+        summary["entries_count"] += row.entries_count
+        summary["meal_breakdown"][row.meal_category.value] = calories
+        for nutrient in NUTRIENTS:
+            summary["nutritional_summary"][nutrient] += float(getattr(row, nutrient) or 0)
+    return summary
@@ -0,0 +1,154 @@
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.habit import Habit, HabitCompletion
+
+
+class CompletionBitmap:
+    """Day-indexed completion bitset for one habit.
+
+    Bit i is set when the habit was completed on origin + i days. The bits are
+    held in a Python int, so membership, range counts and run lengths are
+    word-level bit operations rather than per-row scans.
+    """
+
+    def __init__(self, origin: Optional[date] = None, bits: int = 0):
+        self.origin = origin
+        self.bits = bits
+
+    @classmethod
+    def from_bytes(cls, origin: Optional[date], data: Optional[bytes]) -> "CompletionBitmap":
+        return cls(origin, int.from_bytes(data or b"", "little"))
+
+    @classmethod
+    def from_habit(cls, habit: Habit) -> "CompletionBitmap":
+        return cls.from_bytes(habit.bitmap_origin, habit.completion_bitmap)
+
+    @classmethod
+    def from_dates(cls, dates: Iterable[date]) -> "CompletionBitmap":
+        bitmap = cls()
+        for day in sorted(set(dates)):
+            bitmap.add(day)
+        return bitmap
+
+    def to_bytes(self) -> bytes:
+        return self.bits.to_bytes((self.bits.bit_length() + 7) // 8, "little")
+
+    def store(self, habit: Habit) -> None:
+        """Write the bitmap back onto the habit row."""
+        habit.bitmap_origin = self.origin
+        habit.completion_bitmap = self.to_bytes()
+
+    def _index(self, day: date) -> int:
+        return (day - self.origin).days
+
+    def __contains__(self, day: date) -> bool:
+        if self.origin is None or day < self.origin:
+            return False
+        return bool(self.bits >> self._index(day) & 1)
+
+    def add(self, day: date) -> None:
+        if self.origin is None:
+            self.origin = day
+        elif day < self.origin:
+            self.bits <<= (self.origin - day).days
+            self.origin = day
+        self.bits |= 1 << self._index(day)
+
+    def discard(self, day: date) -> None:
+        if day in self:
+            self.bits &= ~(1 << self._index(day))
+
+    def dates(self) -> Iterator[date]:
+        """Completed dates in ascending order."""
+        bits, index = self.bits, 0
+        while bits:
+            if bits & 1:
+                yield self.origin + timedelta(days=index)
+            bits >>= 1
+            index += 1
+
+    def _window(self, start: date, end: date) -> int:
+        """Bits for start..end inclusive, with start at bit 0."""
+        if self.origin is None or end < start:
+            return 0
+        length = (end - start).days + 1
+        offset = self._index(start)
+        if offset >= 0:
+            window = self.bits >> offset
+        else:
+            window = self.bits << -offset
+        return window & ((1 << length) - 1)
+
+    def count(self, start: date, end: date) -> int:
+        """Number of completed days in start..end inclusive."""
+        return self._window(start, end).bit_count()
+
+    def completion_rate(self, start: date, end: date) -> float:
+        """Fraction of days in start..end inclusive that were completed."""
+        days = (end - start).days + 1
+        return self.count(start, end) / days if days > 0 else 0.0
+
+    def last_n_days(self, n: int, today: date) -> List[bool]:
+        """Completion flags for the n days ending today, oldest first."""
+        start = today - timedelta(days=n - 1)
+        window = self._window(start, today)
+        return [bool(window >> i & 1) for i in range(n)]
+
+    def current_streak(self, today: date) -> int:
+        """Length of the run including today, or ending yesterday if today is open."""
+        end = today if today in self else today - timedelta(days=1)
+        if end not in self:
+            return 0
+        index = self._index(end)
+        mask = (1 << (index + 1)) - 1
+        gaps = ~self.bits & mask
+        # The highest unset bit at or below end marks where the run starts
+        return index + 1 if gaps == 0 else index - (gaps.bit_length() - 1)
+
+    def longest_streak(self) -> int:
+        """Length of the longest run of consecutive completed days."""
+        bits, length = self.bits, 0
+        while bits:
+            bits &= bits >> 1
+            length += 1
+        return length
+
+
+async def read_bitmap(db: AsyncSession, habit: Habit) -> CompletionBitmap:
+    """Return the habit's bitmap, building it from completion rows if missing without storing it."""
+    if habit.completion_bitmap is None:
+        dates = (await db.scalars(
+            select(HabitCompletion.completion_date).filter(HabitCompletion.habit_id == habit.id)
+        )).all()
+        return CompletionBitmap.from_dates(dates)
+    return CompletionBitmap.from_habit(habit)
+
+
+async def load_bitmap(db: AsyncSession, habit: Habit) -> CompletionBitmap:
+    """Return the habit's bitmap, building it from completion rows and storing it if missing."""
+    bitmap = await read_bitmap(db, habit)
+    if habit.completion_bitmap is None:
+        bitmap.store(habit)
+    return bitmap
+
+
+async def load_bitmaps(db: AsyncSession, habits: Iterable[Habit]) -> Dict[str, CompletionBitmap]:
+    """Return the habits' bitmaps by habit id, building missing ones from one completions query."""
+    habits = list(habits)
+    bitmaps = {habit.id: CompletionBitmap.from_habit(habit) for habit in habits if habit.completion_bitmap is not None}
+    missing = [habit for habit in habits if habit.completion_bitmap is None]
+    if missing:
+        dates: Dict[str, List[date]] = {habit.id: [] for habit in missing}
+        for habit_id, day in (await db.execute(
+            select(HabitCompletion.habit_id, HabitCompletion.completion_date).filter(
+                HabitCompletion.habit_id.in_(list(dates))
+            )
+        )).all():
+            dates[habit_id].append(day)
+        for habit in missing:
+            bitmap = CompletionBitmap.from_dates(dates[habit.id])
+            bitmap.store(habit)
+            bitmaps[habit.id] = bitmap
+    return bitmaps
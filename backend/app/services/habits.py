@@ -0,0 +1,59 @@
+from datetime import date
+from typing import List, Optional
+from sqlalchemy import select, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.habit import Habit, HabitCompletion
+from app.schemas.habit import HabitResponse
+from app.services.habit_bitmap import CompletionBitmap
+
+
+def build_habit_response(habit: Habit, is_completed_today: bool) -> HabitResponse:
+    """Build a habit response with its completion flag for today."""
+    current_streak = habit.current_streak
+    if habit.completion_bitmap is not None:
+        # The stored value dates from the last completion change; derive it for today
+        current_streak = CompletionBitmap.from_habit(habit).current_streak(date.today())
+    
+    return HabitResponse(
+        id=habit.id,
+        user_id=habit.user_id,
+        name=habit.name,
+        description=habit.description,
+        current_streak=current_streak,
+        longest_streak=habit.longest_streak,
+        is_active=habit.is_active,
+        created_at=habit.created_at,
+        updated_at=habit.updated_at,
+        is_completed_today=is_completed_today
+    )
+
+
+async def get_habits_with_today_status(
+    db: AsyncSession,
+    user_id: str,
+    habit_id: Optional[str] = None,
+    is_active: Optional[bool] = None,
+    habit_ids: Optional[List[str]] = None
+) -> List[HabitResponse]:
+    """Load a user's habits and today's completion flag in a single query."""
+    today = date.today()
+    query = select(Habit, HabitCompletion.id).outerjoin(
+        HabitCompletion,
+        and_(
+            HabitCompletion.habit_id == Habit.id,
+            HabitCompletion.completion_date == today
+        )
+    ).filter(Habit.user_id == user_id)
+    
+    if habit_id is not None:
+        query = query.filter(Habit.id == habit_id)
+    if habit_ids is not None:
+        query = query.filter(Habit.id.in_(habit_ids))
+    if is_active is not None:
+        query = query.filter(Habit.is_active == is_active)
+    
+    rows = (await db.execute(query.order_by(Habit.created_at.desc()))).all()
+    return [
+        build_habit_response(habit, completion_id is not None)
+        for habit, completion_id in rows
+    ]
@@ -0,0 +1,414 @@
+import codecs
+import csv
+import json
+import uuid
+import zlib
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from sqlalchemy import select, insert, and_, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.endpoints.sleep import calculate_duration
+from app.models.food import FoodEntry
+from app.models.sleep import SleepEntry
+from app.models.habit import Habit, HabitCompletion
+from app.models.sync import record_changes
+from app.schemas.food import FoodEntryCreate
+from app.schemas.sleep import SleepEntryCreate
+from app.schemas.habit import HabitHistoryImport
+from app.services.food_rollups import add_entries_to_rollups
+from app.services.food_summary import NUTRIENTS
+from app.services.habit_bitmap import load_bitmaps
+from app.services.streaks import apply_bitmap_streaks
+
+# Valid rows inserted per executemany and committed per transaction
+BATCH_SIZE = 1000
+# Row errors listed in the report; further failures are only counted
+MAX_REPORTED_ERRORS = 100
+# Same limit create_habit enforces; imported habits beyond it are created inactive
+MAX_ACTIVE_HABITS = 3
+
+# (fields, None) for a parsed row, (None, error) for one that could not be parsed
+ParsedRow = Tuple[Optional[Dict[str, Any]], Optional[str]]
+
+
+class ImportFormatError(ValueError):
+    """The upload cannot be decoded any further."""
+
+
+class ImportReport:
+    """Counts and per-row errors of one import."""
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.rows = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def fail(self, row: int, errors: List[str]) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "rows": self.rows,
+            "imported": self.imported,
+            "failed": self.failed,
+            "errors": sorted(self.errors, key=lambda error: error["row"]),
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+async def iter_lines(chunks: AsyncIterator[bytes], compressed: bool = False) -> AsyncIterator[List[str]]:
+    """Split a (optionally gzip-compressed) UTF-8 byte stream into lines.
+
+    Yields the complete lines of each chunk, newline included; a partial last
+    line is carried over to the next chunk.
+    """
+    # wbits=MAX_WBITS|32 accepts a gzip or zlib header
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 32) if compressed else None
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    try:
+        async for chunk in chunks:
+            if decompressor:
+                chunk = decompressor.decompress(chunk)
+            lines = (pending + decoder.decode(chunk)).split("\n")
+            pending = lines.pop()
+            if lines:
+                yield [line + "\n" for line in lines]
+        if decompressor and not decompressor.eof:
+            raise ImportFormatError("Compressed upload is truncated")
+        pending += decoder.decode(b"", final=True)
+    except zlib.error:
+        raise ImportFormatError("Upload is not valid gzip")
+    except UnicodeDecodeError:
+        raise ImportFormatError("Upload is not valid UTF-8")
+    if pending:
+        yield [pending]
+
+
+async def parse_ndjson(blocks: AsyncIterator[List[str]]) -> AsyncIterator[List[ParsedRow]]:
+    """Parse one JSON object per non-blank line."""
+    async for lines in blocks:
+        rows = []
+        for line in lines:
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                rows.append((None, "Invalid JSON"))
+                continue
+            if isinstance(data, dict):
+                rows.append((data, None))
+            else:
+                rows.append((None, "Expected a JSON object"))
+        yield rows
+
+
+def csv_fields(header: List[str], values: List[str]) -> Dict[str, Any]:
+    """Map CSV cells onto schema fields.
+
+    Empty cells are left out so schema defaults apply, JSON object cells
+    (as written by the CSV export) are decoded, and nutrient columns are
+    collected into nutritional_info.
+    """
+    data: Dict[str, Any] = {}
+    nutrients: Dict[str, Any] = {}
+    for name, value in zip(header, values):
+        if value == "":
+            continue
+        if name in NUTRIENTS:
+            try:
+                nutrients[name] = float(value)
+            except ValueError:
+                raise ValueError(f"{name}: Input should be a valid number")
+        elif value.startswith("{"):
+            try:
+                data[name] = json.loads(value)
+            except ValueError:
+                raise ValueError(f"{name}: Invalid JSON")
+        else:
+            data[name] = value
+    if nutrients:
+        data["nutritional_info"] = {**(data.get("nutritional_info") or {}), **nutrients}
+    return data
+
+
+async def parse_csv(blocks: AsyncIterator[List[str]]) -> AsyncIterator[List[ParsedRow]]:
+    """Parse CSV with a header row; quoted fields may span lines."""
+    header: Optional[List[str]] = None
+    record = ""
+    async for lines in blocks:
+        records = []
+        for line in lines:
+            record += line
+            # An odd number of quotes means a quoted field continues on the next line
+            if record.count('"') % 2:
+                continue
+            records.append(record)
+            record = ""
+
+        rows = []
+        for values in csv.reader(records):
+            if not values:
+                continue
+            if header is None:
+                header = [name.strip().lower() for name in values]
+                continue
+            if len(values) > len(header):
+                rows.append((None, f"Expected {len(header)} columns, got {len(values)}"))
+                continue
+            try:
+                rows.append((csv_fields(header, values), None))
+            except ValueError as exc:
+                rows.append((None, str(exc)))
+        yield rows
+    if record:
+        yield [(None, "Unterminated quoted field")]
+
+
+def error_messages(exc: ValidationError) -> List[str]:
+    return [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()]
+
+
+def validate_rows(
+    schema: Type[BaseModel],
+    adapter: TypeAdapter,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    report: ImportReport
+) -> List[Tuple[int, BaseModel]]:
+    """Validate a batch in one call, falling back to row by row when any row is invalid."""
+    try:
+        return list(zip([row for row, _ in rows], adapter.validate_python([data for _, data in rows])))
+    except ValidationError:
+        pass
+    valid = []
+    for row, data in rows:
+        try:
+            valid.append((row, schema.model_validate(data)))
+        except ValidationError as exc:
+            report.fail(row, error_messages(exc))
+    return valid
+
+
+async def insert_food_entries(
+    db: AsyncSession,
+    user_id: str,
+    items: List[Tuple[int, FoodEntryCreate]],
+    report: ImportReport
+) -> List[int]:
+    """Insert food entries and add them to the daily rollups."""
+    now = datetime.utcnow()
+    values = [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "food_name": entry.food_name,
+            "quantity": entry.quantity,
+            "calories": entry.calories,
+            "meal_category": entry.meal_category,
+            "nutritional_info": entry.nutritional_info,
+            "logged_at": entry.logged_at or now,
+            "created_at": now,
+            "updated_at": now
+        }
+        for _, entry in items
+    ]
+    await db.execute(insert(FoodEntry), values)
+    await add_entries_to_rollups(db, user_id, (
+        (value["logged_at"].date(), entry) for value, (_, entry) in zip(values, items)
+    ))
+    record_changes(db, user_id, FoodEntry.__tablename__, [value["id"] for value in values])
+    return [row for row, _ in items]
+
+
+async def insert_sleep_entries(
+    db: AsyncSession,
+    user_id: str,
+    items: List[Tuple[int, SleepEntryCreate]],
+    report: ImportReport
+) -> List[int]:
+    """Insert sleep entries, rejecting dates that already have one."""
+    existing = set((await db.scalars(select(SleepEntry.date).filter(
+        and_(
+            SleepEntry.user_id == user_id,
+            SleepEntry.date.in_({entry.wake_time.date() for _, entry in items})
+        )
+    ))).all())
+
+    now = datetime.utcnow()
+    values, rows = [], []
+    for row, entry in items:
+        sleep_date = entry.wake_time.date()
+        if sleep_date in existing:
+            report.fail(row, [f"Sleep entry already exists for {sleep_date}"])
+            continue
+        existing.add(sleep_date)
+        values.append({
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "bedtime": entry.bedtime,
+            "wake_time": entry.wake_time,
+            "duration_hours": calculate_duration(entry.bedtime, entry.wake_time),
+            "quality_rating": entry.quality_rating,
+            "notes": entry.notes,
+            "date": sleep_date,
+            "created_at": now,
+            "updated_at": now
+        })
+        rows.append(row)
+
+    if values:
+        await db.execute(insert(SleepEntry), values)
+        record_changes(db, user_id, SleepEntry.__tablename__, [value["id"] for value in values])
+    return rows
+
+
+async def insert_habit_history(
+    db: AsyncSession,
+    user_id: str,
+    items: List[Tuple[int, HabitHistoryImport]],
+    report: ImportReport
+) -> List[int]:
+    """Insert habit completions, creating habits by name, and refresh their bitmaps and streaks."""
+    names = list(dict.fromkeys(entry.name for _, entry in items))
+    habits: Dict[str, Habit] = {}
+    for habit in (await db.scalars(select(Habit).filter(
+        and_(
+            Habit.user_id == user_id,
+            Habit.name.in_(names)
+        )
+    ).order_by(Habit.created_at).with_for_update())).all():
+        habits.setdefault(habit.name, habit)
+
+    missing = [name for name in names if name not in habits]
+    if missing:
+        active_count = await db.scalar(select(func.count(Habit.id)).filter(
+            and_(
+                Habit.user_id == user_id,
+                Habit.is_active == True
+            )
+        ))
+        descriptions = {}
+        for _, entry in items:
+            descriptions.setdefault(entry.name, entry.description)
+        for name in missing:
+            habit = Habit(
+                user_id=user_id,
+                name=name,
+                description=descriptions[name],
+                is_active=active_count < MAX_ACTIVE_HABITS,
+                current_streak=0,
+                longest_streak=0
+            )
+            active_count += habit.is_active
+            db.add(habit)
+            habits[name] = habit
+        await db.flush()
+
+    bitmaps = await load_bitmaps(db, habits.values())
+    now = datetime.utcnow()
+    values, rows = [], []
+    for row, entry in items:
+        habit = habits[entry.name]
+        bitmap = bitmaps[habit.id]
+        if entry.completion_date in bitmap:
+            report.fail(row, [f"Habit already completed for {entry.completion_date}"])
+            continue
+        bitmap.add(entry.completion_date)
+        values.append({
+            "id": str(uuid.uuid4()),
+            "habit_id": habit.id,
+            "user_id": user_id,
+            "completion_date": entry.completion_date,
+            "created_at": now
+        })
+        rows.append(row)
+
+    if values:
+        await db.execute(insert(HabitCompletion), values)
+        record_changes(db, user_id, HabitCompletion.__tablename__, [value["id"] for value in values])
+    today = date.today()
+    for habit in habits.values():
+        apply_bitmap_streaks(habit, bitmaps[habit.id], today)
+    return rows
+
+
+Inserter = Callable[[AsyncSession, str, List[Tuple[int, Any]], ImportReport], Awaitable[List[int]]]
+
+# Import kind -> (row schema, batch inserter)
+IMPORTERS: Dict[str, Tuple[Type[BaseModel], Inserter]] = {
+    "food": (FoodEntryCreate, insert_food_entries),
+    "sleep": (SleepEntryCreate, insert_sleep_entries),
+    "habits": (HabitHistoryImport, insert_habit_history),
+}
+
+
+async def _import_batch(
+    db: AsyncSession,
+    user_id: str,
+    kind: str,
+    adapter: TypeAdapter,
+    rows: List[Tuple[int, Dict[str, Any]]],
+    report: ImportReport
+) -> None:
+    schema, inserter = IMPORTERS[kind]
+    items = validate_rows(schema, adapter, rows, report)
+    if not items:
+        return
+    inserted: List[int] = []
+    try:
+        inserted = await inserter(db, user_id, items, report)
+        await db.commit()
+    except IntegrityError:
+        # A concurrent request wrote a conflicting row; this batch is not imported
+        await db.rollback()
+        for row in inserted or [row for row, _ in items]:
+            report.fail(row, ["Conflicts with a concurrent change"])
+        return
+    report.imported += len(inserted)
+
+
+async def import_rows(
+    db: AsyncSession,
+    user_id: str,
+    kind: str,
+    chunks: AsyncIterator[bytes],
+    import_format: str = "ndjson",
+    compressed: bool = False
+) -> Dict[str, Any]:
+    """Stream-parse an upload and import it BATCH_SIZE rows per transaction.
+
+    Each batch is validated against the kind's schema, inserted with one
+    executemany, and committed together with its derived data (food rollups,
+    habit bitmaps and streaks, change log). Invalid rows are skipped and
+    reported; the upload is never held in memory as a whole.
+    """
+    adapter = TypeAdapter(List[IMPORTERS[kind][0]])
+    parse = parse_csv if import_format == "csv" else parse_ndjson
+    report = ImportReport(kind)
+    pending: List[Tuple[int, Dict[str, Any]]] = []
+
+    try:
+        async for rows in parse(iter_lines(chunks, compressed)):
+            for data, error in rows:
+                report.rows += 1
+                if error:
+                    report.fail(report.rows, [error])
+                else:
+                    pending.append((report.rows, data))
+            while len(pending) >= BATCH_SIZE:
+                await _import_batch(db, user_id, kind, adapter, pending[:BATCH_SIZE], report)
+                del pending[:BATCH_SIZE]
+    except ImportFormatError as exc:
+        report.fail(report.rows + 1, [f"{exc}; the rest of the upload was not read"])
+
+    if pending:
+        await _import_batch(db, user_id, kind, adapter, pending, report)
+    return report.as_dict()
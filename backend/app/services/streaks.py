@@ -0,0 +1,53 @@
+from datetime import date
+from typing import Iterable, Optional, Tuple
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.habit import Habit
+from app.services.habit_bitmap import CompletionBitmap, load_bitmap
+
+
+def compute_streaks(dates: Iterable[date], today: date) -> Tuple[int, int]:
+    """Compute (current, longest) streaks from completion dates in any order.
+
+    The current streak is the run that includes today or, if today is not
+    completed yet, the run that ends yesterday.
+    """
+    bitmap = CompletionBitmap.from_dates(dates)
+    return bitmap.current_streak(today), bitmap.longest_streak()
+
+
+def apply_bitmap_streaks(habit: Habit, bitmap: CompletionBitmap, today: date) -> None:
+    """Store the bitmap on the habit and refresh its streak columns from it."""
+    bitmap.store(habit)
+    habit.current_streak = bitmap.current_streak(today)
+    habit.longest_streak = bitmap.longest_streak()
+
+
+async def recompute_streak(db: AsyncSession, habit: Habit, today: Optional[date] = None) -> None:
+    """Rebuild a habit's bitmap and streaks from all of its completion rows."""
+    habit.completion_bitmap = None
+    bitmap = await load_bitmap(db, habit)
+    apply_bitmap_streaks(habit, bitmap, today or date.today())
+
+
+async def apply_completion_added(
+    db: AsyncSession,
+    habit: Habit,
+    completion_date: date,
+    today: Optional[date] = None
+) -> None:
+    """Update the bitmap and streaks after completion_date was added, anywhere in history."""
+    bitmap = await load_bitmap(db, habit)
+    bitmap.add(completion_date)
+    apply_bitmap_streaks(habit, bitmap, today or date.today())
+
+
+async def apply_completion_removed(
+    db: AsyncSession,
+    habit: Habit,
+    completion_date: date,
+    today: Optional[date] = None
+) -> None:
+    """Update the bitmap and streaks after completion_date was removed, anywhere in history."""
+    bitmap = await load_bitmap(db, habit)
+    bitmap.discard(completion_date)
+    apply_bitmap_streaks(habit, bitmap, today or date.today())
@@ -0,0 +1,83 @@
+"""Compare request throughput of sync vs async sessions inside async handlers.
+
+The sync case reproduces the old handler shape: an ``async def`` route that
+calls the blocking ``Session``, so every query stalls the event loop. The
+async case runs the same query through ``get_async_db``.
+
+Each request issues one query that takes ``--query-ms`` on the database side
+(``SLEEP()`` on MySQL, a registered ``sleep_ms()`` function on SQLite) to
+model network/disk round-trip latency.
+
+Usage:
+    python -m benchmarks.bench_async_db --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.utils import print_table, run_concurrent
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.db.base import engine, async_engine, get_db, get_async_db
+
+
+def _register_sqlite_sleep(dbapi_connection, connection_record):
+    dbapi_connection.create_function("sleep_ms", 1, lambda ms: time.sleep(ms / 1000) or 0)
+
+
+def _delay_statement(query_ms: int):
+    if engine.dialect.name == "mysql":
+        return text("SELECT SLEEP(:seconds)").bindparams(seconds=query_ms / 1000)
+    return text("SELECT sleep_ms(:ms)").bindparams(ms=query_ms)
+
+
+def build_app(query_ms: int) -> FastAPI:
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _register_sqlite_sleep)
+        event.listen(async_engine.sync_engine, "connect", _register_sqlite_sleep)
+
+    bench_app = FastAPI()
+
+    @bench_app.get("/sync")
+    async def sync_route(db: Session = Depends(get_db)):
+        db.execute(_delay_statement(query_ms))
+        return {"ok": True}
+
+    @bench_app.get("/async")
+    async def async_route(db: AsyncSession = Depends(get_async_db)):
+        await db.execute(_delay_statement(query_ms))
+        return {"ok": True}
+
+    return bench_app
+
+
+async def main(total: int, concurrency: int, query_ms: int):
+    bench_app = build_app(query_ms)
+    transport = httpx.ASGITransport(app=bench_app)
+    rows = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for case in ("sync", "async"):
+            # Warm up connections before measuring
+            await client.get(f"/{case}")
+            rows[f"{case} session"] = await run_concurrent(
+                lambda i, case=case: client.get(f"/{case}"), total, concurrency
+            )
+    print_table(
+        f"{total} requests, concurrency {concurrency}, {query_ms} ms per query "
+        f"({engine.dialect.name})",
+        rows
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--query-ms", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency, args.query_ms))
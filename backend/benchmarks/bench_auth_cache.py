@@ -0,0 +1,69 @@
+"""Measure per-request latency of an authenticated endpoint with and without
+the principal cache.
+
+The cold case clears the token and principal caches before every request,
+which reproduces the previous behaviour (JWT decode plus a users lookup on
+every call). The warm case lets the cache serve every request after the first.
+
+Usage:
+    python -m benchmarks.bench_auth_cache --requests 2000
+"""
+import argparse
+import asyncio
+import uuid
+
+from benchmarks.utils import print_table, run_concurrent
+
+import httpx
+
+from app.core.auth_cache import auth_cache_stats, principal_cache, token_cache
+from app.core.security import create_access_token, get_password_hash
+from app.db.base import Base, SessionLocal, engine
+from app.main import app
+from app.models.user import User
+
+
+def seed_user() -> str:
+    Base.metadata.create_all(bind=engine)
+    suffix = uuid.uuid4().hex[:12]
+    db = SessionLocal()
+    try:
+        user = User(
+            username=f"bench_{suffix}",
+            email=f"bench_{suffix}@example.com",
+            password_hash=get_password_hash("BenchPassword123")
+        )
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+async def main(total: int):
+    token = create_access_token(data={"sub": seed_user()})
+    headers = {"Authorization": f"Bearer {token}"}
+    transport = httpx.ASGITransport(app=app)
+    rows = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def cold(i):
+            token_cache.clear()
+            principal_cache.clear()
+            await client.get("/api/v1/auth/me", headers=headers)
+
+        async def warm(i):
+            await client.get("/api/v1/auth/me", headers=headers)
+
+        await warm(0)
+        rows["cache cleared each request"] = await run_concurrent(cold, total, 1)
+        await warm(0)
+        rows["warm principal cache"] = await run_concurrent(warm, total, 1)
+    print_table(f"GET /api/v1/auth/me, {total} sequential requests", rows)
+    print(f"\ncache stats after warm run: {auth_cache_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
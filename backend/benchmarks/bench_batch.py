@@ -0,0 +1,107 @@
+"""Compare loading the home screen with four sequential calls vs one /batch call.
+
+Seeds one user with habits, todos, food and sleep, then times the four
+dashboard reads (habits, todos, daily food summary, weekly sleep summary)
+made one after another and as a single POST /batch. `--rtt-ms` adds a
+simulated network round trip before every HTTP request, which is where a
+batch saves the most on mobile connections.
+
+Usage:
+    python -m benchmarks.bench_batch --iterations 200 --rtt-ms 0 50
+"""
+import argparse
+import asyncio
+import time
+from datetime import date, timedelta
+
+from benchmarks.utils import percentile
+
+import httpx
+
+from app.core.security import create_access_token
+from app.db.base import Base, SessionLocal, engine
+from app.main import app
+from app.models.user import User
+
+DASHBOARD = [
+    "/habits/?is_active=true",
+    "/todos/?is_completed=false",
+    "/food/daily-summary",
+    "/sleep/weekly-summary",
+]
+
+
+def create_user() -> str:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        suffix = str(time.time_ns())
+        user = User(username=f"bench_{suffix}", email=f"bench_{suffix}@example.com", password_hash="!")
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+async def seed(client: httpx.AsyncClient):
+    today = date.today()
+    for name in ("Read", "Walk", "Stretch"):
+        await client.post("/api/v1/habits/", json={"name": name})
+    for title in ("Plan", "Call", "Write"):
+        await client.post("/api/v1/todos/", json={"title": title, "priority": 1})
+    for i in range(12):
+        await client.post("/api/v1/food/entries", json={
+            "food_name": f"Food {i}", "quantity": 1, "calories": 100 + i, "meal_category": "lunch"
+        })
+    for i in range(7):
+        wake = today - timedelta(days=i)
+        await client.post("/api/v1/sleep/entries", json={
+            "bedtime": f"{wake - timedelta(days=1)}T23:00:00", "wake_time": f"{wake}T07:00:00"
+        })
+
+
+async def sequential(client: httpx.AsyncClient):
+    for path in DASHBOARD:
+        response = await client.get(f"/api/v1{path}")
+        assert response.status_code == 200
+
+
+async def batched(client: httpx.AsyncClient):
+    response = await client.post("/api/v1/batch", json={"requests": [{"path": path} for path in DASHBOARD]})
+    assert response.status_code == 200
+    assert all(item["status"] == 200 for item in response.json()["responses"])
+
+
+async def main(iterations: int, rtts):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': create_user()})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        await seed(client)
+
+    print(f"{'rtt_ms':>8}{'method':>12}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}")
+    for rtt in rtts:
+        async def delay(request):
+            if rtt:
+                await asyncio.sleep(rtt / 1000)
+
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench", headers=headers, event_hooks={"request": [delay]}
+        ) as client:
+            for name, load in (("sequential", sequential), ("batch", batched)):
+                await load(client)
+                timings = []
+                for _ in range(iterations):
+                    started = time.perf_counter()
+                    await load(client)
+                    timings.append(time.perf_counter() - started)
+                p50, p95, p99 = (percentile(timings, pct) * 1000 for pct in (50, 95, 99))
+                print(f"{rtt:>8}{name:>12}{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--rtt-ms", type=float, nargs="+", default=[0, 50])
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.rtt_ms))
@@ -0,0 +1,71 @@
+"""Measure an unchanged poll loop with and without If-None-Match: bytes sent and CPU spent.
+
+Seeds one user like bench_batch, then polls the list and summary endpoints
+`--polls` times each, once fetching full bodies and once revalidating with
+the ETag from the previous response (304 Not Modified while nothing
+changes). Reports response bytes, process CPU time and latency percentiles.
+
+Usage:
+    python -m benchmarks.bench_conditional_get --polls 300
+"""
+import argparse
+import asyncio
+import time
+from datetime import date
+
+from benchmarks.bench_batch import create_user, seed
+from benchmarks.utils import percentile
+
+import httpx
+
+from app.core.security import create_access_token
+from app.main import app
+
+POLLED = [
+    "/habits/",
+    "/todos/",
+    "/food/entries?limit=100",
+    "/food/daily-summary",
+    f"/food/range-summary?from={date.today().replace(day=1)}&to={date.today()}",
+    "/sleep/entries",
+    "/sleep/weekly-summary",
+]
+
+
+async def poll(client: httpx.AsyncClient, polls: int, revalidate: bool):
+    etags = {}
+    timings = []
+    sent = 0
+    cpu_started = time.process_time()
+    for _ in range(polls):
+        for path in POLLED:
+            headers = {"If-None-Match": etags[path]} if revalidate and path in etags else {}
+            started = time.perf_counter()
+            response = await client.get(f"/api/v1{path}", headers=headers)
+            timings.append(time.perf_counter() - started)
+            assert response.status_code in (200, 304)
+            etags[path] = response.headers["ETag"]
+            # Body plus status line and headers, roughly as they go on the wire
+            sent += len(response.content) + sum(len(k) + len(v) + 4 for k, v in response.headers.items()) + 17
+    return sent, time.process_time() - cpu_started, timings
+
+
+async def main(polls: int):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': create_user()})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        await seed(client)
+        await poll(client, 1, revalidate=False)
+
+        print(f"{'mode':<14}{'requests':>10}{'KiB':>10}{'cpu_s':>8}{'p50_ms':>10}{'p95_ms':>10}")
+        for name, revalidate in (("full body", False), ("If-None-Match", True)):
+            sent, cpu, timings = await poll(client, polls, revalidate)
+            p50, p95 = (percentile(timings, pct) * 1000 for pct in (50, 95))
+            print(f"{name:<14}{len(timings):>10}{sent / 1024:>10.1f}{cpu:>8.2f}{p50:>10.2f}{p95:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--polls", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(main(args.polls))
@@ -0,0 +1,68 @@
+"""Measure /dashboard latency: cold (sequential vs concurrent sections), cached, and vs /batch.
+
+Seeds one user like bench_batch, then times GET /dashboard with the
+response cache turned off, once with the four sections on one session and
+once with them running concurrently on separate sessions (the default only
+on server databases; try DATABASE_URL=mysql+pymysql://...). It then times
+warm cached reads, and the same four reads as a /batch call for comparison.
+
+Usage:
+    python -m benchmarks.bench_dashboard --iterations 300
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.utils import percentile
+from benchmarks.bench_batch import DASHBOARD, create_user, seed
+
+import httpx
+
+from app.core.config import settings
+from app.core.security import create_access_token
+from app.main import app
+from app.core.response_cache import response_cache
+
+
+async def timed(client: httpx.AsyncClient, iterations: int, method: str, url: str, **kwargs):
+    timings = []
+    for _ in range(iterations + 1):
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        timings.append(time.perf_counter() - started)
+        assert response.status_code == 200
+    # The first call warms connections and code paths
+    return timings[1:]
+
+
+async def main(iterations: int):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': create_user()})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        await seed(client)
+
+        cases = {}
+        # A TTL of 0 turns the response cache off, so every request loads the sections
+        ttl, response_cache.ttl = response_cache.ttl, 0
+        for concurrent in (False, True):
+            settings.DASHBOARD_CONCURRENT_QUERIES = concurrent
+            name = "cold, concurrent" if concurrent else "cold, one session"
+            cases[name] = await timed(client, iterations, "GET", "/api/v1/dashboard")
+        response_cache.ttl = ttl
+        cases["cached"] = await timed(client, iterations, "GET", "/api/v1/dashboard")
+        cases["batch (4 reads)"] = await timed(
+            client, iterations, "POST", "/api/v1/batch",
+            json={"requests": [{"path": path} for path in DASHBOARD]}
+        )
+
+    print(f"{'case':<20}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}")
+    for name, timings in cases.items():
+        p50, p95, p99 = (percentile(timings, pct) * 1000 for pct in (50, 95, 99))
+        print(f"{name:<20}{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=300)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations))
@@ -0,0 +1,122 @@
+"""Measure food search latency and index memory over a synthetic dataset.
+
+Generates `--foods` distinct names from a fixed vocabulary (plus the bundled
+foods.csv) into a temporary CSV, loads it with FoodSearchIndex.from_csv and
+reports load time, retained index memory (tracemalloc) and per-query
+latency for exact, prefix, multi-word and typo queries. A substring scan over the names is timed as the baseline.
+
+Usage:
+    python -m benchmarks.bench_food_search --foods 100000 --repeat 200
+"""
+import argparse
+import csv
+import gc
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.utils import percentile
+
+from app.services.food_search import DEFAULT_FOOD_DATABASE, FoodSearchIndex, NUTRIENT_COLUMNS
+
+PREPARATIONS = ["grilled", "baked", "fried", "roasted", "steamed", "raw", "smoked", "braised",
+                "sauteed", "boiled", "poached", "toasted", "frozen", "canned", "dried", "pickled"]
+BASES = ["chicken", "beef", "pork", "turkey", "salmon", "tuna", "shrimp", "tofu", "lentil",
+         "rice", "pasta", "bread", "potato", "broccoli", "spinach", "carrot", "mushroom", "cheese",
+         "yogurt", "oatmeal", "quinoa", "apple", "banana", "mango", "blueberry", "almond",
+         "peanut", "chickpea", "egg", "avocado", "tomato", "pepper", "onion", "corn", "bean"]
+FORMS = ["breast", "thigh", "salad", "soup", "sandwich", "wrap", "bowl", "burger", "stew",
+         "curry", "casserole", "pie", "muffin", "bar", "smoothie", "chips", "skewers", "tacos"]
+STYLES = ["homestyle", "organic", "light", "spicy", "classic", "lemon", "garlic", "honey",
+          "teriyaki", "barbecue", "mediterranean", "cajun", "thai", "italian", "mexican"]
+
+QUERIES = {
+    "exact": ["chicken", "salmon", "quinoa", "smoothie"],
+    "prefix": ["chi", "sal", "broc", "avoc"],
+    "multi-word": ["grilled chicken breast", "spicy tuna wrap", "honey almond bar"],
+    "typo": ["chiken", "brocoli", "avocaod", "smothie"],
+}
+
+
+def generate_rows(count: int, seed: int = 11):
+    with open(DEFAULT_FOOD_DATABASE, newline="", encoding="utf-8") as handle:
+        rows = list(csv.DictReader(handle))
+    rng = random.Random(seed)
+    seen = {row["name"].lower() for row in rows}
+    brand = 0
+    while len(rows) < count:
+        parts = [rng.choice(STYLES), rng.choice(PREPARATIONS), rng.choice(BASES), rng.choice(FORMS)]
+        name = " ".join(parts[rng.randint(0, 1):]).title()
+        if name.lower() in seen:
+            brand += 1
+            name = f"{name} Brand {brand}"
+        seen.add(name.lower())
+        row = {"name": name, "serving": "1 serving", "calories": str(rng.randint(20, 900))}
+        row.update({column: f"{rng.uniform(0, 40):.1f}" for column in NUTRIENT_COLUMNS})
+        rows.append(row)
+    return rows
+
+
+def time_queries(func, queries, repeat):
+    timings = []
+    for _ in range(repeat):
+        for query in queries:
+            started = time.perf_counter()
+            func(query)
+            timings.append(time.perf_counter() - started)
+    return timings
+
+
+def write_csv(rows) -> str:
+    handle, path = tempfile.mkstemp(suffix=".csv")
+    with os.fdopen(handle, "w", newline="", encoding="utf-8") as out:
+        writer = csv.DictWriter(out, fieldnames=["name", "serving", "calories", *NUTRIENT_COLUMNS])
+        writer.writeheader()
+        writer.writerows(rows)
+    return path
+
+
+def main(foods: int, repeat: int):
+    path = write_csv(generate_rows(foods))
+    try:
+        started = time.perf_counter()
+        FoodSearchIndex.from_csv(path)
+        build_seconds = time.perf_counter() - started
+        # Second load under tracemalloc, which slows allocation-heavy code
+        gc.collect()
+        tracemalloc.start()
+        index = FoodSearchIndex.from_csv(path)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        os.unlink(path)
+
+    print(f"foods: {len(index)}  distinct tokens: {len(index.tokens)}  trigrams: {len(index.grams)}")
+    print(f"load: {build_seconds:.2f} s  index memory: {retained / 2**20:.1f} MiB (peak {peak / 2**20:.1f} MiB)")
+    print()
+    print(f"{'query kind':>12}{'method':>10}{'p50_ms':>10}{'p99_ms':>10}{'hits':>10}")
+
+    lowered = [name.lower() for name in index.names]
+
+    def scan(query):
+        return [i for i, name in enumerate(lowered) if query in name][:20]
+
+    for kind, queries in QUERIES.items():
+        hits = sum(index.search(query)[0] for query in queries) // len(queries)
+        for method, func in (("index", index.search), ("scan", scan)):
+            if method == "scan" and kind != "exact":
+                continue
+            timings = time_queries(func, queries, repeat if method == "index" else max(1, repeat // 20))
+            p50, p99 = percentile(timings, 50) * 1000, percentile(timings, 99) * 1000
+            print(f"{kind:>12}{method:>10}{p50:>10.3f}{p99:>10.3f}{hits:>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--foods", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+    main(args.foods, args.repeat)
@@ -0,0 +1,112 @@
+"""Compare the food daily summary computed in Python, in SQL and read from the daily rollup.
+
+The Python case reproduces the old handler: load every FoodEntry for the
+day as ORM objects and sum calories, meals and nutritional_info in loops.
+The SQL case is summarize_food_entries (GROUP BY meal_category with JSON
+sums), the aggregation reconcile_food_rollups runs per user and day. The
+rollup case is what /food/daily-summary serves: one primary-key read of
+food_daily_rollups. Each size gets its own day of data.
+
+Usage:
+    python -m benchmarks.bench_food_summary --sizes 10 100 1000 --repeat 50
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+import uuid
+from datetime import date, datetime, timedelta
+
+from benchmarks.utils import percentile
+
+from sqlalchemy import and_, insert, select
+
+from app.db.base import AsyncSessionLocal, Base, SessionLocal, engine
+from app.models.food import FoodEntry, MealCategory
+from app.models.user import User
+from app.services.food_rollups import apply_contribution, entry_contribution, get_daily_rollup_summary, new_rollup
+from app.services.food_summary import summarize_entries, summarize_food_entries
+
+
+def seed(sizes):
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(7)
+    db = SessionLocal()
+    try:
+        suffix = uuid.uuid4().hex[:12]
+        user = User(username=f"bench_{suffix}", email=f"bench_{suffix}@example.com", password_hash="!")
+        db.add(user)
+        db.commit()
+        days = {}
+        for offset, size in enumerate(sizes):
+            day = date(2024, 1, 1) + timedelta(days=offset)
+            days[size] = day
+            rows = [
+                {
+                    "user_id": user.id,
+                    "food_name": f"food {i}",
+                    "quantity": 1.0,
+                    "calories": rng.randint(20, 900),
+                    "meal_category": rng.choice(list(MealCategory)),
+                    "nutritional_info": {n: round(rng.uniform(0, 40), 1) for n in ("carbs", "protein", "fat")},
+                    "logged_at": datetime.combine(day, datetime.min.time()) + timedelta(minutes=i % 1440),
+                }
+                for i in range(size)
+            ]
+            db.execute(insert(FoodEntry), rows)
+            rollup = new_rollup(user.id, day)
+            for row in rows:
+                apply_contribution(rollup, entry_contribution(FoodEntry(**row)), 1)
+            db.add(rollup)
+        db.commit()
+        return user.id, days
+    finally:
+        db.close()
+
+
+async def python_summary(db, user_id, start, end):
+    entries = (await db.scalars(select(FoodEntry).filter(and_(
+        FoodEntry.user_id == user_id, FoodEntry.logged_at >= start, FoodEntry.logged_at <= end
+    )))).all()
+    return summarize_entries(entries)
+
+
+async def rollup_summary(db, user_id, start, end):
+    return await get_daily_rollup_summary(db, user_id, start.date())
+
+
+async def measure(func, user_id, day, repeat):
+    start = datetime.combine(day, datetime.min.time())
+    end = datetime.combine(day, datetime.max.time())
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await func(db, user_id, start, end)
+            timings.append(time.perf_counter() - started)
+    async with AsyncSessionLocal() as db:
+        tracemalloc.start()
+        await func(db, user_id, start, end)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return percentile(timings, 50) * 1000, percentile(timings, 95) * 1000, peak / 1024
+
+
+async def main(sizes, repeat):
+    user_id, days = seed(sizes)
+    print(f"{'entries/day':>12}{'method':>10}{'p50_ms':>12}{'p95_ms':>12}{'peak_KiB':>12}")
+    for size in sizes:
+        for name, func in (
+            ("python", python_summary), ("sql", summarize_food_entries), ("rollup", rollup_summary)
+        ):
+            p50, p95, peak = await measure(func, user_id, days[size], repeat)
+            print(f"{size:>12}{name:>10}{p50:>12.3f}{p95:>12.3f}{peak:>12.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.sizes, args.repeat))
@@ -0,0 +1,131 @@
+"""Time bulk imports of generated food, sleep and habit history.
+
+Generates `--rows` food rows (plus a year of sleep and habit history per
+1000 food rows, capped) as NDJSON or CSV, streams them to POST /import in
+64 KiB chunks through the ASGI app, and reports rows per second. The
+per-row API (POST /food/entries) is timed on `--api-rows` rows as the
+baseline.
+
+Usage:
+    python -m benchmarks.bench_import --rows 100000 --format csv
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import benchmarks.utils  # noqa: F401  (sets the benchmark database defaults)
+
+import httpx
+
+from app.core.security import create_access_token
+from app.db.base import Base, SessionLocal, engine
+from app.main import app
+from app.models.food import MealCategory
+from app.models.user import User
+
+CHUNK_SIZE = 64 * 1024
+FOOD_COLUMNS = ["food_name", "quantity", "calories", "meal_category", "logged_at", "protein", "carbs"]
+
+
+def create_user() -> str:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        suffix = uuid.uuid4().hex[:12]
+        user = User(username=f"bench_{suffix}", email=f"bench_{suffix}@example.com", password_hash="!")
+        db.add(user)
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def food_rows(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    start = datetime(2015, 1, 1, 7)
+    meals = list(MealCategory)
+    for i in range(count):
+        yield {
+            "food_name": f"Food {rng.randint(1, 5000)}",
+            "quantity": 1,
+            "calories": rng.randint(20, 900),
+            "meal_category": meals[i % 4].value,
+            "logged_at": (start + timedelta(hours=6 * i)).isoformat(),
+            "protein": round(rng.uniform(0, 40), 1),
+            "carbs": round(rng.uniform(0, 80), 1),
+        }
+
+
+def sleep_rows(count: int):
+    start = datetime(2015, 1, 1, 23)
+    for i in range(count):
+        bedtime = start + timedelta(days=i)
+        yield {"bedtime": bedtime.isoformat(), "wake_time": (bedtime + timedelta(hours=8)).isoformat(), "quality_rating": 7}
+
+
+def habit_rows(count: int):
+    start = datetime(2015, 1, 1).date()
+    for i in range(count):
+        yield {"name": f"Habit {i % 5}", "completion_date": (start + timedelta(days=i // 5)).isoformat()}
+
+
+def encode(rows, export_format: str, columns=None) -> bytes:
+    if export_format == "ndjson":
+        return "".join(json.dumps(row) + "\n" for row in rows).encode()
+    lines = [",".join(columns)]
+    lines.extend(",".join(str(row[column]) for column in columns) for row in rows)
+    return ("\n".join(lines) + "\n").encode()
+
+
+async def upload(client, kind: str, body: bytes, export_format: str):
+    async def chunks():
+        for offset in range(0, len(body), CHUNK_SIZE):
+            yield body[offset:offset + CHUNK_SIZE]
+
+    started = time.perf_counter()
+    response = await client.post(f"/api/v1/import/{kind}", content=chunks(), params={"format": export_format})
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, response.text
+    return response.json(), elapsed
+
+
+async def main(rows: int, export_format: str, api_rows: int):
+    user_id = create_user()
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user_id})}"}
+    history = min(3650, max(1, rows // 1000) * 365)
+    uploads = [
+        ("food", encode(food_rows(rows), export_format, FOOD_COLUMNS), rows),
+        ("sleep", encode(sleep_rows(history), export_format, ["bedtime", "wake_time", "quality_rating"]), history),
+        ("habits", encode(habit_rows(history), export_format, ["name", "completion_date"]), history),
+    ]
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers, timeout=None) as client:
+        print(f"{'kind':<10}{'rows':>10}{'imported':>10}{'failed':>8}{'MiB':>8}{'seconds':>10}{'rows/s':>12}")
+        for kind, body, count in uploads:
+            report, elapsed = await upload(client, kind, body, export_format)
+            print(
+                f"{kind:<10}{count:>10}{report['imported']:>10}{report['failed']:>8}"
+                f"{len(body) / 2**20:>8.1f}{elapsed:>10.2f}{count / elapsed:>12.0f}"
+            )
+
+        started = time.perf_counter()
+        for row in food_rows(api_rows, seed=6):
+            row["nutritional_info"] = {"protein": row.pop("protein"), "carbs": row.pop("carbs")}
+            response = await client.post("/api/v1/food/entries", json=row)
+            assert response.status_code == 201
+        elapsed = time.perf_counter() - started
+        print(f"{'per-row API':<10}{api_rows:>10}{api_rows:>10}{0:>8}{'':>8}{elapsed:>10.2f}{api_rows / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="csv")
+    parser.add_argument("--api-rows", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.format, args.api_rows))
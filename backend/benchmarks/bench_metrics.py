@@ -0,0 +1,90 @@
+"""Measure the per-request overhead of MetricsMiddleware.
+
+First times the middleware in isolation, wrapped around an ASGI app that
+answers immediately, which gives its own cost per request. Then seeds one
+user like bench_batch and requests the dashboard reads (served from the
+response cache after the first call, so the middleware's share is as large
+as it gets) through the full app with the middleware installed and removed,
+switching every `--iterations` requests so drift affects both equally.
+At these latencies the end-to-end difference is mostly run-to-run noise;
+the isolated cost over the uninstrumented p50 is the figure to watch.
+
+Usage:
+    python -m benchmarks.bench_metrics --rounds 40 --iterations 25
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.bench_batch import DASHBOARD, create_user, seed
+from benchmarks.bench_dashboard import timed
+from benchmarks.utils import percentile
+
+import httpx
+
+from app.core.metrics import MetricsMiddleware
+from app.core.security import create_access_token
+from app.main import app
+
+CALLS = 200000
+
+
+async def answer(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+async def discard(message):
+    pass
+
+
+async def isolated_cost() -> float:
+    """Seconds MetricsMiddleware adds to one request."""
+    costs = {}
+    for name, handler in (("bare", answer), ("metrics", MetricsMiddleware(answer))):
+        started = time.perf_counter()
+        for _ in range(CALLS):
+            await handler({"type": "http", "method": "GET", "path": "/"}, None, discard)
+        costs[name] = (time.perf_counter() - started) / CALLS
+    return costs["metrics"] - costs["bare"]
+
+
+def set_metrics(enabled: bool) -> None:
+    """Install or remove the middleware; Starlette rebuilds the stack on the next request."""
+    app.middleware_stack = None
+    app.user_middleware = [m for m in app.user_middleware if m.cls is not MetricsMiddleware]
+    if enabled:
+        app.add_middleware(MetricsMiddleware)
+
+
+async def main(rounds: int, iterations: int):
+    cost = await isolated_cost()
+
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': create_user()})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        await seed(client)
+
+        timings = {True: [], False: []}
+        for i in range(rounds):
+            for enabled in ((False, True) if i % 2 else (True, False)):
+                set_metrics(enabled)
+                for path in DASHBOARD:
+                    timings[enabled] += await timed(client, iterations, "GET", f"/api/v1{path}")
+        set_metrics(True)
+
+    print(f"{'metrics':<10}{'requests':>10}{'p50_ms':>10}{'p95_ms':>10}")
+    for enabled in (False, True):
+        p50, p95 = (percentile(timings[enabled], pct) * 1000 for pct in (50, 95))
+        print(f"{'on' if enabled else 'off':<10}{len(timings[enabled]):>10}{p50:>10.3f}{p95:>10.3f}")
+    off, on = (percentile(timings[enabled], 50) for enabled in (False, True))
+    print(f"\nend-to-end p50 difference: {(on - off) * 1e6:.1f} us ({(on - off) / off:.2%})")
+    print(f"middleware cost in isolation: {cost * 1e6:.2f} us per request ({cost / off:.2%} of the p50)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=40)
+    parser.add_argument("--iterations", type=int, default=25)
+    args = parser.parse_args()
+    asyncio.run(main(args.rounds, args.iterations))
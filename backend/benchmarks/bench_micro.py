@@ -0,0 +1,242 @@
+"""Time hot helper functions at realistic sizes and check them against a stored baseline.
+
+Covers sleep duration, habit streak updates (bitmap update as on a new
+completion, and a full recompute from dates), the food daily summary (the
+Python aggregation over loaded entries, and the rollup update and read),
+access token creation and decoding, password hashing, and serializing
+FoodEntryResponse and HabitResponse lists the way cached responses are.
+
+Each case is timed like timeit, in `--repeat` runs of enough calls to
+last 0.1 s, each followed by a run of a fixed pure-Python calibration
+loop. Checks compare the median ratio of case to calibration time, so a
+baseline recorded on one machine still holds on a faster or slower one,
+and load that comes and goes during a run slows both sides alike.
+`--check` exits with status 1 when any case got more than `--threshold`
+slower than the baseline, to gate merges; after an intended change,
+re-record it with `--save-baseline`.
+
+Usage:
+    python -m benchmarks.bench_micro
+    python -m benchmarks.bench_micro --check --threshold 0.3
+    python -m benchmarks.bench_micro --filter serialize --save-baseline
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import timeit
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+import benchmarks.utils  # noqa: F401  (defaults DATABASE_URL to the benchmark database)
+from benchmarks.datagen import FOODS, HABITS
+
+from pydantic import TypeAdapter
+
+from app.api.v1.endpoints.sleep import calculate_duration
+from app.core.security import create_access_token, decode_token, get_password_hash
+from app.models.food import FoodEntry, MealCategory
+from app.models.habit import Habit
+from app.schemas.food import FoodEntryResponse
+from app.schemas.habit import HabitResponse
+from app.services.food_rollups import apply_contribution, entry_contribution, new_rollup, rollup_summary
+from app.services.food_summary import summarize_entries
+from app.services.habit_bitmap import CompletionBitmap
+from app.services.streaks import apply_bitmap_streaks, compute_streaks
+
+BASELINE = Path(__file__).parent / "baselines" / "micro.json"
+MIN_RUN_SECONDS = 0.1
+TODAY = date(2024, 6, 30)
+USER_ID = "00000000-0000-4000-8000-000000000000"
+
+
+def calibration() -> int:
+    # Fixed interpreter work (arithmetic, dict and list churn) the other cases are expressed in
+    counts: Dict[int, int] = {}
+    for i in range(2000):
+        counts[i % 97] = counts.get(i % 97, 0) + i * i
+    return len(sorted(counts.values()))
+
+
+def food_entries(n: int, rng: random.Random) -> List[FoodEntry]:
+    """Transient entries shaped like API ones, one day's worth per 5."""
+    entries = []
+    for i in range(n):
+        name, calories, carbs, protein, fat = rng.choice(FOODS)
+        logged_at = datetime.combine(TODAY, datetime.min.time()) + timedelta(minutes=rng.randint(0, 1439))
+        entries.append(FoodEntry(
+            id=f"{i:08d}-0000-4000-8000-000000000000",
+            user_id=USER_ID,
+            food_name=name,
+            quantity=1.0,
+            calories=calories,
+            meal_category=rng.choice(list(MealCategory)),
+            nutritional_info={"carbs": carbs, "protein": protein, "fat": fat},
+            logged_at=logged_at,
+            created_at=logged_at,
+            updated_at=logged_at,
+        ))
+    return entries
+
+
+def habit_with_history(days: int, rng: random.Random) -> Tuple[Habit, List[date]]:
+    dates = [TODAY - timedelta(days=i) for i in range(1, days + 1) if rng.random() < 0.7]
+    created_at = datetime.combine(TODAY - timedelta(days=days), datetime.min.time())
+    habit = Habit(id=USER_ID, user_id=USER_ID, name=rng.choice(HABITS), is_active=True,
+                  current_streak=0, longest_streak=0, created_at=created_at, updated_at=created_at)
+    apply_bitmap_streaks(habit, CompletionBitmap.from_dates(dates), TODAY)
+    return habit, dates
+
+
+def cases() -> Iterator[Tuple[str, Callable[[], Any]]]:
+    """(name, zero-argument call) for every case, with inputs built up front."""
+    rng = random.Random(1)
+
+    bedtime = datetime(2024, 6, 29, 23, 15)
+    yield "calculate_duration", lambda: calculate_duration(bedtime, bedtime + timedelta(hours=7, minutes=40))
+
+    for days in (30, 365, 1095):
+        habit, dates = habit_with_history(days, rng)
+
+        def complete_today(habit=habit):
+            bitmap = CompletionBitmap.from_habit(habit)
+            bitmap.add(TODAY)
+            apply_bitmap_streaks(habit, bitmap, TODAY)
+
+        yield f"habit_streak_update[days={days}]", complete_today
+        yield f"habit_streak_recompute[days={days}]", lambda dates=dates: compute_streaks(dates, TODAY)
+
+    for n in (5, 50, 500):
+        entries = food_entries(n, rng)
+        yield f"food_summary_entries[n={n}]", lambda entries=entries: summarize_entries(entries)
+
+    for n in (5, 50):
+        entries = food_entries(n, rng)
+
+        def rollup_day(entries=entries):
+            rollup = new_rollup(USER_ID, TODAY)
+            for entry in entries:
+                apply_contribution(rollup, entry_contribution(entry), 1)
+            return rollup_summary(rollup)
+
+        yield f"food_rollup_day[n={n}]", rollup_day
+
+    token = create_access_token(data={"sub": USER_ID})
+    yield "create_access_token", lambda: create_access_token(data={"sub": USER_ID})
+    yield "decode_token", lambda: decode_token(token)
+    yield "get_password_hash", lambda: get_password_hash("LoadTest123!")
+
+    # As the response cache serializes: validate from ORM attributes, dump straight to JSON bytes
+    for model, rows, sizes in (
+        (FoodEntryResponse, food_entries(100, rng), (20, 100)),
+        (HabitResponse, [habit_with_history(365, rng)[0] for _ in range(20)], (5, 20)),
+    ):
+        adapter = TypeAdapter(List[model])
+        for n in sizes:
+            def serialize(adapter=adapter, rows=rows[:n]):
+                return adapter.dump_json(adapter.validate_python(rows, from_attributes=True))
+
+            yield f"serialize_{model.__name__}[n={n}]", serialize
+
+
+def _calls_per_run(timer: timeit.Timer) -> int:
+    # autorange overshoots up to 0.2-0.5 s; scale back to MIN_RUN_SECONDS
+    number, elapsed = timer.autorange()
+    return max(1, round(number * MIN_RUN_SECONDS / elapsed)) if elapsed else number
+
+
+def measure(call: Callable[[], Any], repeat: int, reference_number: int) -> Tuple[float, float]:
+    """Seconds per call (fastest run) and its median ratio to the calibration loop.
+
+    Each of the `repeat` runs is followed by a calibration run, so load on
+    the machine that comes and goes during the session slows both alike.
+    """
+    timer, reference = timeit.Timer(call), timeit.Timer(calibration)
+    number = _calls_per_run(timer)
+    times, ratios = [], []
+    for _ in range(repeat):
+        seconds = timer.timeit(number) / number
+        times.append(seconds)
+        ratios.append(seconds / (reference.timeit(reference_number) / reference_number))
+    return min(times), statistics.median(ratios)
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run(name_filter: str, repeat: int) -> Dict[str, Any]:
+    reference_number = _calls_per_run(timeit.Timer(calibration))
+    calibration_s, _ = measure(calibration, repeat, reference_number)
+    results = {}
+    for name, call in cases():
+        if name_filter in name:
+            seconds, ratio = measure(call, repeat, reference_number)
+            results[name] = {"us": round(seconds * 1e6, 3), "ratio": round(ratio, 5)}
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "recorded_at": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": f"{platform.system()} {platform.machine()}",
+            "calibration_us": round(calibration_s * 1e6, 3),
+        },
+        "cases": results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Print every case against the baseline; return the names that regressed past the threshold."""
+    print(f"{'case':<40}{'us':>12}{'baseline_us':>14}{'change':>10}")
+    regressions = []
+    for name, result in report["cases"].items():
+        before = baseline["cases"].get(name)
+        if before is None:
+            print(f"{name:<40}{result['us']:>12}{'-':>14}{'new':>10}")
+            continue
+        change = result["ratio"] / before["ratio"] - 1
+        flag = ""
+        if change > threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        print(f"{name:<40}{result['us']:>12}{before['us']:>14}{change:>10.1%}{flag}")
+    return regressions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", default="", help="Only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--baseline", default=str(BASELINE))
+    parser.add_argument("--threshold", type=float, default=0.3, help="Allowed slowdown, as a fraction")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any case regressed past the threshold")
+    parser.add_argument("--save-baseline", action="store_true", help="Record these results as the baseline")
+    args = parser.parse_args()
+
+    report = run(args.filter, args.repeat)
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {"meta": {}, "cases": {}}
+    print(f"calibration {report['meta']['calibration_us']} us "
+          f"(baseline {baseline['meta'].get('calibration_us', '-')} us at {baseline['meta'].get('commit', '-')}); "
+          "changes are relative to calibration\n")
+    regressions = compare(report, baseline, args.threshold)
+
+    if args.save_baseline:
+        # Keep cases this run filtered out
+        report["cases"] = {**baseline["cases"], **report["cases"]}
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps(report, indent=2) + "\n")
+        print(f"\nbaseline written to {baseline_path}")
+    elif args.check and regressions:
+        print(f"\n{len(regressions)} case(s) slower than the baseline by more than {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        sys.exit(1)
@@ -0,0 +1,109 @@
+"""Compare OFFSET and keyset (cursor) pagination over a large food log.
+
+Seeds `--rows` food entries for one user, then times GET /food/entries
+pages at increasing depths: with `skip` (OFFSET) and by following
+X-Next-Cursor from the first page. Cursor pages are grouped by depth so
+the two methods can be compared page for page.
+
+Usage:
+    python -m benchmarks.bench_pagination --rows 100000 --limit 50
+"""
+import argparse
+import asyncio
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.utils import percentile
+
+import httpx
+from sqlalchemy import insert
+
+from app.core.pagination import CURSOR_HEADER
+from app.core.security import create_access_token
+from app.db.base import Base, SessionLocal, engine
+from app.main import app
+from app.models.food import FoodEntry, MealCategory
+from app.models.user import User
+
+
+def seed(rows: int) -> str:
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(3)
+    db = SessionLocal()
+    try:
+        suffix = uuid.uuid4().hex[:12]
+        user = User(username=f"bench_{suffix}", email=f"bench_{suffix}@example.com", password_hash="!")
+        db.add(user)
+        db.commit()
+        start = datetime(2020, 1, 1)
+        for offset in range(0, rows, 10000):
+            db.execute(insert(FoodEntry), [
+                {
+                    "id": str(uuid.uuid4()),
+                    "user_id": user.id,
+                    "food_name": "food",
+                    "quantity": 1.0,
+                    "calories": rng.randint(20, 900),
+                    "meal_category": rng.choice(list(MealCategory)),
+                    # Whole minutes, so many rows share a logged_at and the id tiebreak matters
+                    "logged_at": start + timedelta(minutes=(offset + i) // 3),
+                }
+                for i in range(min(10000, rows - offset))
+            ])
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+async def main(rows: int, limit: int, samples: int):
+    user_id = seed(rows)
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': user_id})}"}
+    pages = rows // limit
+    depths = sorted({0, pages // 10, pages // 4, pages // 2, pages - 1})
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        await client.get("/api/v1/food/entries", params={"limit": limit})
+
+        offset_ms = {}
+        for depth in depths:
+            timings = []
+            for _ in range(samples):
+                started = time.perf_counter()
+                response = await client.get("/api/v1/food/entries", params={"limit": limit, "skip": depth * limit})
+                timings.append(time.perf_counter() - started)
+                assert response.status_code == 200
+            offset_ms[depth] = percentile(timings, 50) * 1000
+
+        cursor_timings, cursor, page = {}, None, 0
+        walk_started = time.perf_counter()
+        while True:
+            params = {"limit": limit}
+            if cursor:
+                params["cursor"] = cursor
+            started = time.perf_counter()
+            response = await client.get("/api/v1/food/entries", params=params)
+            cursor_timings[page] = time.perf_counter() - started
+            cursor = response.headers.get(CURSOR_HEADER)
+            page += 1
+            if not cursor:
+                break
+        walk_seconds = time.perf_counter() - walk_started
+
+    print(f"{rows} rows, {limit} per page, {page} cursor pages walked in {walk_seconds:.1f} s")
+    print(f"{'page':>8}{'offset_p50_ms':>16}{'cursor_p50_ms':>16}")
+    for depth in depths:
+        window = [cursor_timings[p] for p in range(max(0, depth - 5), min(page, depth + 5))]
+        print(f"{depth:>8}{offset_ms[depth]:>16.3f}{percentile(window, 50) * 1000:>16.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--samples", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.limit, args.samples))
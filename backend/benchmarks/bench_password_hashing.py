@@ -0,0 +1,85 @@
+"""Measure latency of an unrelated endpoint during a login storm.
+
+Compares bcrypt verification run inline inside the async handler (the old
+behaviour) with verification offloaded to the bounded hashing executor.
+While `--logins` verifications run with `--concurrency` in flight, a probe
+requests a trivial endpoint every few milliseconds and records its latency.
+
+Usage:
+    python -m benchmarks.bench_password_hashing --logins 40 --concurrency 8
+"""
+import argparse
+import asyncio
+import time
+
+from benchmarks.utils import print_table, run_concurrent, summarize
+
+import httpx
+from fastapi import FastAPI
+
+from app.core.security import (
+    get_password_hash, verify_password, verify_password_async,
+    shutdown_password_executor
+)
+
+PASSWORD = "BenchPassword123"
+
+
+def build_app() -> FastAPI:
+    hashed = get_password_hash(PASSWORD)
+    bench_app = FastAPI()
+
+    @bench_app.post("/login-inline")
+    async def login_inline():
+        return {"ok": verify_password(PASSWORD, hashed)}
+
+    @bench_app.post("/login-pooled")
+    async def login_pooled():
+        return {"ok": await verify_password_async(PASSWORD, hashed)}
+
+    @bench_app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    return bench_app
+
+
+async def storm(client: httpx.AsyncClient, route: str, logins: int, concurrency: int):
+    probe_latencies = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            started = time.perf_counter()
+            await client.get("/ping")
+            probe_latencies.append(time.perf_counter() - started)
+            await asyncio.sleep(0.005)
+
+    probe_task = asyncio.create_task(probe())
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    login_stats = await run_concurrent(lambda i: client.post(route), logins, concurrency)
+    elapsed = time.perf_counter() - started
+    done.set()
+    await probe_task
+    return login_stats, summarize(probe_latencies, elapsed)
+
+
+async def main(logins: int, concurrency: int):
+    transport = httpx.ASGITransport(app=build_app())
+    login_rows, probe_rows = {}, {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, route in (("inline bcrypt", "/login-inline"), ("hashing executor", "/login-pooled")):
+            await client.post(route)
+            login_rows[name], probe_rows[name] = await storm(client, route, logins, concurrency)
+    shutdown_password_executor()
+    print_table(f"Logins ({logins} total, concurrency {concurrency})", login_rows)
+    print_table("GET /ping latency during the login storm", probe_rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(main(args.logins, args.concurrency))
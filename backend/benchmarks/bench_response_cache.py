@@ -0,0 +1,60 @@
+"""Measure the response cache on the four read-heavy endpoints: uncached vs cached, and a read/write mix.
+
+Seeds one user like bench_batch, then times each of the habits, todos,
+daily food summary and weekly sleep summary reads with the cache disabled
+and with a warm cache. Finally it replays a mix of
+`--writes-per-100` food writes per 100 reads and prints the hit ratios.
+Uses the configured backend (RESPONSE_CACHE_BACKEND / REDIS_URL).
+
+Usage:
+    python -m benchmarks.bench_response_cache --iterations 300
+"""
+import argparse
+import asyncio
+import random
+
+from benchmarks.bench_batch import DASHBOARD, create_user, seed
+from benchmarks.bench_dashboard import timed
+from benchmarks.utils import percentile
+
+import httpx
+
+from app.core.response_cache import response_cache
+from app.core.security import create_access_token
+from app.main import app
+
+
+async def main(iterations: int, writes_per_100: int):
+    headers = {"Authorization": f"Bearer {create_access_token(data={'sub': create_user()})}"}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+        await seed(client)
+
+        ttl = response_cache.ttl
+        print(f"backend: {response_cache.backend.name}")
+        print(f"{'path':<26}{'case':>10}{'p50_ms':>10}{'p95_ms':>10}{'p99_ms':>10}")
+        for path in DASHBOARD:
+            for name, case_ttl in (("uncached", 0), ("cached", ttl)):
+                # A TTL of 0 disables the cache
+                response_cache.ttl = case_ttl
+                timings = await timed(client, iterations, "GET", f"/api/v1{path}")
+                p50, p95, p99 = (percentile(timings, pct) * 1000 for pct in (50, 95, 99))
+                print(f"{path:<26}{name:>10}{p50:>10.2f}{p95:>10.2f}{p99:>10.2f}")
+
+        await response_cache.clear()
+        rng = random.Random(7)
+        for _ in range(iterations * len(DASHBOARD)):
+            if rng.randrange(100) < writes_per_100:
+                await client.post("/api/v1/food/entries", json={
+                    "food_name": "Snack", "quantity": 1, "calories": 100, "meal_category": "snack"
+                })
+            await client.get(f"/api/v1{rng.choice(DASHBOARD)}")
+        print(f"\nhit ratios with {writes_per_100} food writes per 100 reads: {response_cache.stats()['domains']}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=300)
+    parser.add_argument("--writes-per-100", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.iterations, args.writes_per_100))
@@ -0,0 +1,213 @@
+"""Seed N users x M days of food, sleep, habit completions and todos, deterministically.
+
+Rows are built through the ORM models with the helpers the API uses for
+derived state (food rollups, completion bitmaps and streaks), and the
+change-log listeners run as for any other write, so seeded accounts look
+like real ones to every endpoint. Each user draws from its own generator
+keyed by the seed and its index, so the same seed, sizes and end date give
+the same rows and ids, and adding users leaves existing ones unchanged.
+Users that already exist are skipped, so seeding is idempotent.
+
+Usage:
+    python -m benchmarks.datagen --users 50 --days 90 --seed 1
+"""
+import argparse
+import random
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from typing import List, NamedTuple, Optional
+
+import benchmarks.utils  # noqa: F401  (defaults DATABASE_URL to the benchmark database)
+
+from sqlalchemy import select
+
+from app.api.v1.endpoints.sleep import calculate_duration
+from app.core.security import get_password_hash
+from app.db.base import Base, SessionLocal, engine
+from app.models.food import FoodEntry, MealCategory
+from app.models.habit import Habit, HabitCompletion
+from app.models.sleep import SleepEntry
+from app.models.todo import Todo
+from app.models.user import User
+from app.services.food_rollups import apply_contribution, entry_contribution, new_rollup
+from app.services.habit_bitmap import CompletionBitmap
+from app.services.streaks import apply_bitmap_streaks
+
+PASSWORD = "LoadTest123!"
+
+# name, calories, carbs, protein, fat per serving
+FOODS = [
+    ("Oatmeal", 150, 27, 5, 3), ("Greek yogurt", 100, 6, 17, 0.7), ("Banana", 105, 27, 1.3, 0.4),
+    ("Scrambled eggs", 200, 2, 14, 15), ("Chicken salad", 350, 12, 32, 18), ("Rice bowl", 480, 80, 12, 9),
+    ("Lentil soup", 230, 40, 18, 1), ("Salmon", 410, 0, 40, 27), ("Pasta", 520, 90, 18, 8),
+    ("Apple", 95, 25, 0.5, 0.3), ("Almonds", 160, 6, 6, 14), ("Pizza slice", 285, 36, 12, 10),
+]
+MEAL_HOURS = {MealCategory.BREAKFAST: 8, MealCategory.LUNCH: 13, MealCategory.DINNER: 19, MealCategory.SNACK: 16}
+HABITS = ["Read", "Walk", "Stretch", "Meditate", "Drink water", "Journal", "No sugar"]
+TODOS = ["Plan week", "Call mom", "Pay rent", "Groceries", "Email report", "Gym", "Fix bike", "Book dentist"]
+# The API allows 3 active todos; leave room to create one
+ACTIVE_TODOS = 2
+
+
+class SeededUser(NamedTuple):
+    id: str
+    email: str
+
+
+def user_email(seed: int, index: int) -> str:
+    return f"load{seed}_{index}@example.com"
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def _food(rng: random.Random, user_id: str, day: date) -> List[FoodEntry]:
+    meals = [MealCategory.BREAKFAST, MealCategory.LUNCH, MealCategory.DINNER]
+    meals += [MealCategory.SNACK] * rng.randint(0, 2)
+    entries = []
+    for meal in meals:
+        if rng.random() < 0.1:
+            continue
+        name, calories, carbs, protein, fat = rng.choice(FOODS)
+        quantity = rng.choice([0.5, 1, 1, 1, 1.5, 2])
+        logged_at = datetime.combine(day, datetime.min.time()) + timedelta(
+            hours=MEAL_HOURS[meal], minutes=rng.randint(0, 59)
+        )
+        entries.append(FoodEntry(
+            id=_uuid(rng),
+            user_id=user_id,
+            food_name=name,
+            quantity=quantity,
+            calories=round(calories * quantity),
+            meal_category=meal,
+            nutritional_info={
+                "carbs": round(carbs * quantity, 1),
+                "protein": round(protein * quantity, 1),
+                "fat": round(fat * quantity, 1),
+            },
+            logged_at=logged_at,
+            created_at=logged_at,
+            updated_at=logged_at,
+        ))
+    return entries
+
+
+def _sleep(rng: random.Random, user_id: str, day: date) -> SleepEntry:
+    bedtime = datetime.combine(day - timedelta(days=1), datetime.min.time()) + timedelta(
+        hours=22, minutes=rng.randint(0, 180)
+    )
+    wake_time = bedtime + timedelta(minutes=rng.randint(330, 570))
+    return SleepEntry(
+        id=_uuid(rng),
+        user_id=user_id,
+        bedtime=bedtime,
+        wake_time=wake_time,
+        duration_hours=calculate_duration(bedtime, wake_time),
+        quality_rating=rng.randint(3, 10),
+        date=wake_time.date(),
+        created_at=wake_time,
+        updated_at=wake_time,
+    )
+
+
+def _habits(rng: random.Random, user_id: str, start: date, end: date, days: int) -> list:
+    rows = []
+    for name in rng.sample(HABITS, rng.randint(3, 5)):
+        created_at = datetime.combine(start, datetime.min.time())
+        habit = Habit(id=_uuid(rng), user_id=user_id, name=name, is_active=True,
+                      created_at=created_at, updated_at=created_at)
+        rate = rng.uniform(0.4, 0.9)
+        dates = [start + timedelta(days=i) for i in range(days) if rng.random() < rate]
+        apply_bitmap_streaks(habit, CompletionBitmap.from_dates(dates), end)
+        rows.append(habit)
+        rows.extend(
+            HabitCompletion(id=_uuid(rng), habit_id=habit.id, user_id=user_id, completion_date=day,
+                            created_at=datetime.combine(day, datetime.min.time()) + timedelta(hours=21))
+            for day in dates
+        )
+    return rows
+
+
+def _todos(rng: random.Random, user_id: str, day: date, end: date) -> List[Todo]:
+    todos = []
+    for _ in range(rng.choice([0, 0, 1, 1, 2])):
+        created_at = datetime.combine(day, datetime.min.time()) + timedelta(hours=rng.randint(7, 22))
+        todo = Todo(
+            id=_uuid(rng),
+            user_id=user_id,
+            title=rng.choice(TODOS),
+            priority=rng.randint(1, 3),
+            due_date=created_at + timedelta(days=rng.randint(0, 7)),
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        done_at = created_at + timedelta(hours=rng.randint(1, 96))
+        if rng.random() < 0.7 and done_at.date() <= end:
+            todo.is_completed = True
+            todo.completed_at = done_at
+        todos.append(todo)
+    return todos
+
+
+def seed_user(db, rng: random.Random, user_id: str, days: int, end: date) -> None:
+    """Add one user's history for the `days` days ending on `end` to the session."""
+    start = end - timedelta(days=days - 1)
+    db.add_all(_habits(rng, user_id, start, end, days))
+    todos = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        entries = _food(rng, user_id, day)
+        if entries:
+            rollup = new_rollup(user_id, day)
+            for entry in entries:
+                apply_contribution(rollup, entry_contribution(entry), 1)
+            db.add_all(entries)
+            db.add(rollup)
+        if rng.random() < 0.9:
+            db.add(_sleep(rng, user_id, day))
+        todos.extend(_todos(rng, user_id, day, end))
+    active = [todo for todo in todos if not todo.is_completed]
+    for todo in active[:-ACTIVE_TODOS]:
+        todo.is_completed = True
+        todo.completed_at = min(todo.due_date, datetime.combine(end, datetime.max.time()))
+    db.add_all(todos)
+
+
+def generate(users: int, days: int, seed: int = 1, end: Optional[date] = None) -> List[SeededUser]:
+    """Seed `users` accounts with `days` days of history each; return them in index order."""
+    Base.metadata.create_all(bind=engine)
+    end = end or date.today()
+    password_hash = None
+    seeded = []
+    db = SessionLocal()
+    try:
+        for index in range(users):
+            email = user_email(seed, index)
+            existing = db.scalar(select(User.id).filter(User.email == email))
+            if existing is not None:
+                seeded.append(SeededUser(existing, email))
+                continue
+            if password_hash is None:
+                password_hash = get_password_hash(PASSWORD)
+            rng = random.Random(f"{seed}:{index}")
+            user = User(id=_uuid(rng), username=f"load{seed}_{index}", email=email, password_hash=password_hash)
+            db.add(user)
+            seed_user(db, rng, user.id, days, end)
+            db.commit()
+            seeded.append(SeededUser(user.id, email))
+    finally:
+        db.close()
+    return seeded
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    started = time.perf_counter()
+    generate(args.users, args.days, args.seed)
+    print(f"seeded {args.users} users x {args.days} days in {time.perf_counter() - started:.1f} s")
@@ -0,0 +1,245 @@
+"""Drive the app with concurrent clients through realistic scenarios and report per endpoint.
+
+Seeds `--users` accounts x `--days` days with benchmarks.datagen, then runs
+each scenario with one httpx client per virtual user, at most
+`--concurrency` users at a time, against the app in-process or a running
+server (`--base-url`, sharing this DATABASE_URL and SECRET_KEY). The
+database is whatever DATABASE_URL points at: SQLite by default, or a local
+MySQL (mysql+pymysql://...) for real pooling and row locks. Scenarios:
+
+    login-storm        every user logs in at once (bcrypt pool, 503 shedding)
+    dashboard-polling  users poll the home screen reads, revalidating ETags
+    logging-burst      users log meals, habit completions, todos and sleep edits
+    history-paging     users page food and sleep history by cursor and read
+                       range summaries and habit calendars
+
+For each scenario and endpoint (method and route template) the report gives
+requests, errors, throughput and p50/p95/p99 latency. It is printed and
+written as JSON to `--output` (default benchmarks/results/<commit>-<time>.json);
+pass an earlier report as `--compare` to print p95 changes against it.
+
+Usage:
+    python -m benchmarks.load_test --users 50 --days 90 --concurrency 20 --rounds 20
+    python -m benchmarks.load_test --scenarios dashboard-polling --compare benchmarks/results/abc1234-....json
+"""
+import argparse
+import asyncio
+import json
+import platform
+import subprocess
+import time
+from collections import Counter, defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from benchmarks.datagen import PASSWORD, SeededUser, generate
+from benchmarks.utils import summarize
+
+import httpx
+
+from app.core.config import settings
+from app.core.pagination import CURSOR_HEADER
+from app.core.security import create_access_token
+from app.db.base import Base, engine
+from app.main import app
+
+RESULTS_DIR = Path(__file__).parent / "results"
+MAX_PAGES = 20
+
+
+class Recorder:
+    """Latencies and unexpected statuses per endpoint for one scenario."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Counter = Counter()
+
+    async def request(self, client: httpx.AsyncClient, endpoint: str, url: str,
+                      ok=(200,), **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await client.request(endpoint.split(" ", 1)[0], f"/api/v1{url}", **kwargs)
+        self.latencies[endpoint].append(time.perf_counter() - started)
+        if response.status_code not in ok:
+            self.errors[endpoint] += 1
+        return response
+
+    def report(self, elapsed: float) -> Dict[str, Dict[str, Any]]:
+        return {
+            endpoint: {**summarize(latencies, elapsed), "errors": self.errors[endpoint]}
+            for endpoint, latencies in sorted(self.latencies.items())
+        }
+
+
+async def login_storm(client: httpx.AsyncClient, user: SeededUser, recorder: Recorder, rounds: int):
+    # One login per user: the storm is everyone at once, not one user repeating
+    await recorder.request(client, "POST /auth/login", "/auth/login",
+                           json={"email": user.email, "password": PASSWORD})
+
+
+async def dashboard_polling(client: httpx.AsyncClient, user: SeededUser, recorder: Recorder, rounds: int):
+    etags: Dict[str, str] = {}
+    for _ in range(rounds):
+        await recorder.request(client, "GET /dashboard", "/dashboard")
+        for endpoint, url in (
+            ("GET /habits/", "/habits/?is_active=true"),
+            ("GET /food/daily-summary", "/food/daily-summary"),
+            ("GET /sleep/weekly-summary", "/sleep/weekly-summary"),
+        ):
+            headers = {"If-None-Match": etags[url]} if url in etags else {}
+            response = await recorder.request(client, endpoint, url, ok=(200, 304), headers=headers)
+            if "ETag" in response.headers:
+                etags[url] = response.headers["ETag"]
+
+
+async def logging_burst(client: httpx.AsyncClient, user: SeededUser, recorder: Recorder, rounds: int):
+    habits = (await recorder.request(client, "GET /habits/", "/habits/")).json()
+    sleep = (await recorder.request(client, "GET /sleep/entries", "/sleep/entries?limit=1")).json()
+    for i in range(rounds):
+        await recorder.request(client, "POST /food/entries", "/food/entries", ok=(201,), json={
+            "food_name": "Apple", "quantity": 1, "calories": 95, "meal_category": "snack",
+            "nutritional_info": {"carbs": 25, "protein": 0.5, "fat": 0.3}
+        })
+        if habits:
+            habit_id = habits[i % len(habits)]["id"]
+            await recorder.request(client, "DELETE /habits/{habit_id}/complete", f"/habits/{habit_id}/complete",
+                                   ok=(204, 404))
+            await recorder.request(client, "POST /habits/{habit_id}/complete", f"/habits/{habit_id}/complete")
+        todo = await recorder.request(client, "POST /todos/", "/todos/", ok=(201,),
+                                      json={"title": f"Burst {i}", "priority": 2})
+        if todo.status_code == 201:
+            await recorder.request(client, "POST /todos/{todo_id}/complete", f"/todos/{todo.json()['id']}/complete")
+        if sleep:
+            await recorder.request(client, "PUT /sleep/entries/{entry_id}", f"/sleep/entries/{sleep[0]['id']}",
+                                   json={"quality_rating": i % 10 + 1})
+
+
+async def history_paging(client: httpx.AsyncClient, user: SeededUser, recorder: Recorder, rounds: int):
+    today = date.today()
+    for _ in range(max(rounds // 5, 1)):
+        for endpoint, url in (("GET /food/entries", "/food/entries"), ("GET /sleep/entries", "/sleep/entries")):
+            cursor = None
+            for _ in range(MAX_PAGES):
+                params = {"limit": 50, **({"cursor": cursor} if cursor else {})}
+                response = await recorder.request(client, endpoint, url, params=params)
+                cursor = response.headers.get(CURSOR_HEADER)
+                if not cursor:
+                    break
+        await recorder.request(client, "GET /food/range-summary", "/food/range-summary",
+                               params={"from": str(today - timedelta(days=90)), "to": str(today)})
+        habits = (await recorder.request(client, "GET /habits/", "/habits/")).json()
+        for habit in habits[:2]:
+            await recorder.request(client, "GET /habits/{habit_id}/calendar", f"/habits/{habit['id']}/calendar")
+
+
+SCENARIOS = {
+    "login-storm": login_storm,
+    "dashboard-polling": dashboard_polling,
+    "logging-burst": logging_burst,
+    "history-paging": history_paging,
+}
+
+
+async def run_scenario(name: str, users: List[SeededUser], concurrency: int, rounds: int,
+                       base_url: Optional[str]) -> Dict[str, Any]:
+    recorder = Recorder()
+    scenario = SCENARIOS[name]
+    transport = None if base_url else httpx.ASGITransport(app=app)
+    pending = iter(users)
+
+    async def virtual_user():
+        for user in pending:
+            headers = {} if name == "login-storm" else {
+                "Authorization": f"Bearer {create_access_token(data={'sub': user.id})}"
+            }
+            async with httpx.AsyncClient(
+                transport=transport, base_url=base_url or "http://load", headers=headers, timeout=60
+            ) as client:
+                await scenario(client, user, recorder, rounds)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(virtual_user() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    return {"elapsed_s": round(elapsed, 3), "endpoints": recorder.report(elapsed)}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    columns = ["requests", "errors", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+    for name, scenario in report["scenarios"].items():
+        print(f"\n{name} ({scenario['elapsed_s']} s)")
+        print(f"{'endpoint':<38}" + "".join(f"{c:>15}" for c in columns))
+        for endpoint, row in scenario["endpoints"].items():
+            print(f"{endpoint:<38}" + "".join(f"{row[c]:>15}" for c in columns))
+
+
+def print_comparison(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    print(f"\np95 against {baseline['meta']['commit']} ({baseline['meta']['started_at']})")
+    print(f"{'scenario':<20}{'endpoint':<38}{'before_ms':>12}{'after_ms':>12}{'change':>10}")
+    for name, scenario in report["scenarios"].items():
+        before = baseline["scenarios"].get(name, {}).get("endpoints", {})
+        for endpoint, row in scenario["endpoints"].items():
+            if endpoint in before and before[endpoint]["p95_ms"]:
+                old, new = before[endpoint]["p95_ms"], row["p95_ms"]
+                print(f"{name:<20}{endpoint:<38}{old:>12}{new:>12}{(new - old) / old:>10.1%}")
+
+
+async def main(args):
+    if args.fresh:
+        Base.metadata.drop_all(bind=engine)
+    started = time.perf_counter()
+    users = generate(args.users, args.days, args.seed)
+    print(f"seeded {len(users)} users x {args.days} days in {time.perf_counter() - started:.1f} s")
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "database": engine.dialect.name,
+            "target": args.base_url or "in-process",
+            "python": platform.python_version(),
+            "users": args.users,
+            "days": args.days,
+            "seed": args.seed,
+            "concurrency": args.concurrency,
+            "rounds": args.rounds,
+            "password_hash_workers": settings.PASSWORD_HASH_WORKERS,
+        },
+        "scenarios": {},
+    }
+    for name in args.scenarios:
+        report["scenarios"][name] = await run_scenario(name, users, args.concurrency, args.rounds, args.base_url)
+    print_report(report)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{report['meta']['commit']}-{datetime.now():%Y%m%dT%H%M%S}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    print(f"\nreport written to {output}")
+    if args.compare:
+        print_comparison(report, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=20, help="Iterations per virtual user")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--base-url", help="Load a running server instead of the app in-process")
+    parser.add_argument("--fresh", action="store_true", help="Drop and recreate all tables before seeding")
+    parser.add_argument("--output", help="Report path (default benchmarks/results/<commit>-<time>.json)")
+    parser.add_argument("--compare", help="Earlier report to compare p95 latencies with")
+    args = parser.parse_args()
+    asyncio.run(main(args))
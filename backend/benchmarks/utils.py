@@ -0,0 +1,60 @@
+"""Shared helpers for the benchmark scripts."""
+import asyncio
+import os
+import time
+from typing import Awaitable, Callable, Dict, List
+
+# Benchmarks default to a throwaway SQLite database unless DATABASE_URL is set
+os.environ.setdefault("DATABASE_URL", "sqlite:///./bench.db")
+os.environ.setdefault("DEBUG", "False")
+# In-process runs are a single worker, where the memory response cache is safe
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "memory")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Return the pct-th percentile (0-100) of samples using nearest rank."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """Summarize latencies (seconds) into throughput and millisecond percentiles."""
+    return {
+        "requests": len(latencies),
+        "throughput_rps": round(len(latencies) / elapsed, 1) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 3),
+    }
+
+
+async def run_concurrent(
+    call: Callable[[int], Awaitable[object]],
+    total: int,
+    concurrency: int
+) -> Dict[str, float]:
+    """Run `call(i)` for i in range(total) with at most `concurrency` in flight."""
+    latencies: List[float] = []
+    counter = iter(range(total))
+
+    async def worker():
+        for i in counter:
+            started = time.perf_counter()
+            await call(i)
+            latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, time.perf_counter() - started)
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    """Print benchmark rows as an aligned table."""
+    print(f"\n{title}")
+    columns = ["requests", "throughput_rps", "p50_ms", "p95_ms", "p99_ms"]
+    print(f"{'case':<28}" + "".join(f"{c:>16}" for c in columns))
+    for name, row in rows.items():
+        print(f"{name:<28}" + "".join(f"{row.get(c, ''):>16}" for c in columns))
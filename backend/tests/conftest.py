@@ -0,0 +1,104 @@
+import os
+import uuid
+from contextlib import contextmanager
+
+import pytest
+
+# Point the application at a local SQLite database before app modules import settings
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("DEBUG", "False")
+# One process, so the in-memory response cache is safe
+os.environ.setdefault("RESPONSE_CACHE_BACKEND", "memory")
+# Fail tests on N+1 query loops and exceeded query budgets
+os.environ.setdefault("QUERY_BUDGET_STRICT", "True")
+# Fail tests whose requests block the event loop
+os.environ.setdefault("LOOP_LAG_STRICT", "True")
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.main import app
+from app.db.base import Base, SessionLocal, engine
+from app.core.security import create_access_token, get_password_hash
+from app.models.user import User
+
+Base.metadata.create_all(bind=engine)
+
+_TEST_PASSWORD_HASH = get_password_hash("TestPassword123")
+
+
+@pytest.fixture
+def client():
+    """Test client for the application."""
+    return TestClient(app)
+
+
+def _create_user_headers():
+    """Create a user directly and return bearer headers for it."""
+    suffix = uuid.uuid4().hex[:12]
+    db = SessionLocal()
+    try:
+        user = User(
+            username=f"user_{suffix}",
+            email=f"user_{suffix}@example.com",
+            password_hash=_TEST_PASSWORD_HASH
+        )
+        db.add(user)
+        db.commit()
+        token = create_access_token(data={"sub": user.id})
+    finally:
+        db.close()
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def auth_headers():
+    """Create a fresh user and return bearer headers for it."""
+    return _create_user_headers()
+
+
+@pytest.fixture
+def make_auth_headers():
+    """Factory creating further users, for tests that need more than one."""
+    return _create_user_headers
+
+
+@pytest.fixture
+def count_queries():
+    """Context manager collecting SQL statements executed on any engine."""
+    @contextmanager
+    def counter():
+        statements = []
+        
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+    
+    return counter
+
+
+
+@pytest.fixture
+def capture_statements():
+    """Context manager collecting (statement, parameters) executed on any engine."""
+    @contextmanager
+    def capture():
+        statements = []
+        
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if not executemany:
+                statements.append((statement, parameters))
+        
+        event.listen(Engine, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(Engine, "before_cursor_execute", before_cursor_execute)
+    
+    return capture
@@ -1,28 +1,32 @@
+import asyncio
+import os
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from app.main import app
-from app.db.base import Base, get_db
+from app.db.base import Base, get_async_db
 from app.core.config import settings
+from app.core import auth_cache
+from app.core.auth_cache import (
+    auth_cache_stats, get_cached_claims, get_cached_principal, principal_cache
+)
 
 # Create test database
 SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(SQLALCHEMY_TEST_DATABASE_URL, connect_args={"check_same_thread": False})
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db")
+TestingSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
 
 Base.metadata.create_all(bind=engine)
 
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
+async def override_get_async_db():
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
-app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_async_db] = override_get_async_db
 
 client = TestClient(app)
 
@@ -131,4 +135,107 @@ class TestAuth:
         assert response.status_code == 200
         data = response.json()
         assert "access_token" in data
-        assert "refresh_token" in data
\ No newline at end of file
+        assert "refresh_token" in data
+
+class TestPrincipalCache:
+    """Test the authenticated-principal cache."""
+    
+    def _login(self, email, password="TestPassword123"):
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": email.split("@")[0],
+                "email": email,
+                "password": password
+            }
+        )
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": email, "password": password}
+        )
+        return response.json()["access_token"]
+    
+    def test_repeated_requests_hit_cache(self):
+        """Test that a warm token skips decoding and the user lookup."""
+        token = self._login("cachehit@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+        before = auth_cache_stats()
+        response = client.get("/api/v1/auth/me", headers=headers)
+        after = auth_cache_stats()
+        
+        assert response.status_code == 200
+        assert response.json()["email"] == "cachehit@example.com"
+        assert after["tokens"]["hits"] == before["tokens"]["hits"] + 1
+        assert after["principals"]["hits"] == before["principals"]["hits"] + 1
+    
+    def test_password_reset_invalidates_principal(self):
+        """Test that confirming a password reset drops the cached snapshot."""
+        token = self._login("cachereset@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+        assert get_cached_principal(user_id) is not None
+        
+        reset_token = client.post(
+            "/api/v1/auth/reset-password",
+            json={"email": "cachereset@example.com"}
+        ).json()["token"]
+        response = client.post(
+            "/api/v1/auth/reset-password/confirm",
+            json={"token": reset_token, "new_password": "NewPassword123"}
+        )
+        
+        assert response.status_code == 200
+        assert get_cached_principal(user_id) is None
+        assert get_cached_claims(token) is None
+    
+    def test_newer_generation_drops_cached_entries(self):
+        """Test entries cached before another worker started a new generation are dropped."""
+        token = self._login("cachegeneration@example.com")
+        headers = {"Authorization": f"Bearer {token}"}
+        user_id = client.get("/api/v1/auth/me", headers=headers).json()["id"]
+        assert get_cached_claims(token) is not None
+        
+        assert get_cached_principal(user_id, "bumped-elsewhere") is None
+        assert get_cached_claims(token) is None
+        assert client.get("/api/v1/auth/me", headers=headers).status_code == 200
+        assert principal_cache.get(user_id)[0] is None
+    
+    @pytest.mark.skipif(not os.environ.get("TEST_REDIS_URL"), reason="TEST_REDIS_URL is not set")
+    def test_generations_shared_through_redis(self, monkeypatch):
+        """Test a generation started by one worker is read by the others."""
+        from redis import asyncio as aioredis
+        
+        async def scenario():
+            monkeypatch.setattr(auth_cache, "shared_generations", aioredis.from_url(os.environ["TEST_REDIS_URL"]))
+            before = await auth_cache.principal_generation("shared-user")
+            await auth_cache.bump_principal_generations(["shared-user"])
+            after = await auth_cache.principal_generation("shared-user")
+            assert after is not None and after != before
+        
+        asyncio.run(scenario())
+
+
+class TestPasswordHashing:
+    """Test the bounded password hashing executor."""
+    
+    def test_login_rejected_when_hashing_saturated(self, monkeypatch):
+        """Test that logins fail fast with 503 when no hashing slots are free."""
+        client.post(
+            "/api/v1/auth/register",
+            json={
+                "username": "busyuser",
+                "email": "busy@example.com",
+                "password": "TestPassword123"
+            }
+        )
+        monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+        
+        response = client.post(
+            "/api/v1/auth/login",
+            json={"email": "busy@example.com", "password": "TestPassword123"}
+        )
+        
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
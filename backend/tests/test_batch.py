@@ -0,0 +1,70 @@
+from app.core import security
+
+
+class TestBatch:
+    """Test the /batch multiplexing endpoint."""
+    
+    DASHBOARD = [
+        {"id": "habits", "path": "/habits/?is_active=true"},
+        {"id": "todos", "path": "/todos/?is_completed=false"},
+        {"id": "food", "path": "/food/daily-summary"},
+        {"id": "sleep", "path": "/sleep/weekly-summary"},
+    ]
+    
+    def test_matches_individual_requests(self, client, auth_headers):
+        """Test each sub-response equals the same request made on its own."""
+        client.post("/api/v1/habits/", json={"name": "Stretch"}, headers=auth_headers)
+        client.post("/api/v1/todos/", json={"title": "Plan", "priority": 1}, headers=auth_headers)
+        client.post("/api/v1/food/entries", json={
+            "food_name": "Oats", "quantity": 1, "calories": 150, "meal_category": "breakfast"
+        }, headers=auth_headers)
+        
+        response = client.post("/api/v1/batch", json={"requests": self.DASHBOARD}, headers=auth_headers)
+        assert response.status_code == 200
+        results = response.json()["responses"]
+        
+        assert [result["id"] for result in results] == ["habits", "todos", "food", "sleep"]
+        for item, result in zip(self.DASHBOARD, results):
+            direct = client.get(f"/api/v1{item['path']}", headers=auth_headers)
+            assert result["status"] == direct.status_code == 200
+            assert result["body"] == direct.json()
+    
+    def test_authenticates_once(self, client, auth_headers, monkeypatch):
+        """Test sub-requests reuse the batch's principal instead of re-authenticating."""
+        monkeypatch.setattr("app.core.dependencies.get_cached_claims", lambda token: None)
+        calls = []
+        decode = security.decode_token
+        monkeypatch.setattr("app.core.dependencies.decode_token", lambda token: calls.append(token) or decode(token))
+        
+        response = client.post("/api/v1/batch", json={"requests": self.DASHBOARD}, headers=auth_headers)
+        assert response.status_code == 200
+        assert len(calls) == 1
+    
+    def test_sub_request_errors_and_headers(self, client, auth_headers):
+        """Test sub-request statuses and headers are returned per item."""
+        for name in ("A", "B"):
+            client.post("/api/v1/food/entries", json={
+                "food_name": name, "quantity": 1, "calories": 10, "meal_category": "snack"
+            }, headers=auth_headers)
+        
+        response = client.post("/api/v1/batch", json={"requests": [
+            {"id": "page", "path": "/food/entries?limit=1"},
+            {"id": "missing", "path": "/habits/does-not-exist"},
+            {"id": "nested", "path": "/batch"},
+        ]}, headers=auth_headers)
+        page, missing, nested = response.json()["responses"]
+        
+        assert page["status"] == 200 and len(page["body"]) == 1
+        assert "x-next-cursor" in page["headers"]
+        assert missing["status"] == 404
+        assert nested["status"] == 400
+    
+    def test_rejects_writes_and_anonymous_calls(self, client, auth_headers):
+        """Test only GET sub-requests are accepted and the batch itself needs auth."""
+        response = client.post("/api/v1/batch", json={"requests": [
+            {"method": "DELETE", "path": "/habits/x"}
+        ]}, headers=auth_headers)
+        assert response.status_code == 422
+        
+        response = client.post("/api/v1/batch", json={"requests": self.DASHBOARD})
+        assert response.status_code in (401, 403)
@@ -0,0 +1,72 @@
+from datetime import date
+
+
+class TestConditionalGet:
+    """Test ETags and 304 Not Modified on list and summary endpoints."""
+    
+    PATHS = [
+        "/habits/",
+        "/todos/",
+        "/food/entries",
+        "/food/daily-summary",
+        f"/food/range-summary?from={date.today()}&to={date.today()}",
+        "/sleep/entries",
+        "/sleep/weekly-summary",
+    ]
+    
+    def _food(self, client, headers):
+        client.post("/api/v1/food/entries", json={
+            "food_name": "Apple", "quantity": 1, "calories": 95, "meal_category": "snack"
+        }, headers=headers)
+    
+    def test_unchanged_poll_is_not_modified(self, client, auth_headers, count_queries):
+        """Test a matching If-None-Match gets an empty 304 without touching the database."""
+        self._food(client, auth_headers)
+        for path in self.PATHS:
+            first = client.get(f"/api/v1{path}", headers=auth_headers)
+            etag = first.headers["ETag"]
+            assert first.status_code == 200 and etag.startswith('"')
+            assert first.headers["Cache-Control"] == "private, no-cache"
+            
+            with count_queries() as statements:
+                second = client.get(f"/api/v1{path}", headers={**auth_headers, "If-None-Match": etag})
+            
+            assert second.status_code == 304, path
+            assert second.content == b""
+            assert second.headers["ETag"] == etag
+            assert statements == []
+    
+    def test_write_changes_etag(self, client, auth_headers):
+        """Test a committed write to the domain makes the old ETag stale."""
+        first = client.get("/api/v1/food/entries", headers=auth_headers)
+        summary = client.get("/api/v1/food/daily-summary", headers=auth_headers)
+        habits = client.get("/api/v1/habits/", headers=auth_headers)
+        self._food(client, auth_headers)
+        
+        second = client.get("/api/v1/food/entries", headers={**auth_headers, "If-None-Match": first.headers["ETag"]})
+        assert second.status_code == 200 and len(second.json()) == 1
+        assert second.headers["ETag"] != first.headers["ETag"]
+        response = client.get("/api/v1/food/daily-summary", headers={**auth_headers, "If-None-Match": summary.headers["ETag"]})
+        assert response.status_code == 200 and response.json()["total_calories"] == 95
+        # Other domains keep their version
+        response = client.get("/api/v1/habits/", headers={**auth_headers, "If-None-Match": habits.headers["ETag"]})
+        assert response.status_code == 304
+    
+    def test_etags_differ_by_url_and_user(self, client, auth_headers, make_auth_headers):
+        """Test an ETag only validates the URL and user it was issued for."""
+        etag = client.get("/api/v1/todos/", headers=auth_headers).headers["ETag"]
+        
+        other = client.get("/api/v1/todos/", params={"limit": 5}, headers={**auth_headers, "If-None-Match": etag})
+        assert other.status_code == 200 and other.headers["ETag"] != etag
+        response = client.get("/api/v1/todos/", headers={**make_auth_headers(), "If-None-Match": etag})
+        assert response.status_code == 200
+    
+    def test_if_none_match_forms(self, client, auth_headers):
+        """Test lists, weak tags and * all match."""
+        etag = client.get("/api/v1/habits/", headers=auth_headers).headers["ETag"]
+        
+        for header in (f'"stale", {etag}', f"W/{etag}", "*"):
+            response = client.get("/api/v1/habits/", headers={**auth_headers, "If-None-Match": header})
+            assert response.status_code == 304, header
+        response = client.get("/api/v1/habits/", headers={**auth_headers, "If-None-Match": '"stale"'})
+        assert response.status_code == 200
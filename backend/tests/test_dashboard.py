@@ -0,0 +1,95 @@
+import asyncio
+from datetime import date, timedelta
+
+from app.core.config import settings
+from app.core.response_cache import DASHBOARD_DOMAIN, cache_namespace, response_cache
+from app.db.base import SessionLocal
+from app.models.todo import Todo
+
+
+class TestDashboard:
+    """Test the /dashboard endpoint and its cache."""
+    
+    def _dashboard(self, client, headers):
+        response = client.get("/api/v1/dashboard", headers=headers)
+        assert response.status_code == 200
+        return response.json()
+    
+    def test_sections(self, client, auth_headers):
+        """Test every section reflects today's data."""
+        today = date.today()
+        habit = client.post("/api/v1/habits/", json={"name": "Read"}, headers=auth_headers).json()
+        client.post(f"/api/v1/habits/{habit['id']}/complete", headers=auth_headers)
+        client.post("/api/v1/habits/", json={"name": "Walk"}, headers=auth_headers)
+        done = client.post("/api/v1/todos/", json={"title": "Done", "priority": 1}, headers=auth_headers).json()
+        client.post(f"/api/v1/todos/{done['id']}/complete", headers=auth_headers)
+        client.post("/api/v1/todos/", json={"title": "Later", "priority": 3}, headers=auth_headers)
+        client.post("/api/v1/todos/", json={"title": "Now", "priority": 1}, headers=auth_headers)
+        for name, calories, meal in (("Oats", 150, "breakfast"), ("Soup", 300, "lunch")):
+            client.post("/api/v1/food/entries", json={
+                "food_name": name, "quantity": 1, "calories": calories, "meal_category": meal
+            }, headers=auth_headers)
+        client.post("/api/v1/sleep/entries", json={
+            "bedtime": f"{today - timedelta(days=1)}T23:00:00", "wake_time": f"{today}T06:30:00", "quality_rating": 8
+        }, headers=auth_headers)
+        
+        data = self._dashboard(client, auth_headers)
+        
+        assert data["date"] == today.isoformat()
+        assert {(habit["name"], habit["is_completed_today"], habit["current_streak"]) for habit in data["habits"]} == {
+            ("Read", True, 1), ("Walk", False, 0)
+        }
+        assert [todo["title"] for todo in data["todos"]] == ["Now", "Later"]
+        assert data["food"] == {"total_calories": 450, "entries_count": 2, "meal_breakdown": {"breakfast": 150, "lunch": 300}}
+        assert data["sleep"]["duration_hours"] == 7.5
+        assert data["sleep"]["quality_rating"] == 8
+    
+    def test_empty_dashboard(self, client, auth_headers):
+        """Test a new user gets empty sections."""
+        data = self._dashboard(client, auth_headers)
+        assert data["habits"] == [] and data["todos"] == [] and data["sleep"] is None
+        assert data["food"]["total_calories"] == 0
+    
+    def test_cached_until_write(self, client, auth_headers, count_queries):
+        """Test repeat reads are served from the cache and writes invalidate it."""
+        self._dashboard(client, auth_headers)
+        with count_queries() as statements:
+            self._dashboard(client, auth_headers)
+        assert statements == []
+        
+        client.post("/api/v1/food/entries", json={
+            "food_name": "Apple", "quantity": 1, "calories": 95, "meal_category": "snack"
+        }, headers=auth_headers)
+        assert self._dashboard(client, auth_headers)["food"]["total_calories"] == 95
+        
+        client.post("/api/v1/import/sleep", content=(
+            f'{{"bedtime": "{date.today()}T00:00:00", "wake_time": "{date.today()}T07:00:00"}}'
+        ), headers=auth_headers)
+        assert self._dashboard(client, auth_headers)["sleep"]["duration_hours"] == 7.0
+    
+    def test_concurrent_and_sequential_queries_agree(self, client, auth_headers, monkeypatch):
+        """Test sections loaded on separate sessions match the single-session path."""
+        client.post("/api/v1/todos/", json={"title": "Plan", "priority": 2}, headers=auth_headers)
+        client.post("/api/v1/habits/", json={"name": "Read"}, headers=auth_headers)
+        
+        monkeypatch.setattr(response_cache, "ttl", 0)
+        payloads = []
+        for concurrent in (False, True):
+            monkeypatch.setattr(settings, "DASHBOARD_CONCURRENT_QUERIES", concurrent)
+            payloads.append(self._dashboard(client, auth_headers))
+        assert payloads[0] == payloads[1]
+    
+    def test_follows_shared_generations(self, client, auth_headers):
+        """Test a dashboard cached here is dropped when another worker starts a new generation."""
+        data = self._dashboard(client, auth_headers)
+        user_id = client.get("/api/v1/auth/me", headers=auth_headers).json()["id"]
+        db = SessionLocal()
+        try:
+            db.add(Todo(user_id=user_id, title="From another worker", priority=1))
+            db.commit()
+        finally:
+            db.close()
+        assert self._dashboard(client, auth_headers) == data
+        
+        asyncio.run(response_cache.invalidate([cache_namespace(user_id, DASHBOARD_DOMAIN)]))
+        assert [todo["title"] for todo in self._dashboard(client, auth_headers)["todos"]] == ["From another worker"]
@@ -0,0 +1,114 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.db.base import SessionLocal
+from app.models.food import FoodEntry
+from app.models.user import User
+from app.services.export import stream_export
+
+
+def seed_food_entries(count):
+    """Create a user with `count` food entries via a bulk insert."""
+    db = SessionLocal()
+    try:
+        suffix = uuid.uuid4().hex[:12]
+        user = User(username=f"export_{suffix}", email=f"export_{suffix}@example.com", password_hash="!")
+        db.add(user)
+        db.commit()
+        start = datetime(2022, 1, 1)
+        db.execute(insert(FoodEntry), [
+            {
+                "id": str(uuid.uuid4()),
+                "user_id": user.id,
+                "food_name": f"Food {i}",
+                "quantity": 1.0,
+                "calories": i % 900,
+                "meal_category": "lunch",
+                "nutritional_info": {"protein": 10},
+                "logged_at": start + timedelta(hours=i),
+            }
+            for i in range(count)
+        ])
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def export_peak_memory(user_id):
+    """Drain the export stream and return (bytes produced, peak traced memory)."""
+    async def drain():
+        total = 0
+        async for chunk in stream_export(user_id, "ndjson", compress=True):
+            total += len(chunk)
+        return total
+    
+    tracemalloc.start()
+    total = asyncio.run(drain())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return total, peak
+
+
+class TestExport:
+    """Test the streaming account export."""
+    
+    def _seed(self, client, headers):
+        client.post("/api/v1/food/entries", json={
+            "food_name": "Toast, buttered", "quantity": 1, "calories": 180,
+            "meal_category": "breakfast", "nutritional_info": {"fat": 8}
+        }, headers=headers)
+        habit = client.post("/api/v1/habits/", json={"name": "Stretch"}, headers=headers).json()
+        client.post(f"/api/v1/habits/{habit['id']}/complete", headers=headers)
+        client.post("/api/v1/todos/", json={"title": "Plan week", "priority": 2}, headers=headers)
+    
+    def test_ndjson_gzip_export(self, client, auth_headers):
+        """Test the default export is gzip NDJSON covering every table."""
+        self._seed(client, auth_headers)
+        
+        response = client.get("/api/v1/export", headers=auth_headers)
+        
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/gzip"
+        assert ".ndjson.gz" in response.headers["content-disposition"]
+        lines = [json.loads(line) for line in gzip.decompress(response.content).splitlines()]
+        assert [line["table"] for line in lines] == ["food_entries", "habits", "habit_completions", "todos"]
+        assert lines[0]["nutritional_info"] == {"fat": 8}
+    
+    def test_single_table_csv(self, client, auth_headers):
+        """Test a one-table CSV export is a plain CSV with a header row."""
+        self._seed(client, auth_headers)
+        
+        response = client.get(
+            "/api/v1/export",
+            params={"format": "csv", "tables": "food_entries", "compress": False},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert len(rows) == 1
+        assert rows[0]["food_name"] == "Toast, buttered"
+        assert json.loads(rows[0]["nutritional_info"]) == {"fat": 8}
+    
+    def test_unknown_table(self, client, auth_headers):
+        """Test unknown table names are rejected."""
+        response = client.get("/api/v1/export", params={"tables": "users"}, headers=auth_headers)
+        
+        assert response.status_code == 400
+    
+    def test_memory_does_not_grow_with_row_count(self):
+        """Test peak memory stays flat when the export is 8x larger."""
+        small_bytes, small_peak = export_peak_memory(seed_food_entries(1000))
+        large_bytes, large_peak = export_peak_memory(seed_food_entries(8000))
+        
+        assert large_bytes > 4 * small_bytes
+        assert large_peak < small_peak * 1.5
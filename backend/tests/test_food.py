@@ -0,0 +1,319 @@
+import asyncio
+from datetime import date, datetime
+
+import pytest
+from sqlalchemy import select, update
+
+from app.commands import reconcile_food_rollups as reconcile_module
+from app.commands.reconcile_food_rollups import reconcile_food_rollups
+from app.db.base import AsyncSessionLocal, SessionLocal
+from app.models.food import FoodDailyRollup, FoodEntry
+from app.services import food_rollups, food_summary
+from app.services.food_rollups import COUNTER_COLUMNS
+from app.services.food_summary import NUTRIENTS, summarize_entries, summarize_food_entries
+from app.services.food_search import FoodSearchIndex, edit_distance
+
+
+class TestDailySummary:
+    """Test the food daily summary."""
+    
+    def _log(self, client, headers, **fields):
+        entry = {
+            "food_name": "Oats",
+            "quantity": 1,
+            "calories": 100,
+            "meal_category": "breakfast",
+            "logged_at": datetime.combine(date(2025, 5, 4), datetime.min.time()).replace(hour=8).isoformat(),
+        }
+        entry.update(fields)
+        response = client.post("/api/v1/food/entries", json=entry, headers=headers)
+        assert response.status_code == 201
+        return response.json()
+    
+    def _summary(self, client, headers, target_date):
+        response = client.get(
+            "/api/v1/food/daily-summary",
+            params={"target_date": target_date},
+            headers=headers
+        )
+        assert response.status_code == 200
+        return response.json()
+    
+    def test_summary_aggregates_meals_and_nutrients(self, client, auth_headers):
+        """Test calorie, meal and JSON nutrient sums for one day."""
+        self._log(client, auth_headers, calories=300, nutritional_info={"protein": 10, "carbs": 40.5})
+        self._log(client, auth_headers, calories=200, nutritional_info={"protein": 5})
+        self._log(client, auth_headers, calories=650, meal_category="dinner", nutritional_info={"fat": 20, "note": "x"})
+        self._log(client, auth_headers, calories=0, meal_category="snack")
+        self._log(client, auth_headers, calories=999, logged_at="2025-05-05T08:00:00")
+        
+        response = client.get(
+            "/api/v1/food/daily-summary",
+            params={"target_date": "2025-05-04"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_calories"] == 1150
+        assert data["entries_count"] == 4
+        assert data["meal_breakdown"] == {"breakfast": 500, "dinner": 650, "snack": 0}
+        assert data["nutritional_summary"]["protein"] == 15
+        assert data["nutritional_summary"]["carbs"] == 40.5
+        assert data["nutritional_summary"]["fat"] == 20
+        assert data["nutritional_summary"]["sodium"] == 0
+    
+    
+    def test_summary_is_single_primary_key_read(self, client, auth_headers, count_queries):
+        """Test the daily summary reads only the rollup row."""
+        self._log(client, auth_headers, calories=300)
+        
+        with count_queries() as statements:
+            data = self._summary(client, auth_headers, "2025-05-04")
+        
+        assert data["total_calories"] == 300
+        food_queries = [s for s in statements if "food_" in s]
+        assert len(food_queries) == 1
+        assert "food_daily_rollups" in food_queries[0]
+    
+    def test_update_moves_entry_between_days(self, client, auth_headers):
+        """Test changing logged_at, calories and meal moves the contribution."""
+        entry = self._log(client, auth_headers, calories=300, nutritional_info={"protein": 10})
+        self._log(client, auth_headers, calories=100)
+        
+        response = client.put(
+            f"/api/v1/food/entries/{entry['id']}",
+            json={"logged_at": "2025-05-06T19:00:00", "calories": 450, "meal_category": "dinner"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        
+        old_day = self._summary(client, auth_headers, "2025-05-04")
+        assert old_day["total_calories"] == 100
+        assert old_day["entries_count"] == 1
+        assert old_day["nutritional_summary"]["protein"] == 0
+        new_day = self._summary(client, auth_headers, "2025-05-06")
+        assert new_day["total_calories"] == 450
+        assert new_day["meal_breakdown"] == {"dinner": 450}
+        assert new_day["nutritional_summary"]["protein"] == 10
+    
+    def test_update_locks_days_in_date_order(self, client, auth_headers, monkeypatch):
+        """Test moving an entry to an earlier day still locks the earlier rollup first."""
+        entry = self._log(client, auth_headers, calories=300)
+        locked = []
+        lock = food_rollups._locked_rollup
+        
+        async def recording_lock(db, user_id, day):
+            locked.append(day)
+            return await lock(db, user_id, day)
+        
+        monkeypatch.setattr(food_rollups, "_locked_rollup", recording_lock)
+        response = client.put(
+            f"/api/v1/food/entries/{entry['id']}",
+            json={"logged_at": "2025-05-02T19:00:00"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
+        assert locked == [date(2025, 5, 2), date(2025, 5, 4)]
+        assert self._summary(client, auth_headers, "2025-05-02")["total_calories"] == 300
+        assert self._summary(client, auth_headers, "2025-05-04")["entries_count"] == 0
+    
+    def test_delete_removes_contribution(self, client, auth_headers):
+        """Test deleting an entry subtracts it from its day."""
+        entry = self._log(client, auth_headers, calories=300, meal_category="lunch")
+        self._log(client, auth_headers, calories=100)
+        
+        response = client.delete(f"/api/v1/food/entries/{entry['id']}", headers=auth_headers)
+        assert response.status_code == 204
+        
+        data = self._summary(client, auth_headers, "2025-05-04")
+        assert data["total_calories"] == 100
+        assert data["meal_breakdown"] == {"breakfast": 100}
+    
+    def test_range_summary(self, client, auth_headers):
+        """Test totals and per-day rows across a range."""
+        self._log(client, auth_headers, calories=300, nutritional_info={"fat": 2.5})
+        self._log(client, auth_headers, calories=200, logged_at="2025-05-07T12:00:00", meal_category="lunch")
+        self._log(client, auth_headers, calories=999, logged_at="2025-06-01T12:00:00")
+        
+        response = client.get(
+            "/api/v1/food/range-summary",
+            params={"from": "2025-05-01", "to": "2025-05-31"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total_calories"] == 500
+        assert data["entries_count"] == 2
+        assert data["meal_breakdown"] == {"breakfast": 300, "lunch": 200}
+        assert data["nutritional_summary"]["fat"] == 2.5
+        assert [day["date"] for day in data["days"]] == ["2025-05-04", "2025-05-07"]
+    
+    def test_range_summary_rejects_reversed_range(self, client, auth_headers):
+        """Test 'to' before 'from' is rejected."""
+        response = client.get(
+            "/api/v1/food/range-summary",
+            params={"from": "2025-05-31", "to": "2025-05-01"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 400
+    
+    def test_reconcile_rebuilds_rollups(self, client, auth_headers):
+        """Test the reconcile command repairs drifted rollups."""
+        self._log(client, auth_headers, calories=300, nutritional_info={"carbs": 12})
+        self._log(client, auth_headers, calories=150, meal_category="snack")
+        
+        db = SessionLocal()
+        try:
+            db.execute(update(FoodDailyRollup).values(total_calories=1, carbs=0, snack_count=0))
+            db.commit()
+            reconcile_food_rollups(db, chunk_size=2)
+        finally:
+            db.close()
+        
+        data = self._summary(client, auth_headers, "2025-05-04")
+        assert data["total_calories"] == 450
+        assert data["meal_breakdown"] == {"breakfast": 300, "snack": 150}
+        assert data["nutritional_summary"]["carbs"] == 12
+
+
+
+class TestSummaryAggregation:
+    """Test the SQL food summary against the Python loop it replaces."""
+    
+    def _log_mixed(self, client, headers):
+        # Numbers, strings, booleans, nulls and missing nutrients, plus an entry on the next day
+        for calories, meal, info, logged_at in (
+            (300, "breakfast", {"carbs": 12.5, "protein": 7}, "2025-05-04T08:00:00"),
+            (150, "snack", {"carbs": "lots", "fat": True, "sugar": 3}, "2025-05-04T15:00:00"),
+            (420, "dinner", None, "2025-05-04T19:00:00"),
+            (80, "snack", {"fiber": 2.25, "sodium": None}, "2025-05-04T21:00:00"),
+            (999, "lunch", {"carbs": 40}, "2025-05-05T12:00:00"),
+        ):
+            response = client.post("/api/v1/food/entries", headers=headers, json={
+                "food_name": "Oats", "quantity": 1, "calories": calories,
+                "meal_category": meal, "nutritional_info": info, "logged_at": logged_at
+            })
+            assert response.status_code == 201
+        return client.get("/api/v1/auth/me", headers=headers).json()["id"]
+    
+    @pytest.mark.parametrize("in_sql", [True, False])
+    def test_matches_python_summary(self, client, auth_headers, monkeypatch, count_queries, in_sql):
+        """Test both the GROUP BY path and the fallback agree with summarize_entries."""
+        user_id = self._log_mixed(client, auth_headers)
+        if not in_sql:
+            monkeypatch.setattr(food_summary, "JSON_AGGREGATE_DIALECTS", set())
+        start, end = datetime(2025, 5, 4), datetime.combine(date(2025, 5, 4), datetime.max.time())
+        
+        async def summaries():
+            async with AsyncSessionLocal() as db:
+                entries = (await db.scalars(select(FoodEntry).filter(
+                    FoodEntry.user_id == user_id, FoodEntry.logged_at <= end
+                ))).all()
+                return await summarize_food_entries(db, user_id, start, end), summarize_entries(entries)
+        
+        with count_queries() as statements:
+            summary, expected = asyncio.run(summaries())
+        
+        assert any("GROUP BY" in statement for statement in statements) == in_sql
+        assert expected["total_calories"] == 950 and expected["nutritional_summary"]["carbs"] == 12.5
+        assert summary["total_calories"] == expected["total_calories"]
+        assert summary["entries_count"] == expected["entries_count"]
+        assert summary["meal_breakdown"] == expected["meal_breakdown"]
+        assert summary["nutritional_summary"] == pytest.approx(expected["nutritional_summary"])
+    
+    def test_reconcile_paths_agree(self, client, auth_headers, monkeypatch):
+        """Test reconcile writes the same rollups from SQL sums as from loaded entries."""
+        user_id = self._log_mixed(client, auth_headers)
+        columns = COUNTER_COLUMNS + list(NUTRIENTS)
+        
+        def reconciled():
+            db = SessionLocal()
+            try:
+                reconcile_food_rollups(db)
+                return {
+                    rollup.date: [getattr(rollup, column) for column in columns]
+                    for rollup in db.scalars(select(FoodDailyRollup).filter(FoodDailyRollup.user_id == user_id))
+                }
+            finally:
+                db.close()
+        
+        summed = reconciled()
+        monkeypatch.setattr(reconcile_module, "JSON_AGGREGATE_DIALECTS", set())
+        loaded = reconciled()
+        
+        assert len(summed) == 2 and summed.keys() == loaded.keys()
+        for day, values in summed.items():
+            assert values == pytest.approx(loaded[day])
+
+
+class TestFoodSearch:
+    """Test the food search index and endpoint."""
+    
+    def _index(self):
+        return FoodSearchIndex([
+            {"name": "Chicken Breast Grilled", "calories": "165", "protein": "31"},
+            {"name": "Chicken Noodle Soup", "calories": "62"},
+            {"name": "Chickpeas Cooked", "calories": "269"},
+            {"name": "Broccoli", "calories": "31"},
+            {"name": "Crème Brûlée", "calories": "330"},
+        ])
+    
+    def _names(self, index, query, **kwargs):
+        _, hits = index.search(query, **kwargs)
+        return [index.names[food_id] for food_id, _ in hits]
+    
+    def test_exact_matches_rank_above_prefix_matches(self):
+        """Test whole-word matches outrank prefix matches."""
+        index = self._index()
+        assert self._names(index, "chick")[-1] == "Chickpeas Cooked"
+        assert self._names(index, "chicken") == ["Chicken Breast Grilled", "Chicken Noodle Soup"]
+    
+    def test_every_query_token_must_match(self):
+        """Test multi-word queries intersect, in any word order."""
+        assert self._names(self._index(), "grilled chick") == ["Chicken Breast Grilled"]
+        assert self._names(self._index(), "soup beef") == []
+    
+    def test_typos_and_accents(self):
+        """Test typo-tolerant and accent-folded matching."""
+        index = self._index()
+        assert self._names(index, "brocoli") == ["Broccoli"]
+        assert self._names(index, "chiken brest") == ["Chicken Breast Grilled"]
+        assert self._names(index, "creme brulee") == ["Crème Brûlée"]
+        assert edit_distance("avocaod", "avocado", 1) == 1
+        assert edit_distance("apple", "maple", 1) == 2
+    
+    def test_pagination(self):
+        """Test skip/limit page through results with a stable total."""
+        index = self._index()
+        total, first = index.search("chi", skip=0, limit=2)
+        _, second = index.search("chi", skip=2, limit=2)
+        assert total == 3
+        assert len(first) == 2 and len(second) == 1
+        assert {food_id for food_id, _ in first}.isdisjoint(food_id for food_id, _ in second)
+    
+    def test_search_endpoint_returns_entry_ready_results(self, client, auth_headers):
+        """Test search results can be posted as food entries."""
+        response = client.get(
+            "/api/v1/food/search",
+            params={"query": "banan", "limit": 5},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] >= 1
+        top = data["results"][0]
+        assert top["food_name"] == "Banana"
+        assert top["calories"] == 105
+        assert top["nutritional_info"]["carbs"] == 27
+        
+        entry = {key: top[key] for key in ("food_name", "quantity", "calories", "nutritional_info")}
+        created = client.post(
+            "/api/v1/food/entries",
+            json={**entry, "meal_category": "snack"},
+            headers=auth_headers
+        )
+        assert created.status_code == 201
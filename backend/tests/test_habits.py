@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+
+class TestHabitList:
+    """Test habit read paths."""
+    
+    def _create_habits(self, client, headers, count):
+        habit_ids = []
+        for i in range(count):
+            response = client.post("/api/v1/habits/", json={"name": f"Habit {i}"}, headers=headers)
+            assert response.status_code == 201
+            habit_ids.append(response.json()["id"])
+        return habit_ids
+    
+    def test_list_reports_completed_today(self, client, auth_headers):
+        """Test that the list flags only habits completed today."""
+        done, pending = self._create_habits(client, auth_headers, 2)
+        client.post(f"/api/v1/habits/{done}/complete", headers=auth_headers)
+        
+        response = client.get("/api/v1/habits/", headers=auth_headers)
+        
+        assert response.status_code == 200
+        flags = {habit["id"]: habit["is_completed_today"] for habit in response.json()}
+        assert flags == {done: True, pending: False}
+    
+    def test_list_query_count_is_constant(self, client, auth_headers, count_queries):
+        """Test that listing habits does not issue one query per habit."""
+        habit_ids = self._create_habits(client, auth_headers, 3)
+        for habit_id in habit_ids:
+            client.post(f"/api/v1/habits/{habit_id}/complete", headers=auth_headers)
+        # Warm the principal cache so only the list query is counted; the filter
+        # keeps the counted request from being a response cache hit
+        client.get("/api/v1/habits/", params={"is_active": True}, headers=auth_headers)
+        
+        with count_queries() as statements:
+            response = client.get("/api/v1/habits/", headers=auth_headers)
+        
+        assert len(response.json()) == 3
+        assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+    
+    def test_get_and_update_habit_report_completed_today(self, client, auth_headers):
+        """Test that single-habit reads carry today's completion flag."""
+        habit_id, = self._create_habits(client, auth_headers, 1)
+        client.post(f"/api/v1/habits/{habit_id}/complete", headers=auth_headers)
+        
+        assert client.get(f"/api/v1/habits/{habit_id}", headers=auth_headers).json()["is_completed_today"]
+        response = client.put(f"/api/v1/habits/{habit_id}", json={"name": "Renamed"}, headers=auth_headers)
+        assert response.json()["name"] == "Renamed"
+        assert response.json()["is_completed_today"] is True
+
+    
+    def test_calendar_heatmap(self, client, auth_headers):
+        """Test that the calendar endpoint marks completed days of the year."""
+        habit_id, = self._create_habits(client, auth_headers, 1)
+        today = date.today()
+        client.post(f"/api/v1/habits/{habit_id}/complete", headers=auth_headers)
+        
+        response = client.get(
+            f"/api/v1/habits/{habit_id}/calendar",
+            params={"year": today.year},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        data = response.json()
+        day_of_year = (today - date(today.year, 1, 1)).days
+        assert data["days"][day_of_year] == 1
+        assert sum(data["days"]) == data["completed_days"] == 1
+        assert data["current_streak"] == 1
+    
+    def test_completion_date_is_bounded(self, client, auth_headers):
+        """Test far-future and far-past completions are rejected before they stretch the bitmap."""
+        habit_id, = self._create_habits(client, auth_headers, 1)
+        for completion_date in ("9999-12-31", str(date.today() + timedelta(days=2)), "0001-01-01"):
+            response = client.post(
+                f"/api/v1/habits/{habit_id}/complete",
+                json={"habit_id": habit_id, "completion_date": completion_date},
+                headers=auth_headers
+            )
+            assert response.status_code == 422
+        
+        response = client.post(
+            f"/api/v1/habits/{habit_id}/complete",
+            json={"habit_id": habit_id, "completion_date": "2000-01-01"},
+            headers=auth_headers
+        )
+        assert response.status_code == 200
@@ -0,0 +1,115 @@
+import gzip
+import json
+from datetime import date, timedelta
+
+
+class TestImport:
+    """Test the bulk /import endpoints."""
+    
+    def _import(self, client, headers, kind, body, content_type="application/x-ndjson", **extra_headers):
+        response = client.post(
+            f"/api/v1/import/{kind}",
+            content=body,
+            headers={**headers, "Content-Type": content_type, **extra_headers}
+        )
+        assert response.status_code == 200
+        return response.json()
+    
+    def test_food_csv_reports_row_errors(self, client, auth_headers):
+        """Test CSV food rows are imported, bad rows reported and rollups updated."""
+        day = date.today() - timedelta(days=30)
+        body = (
+            "food_name,quantity,calories,meal_category,logged_at,protein\n"
+            f"Oats,1,150,breakfast,{day}T08:00:00,5\n"
+            f"\"Rice, fried\",2,400,lunch,{day}T12:00:00,\n"
+            f"Soup,1,-5,dinner,{day}T19:00:00,3\n"
+            f"Tea,1,5,drinks,{day}T20:00:00,\n"
+            f"Cake,1,300,snack,{day}T21:00:00,lots\n"
+        )
+        report = self._import(client, auth_headers, "food", body, "text/csv")
+        
+        assert (report["rows"], report["imported"], report["failed"]) == (5, 2, 3)
+        assert [error["row"] for error in report["errors"]] == [3, 4, 5]
+        assert report["errors"][0]["errors"][0].startswith("calories:")
+        assert report["errors"][1]["errors"][0].startswith("meal_category:")
+        assert report["errors"][2]["errors"] == ["protein: Input should be a valid number"]
+        
+        summary = client.get("/api/v1/food/daily-summary", params={"target_date": day.isoformat()}, headers=auth_headers).json()
+        assert summary["total_calories"] == 550
+        assert summary["meal_breakdown"] == {"breakfast": 150, "lunch": 400}
+        assert summary["nutritional_summary"]["protein"] == 5
+    
+    def test_sleep_ndjson_gzip_rejects_duplicate_dates(self, client, auth_headers):
+        """Test gzip NDJSON sleep rows, with duplicate dates and bad lines reported."""
+        start = date.today() - timedelta(days=10)
+        lines = []
+        for i in range(3):
+            wake = start + timedelta(days=i)
+            lines.append(json.dumps({
+                "bedtime": f"{wake - timedelta(days=1)}T23:00:00",
+                "wake_time": f"{wake}T07:00:00",
+                "quality_rating": 7
+            }))
+        lines.append(lines[0])
+        lines.append("{not json")
+        body = gzip.compress(("\n".join(lines) + "\n").encode())
+        
+        report = self._import(client, auth_headers, "sleep", body, **{"Content-Encoding": "gzip"})
+        
+        assert (report["rows"], report["imported"], report["failed"]) == (5, 3, 2)
+        assert report["errors"] == [
+            {"row": 4, "errors": [f"Sleep entry already exists for {start}"]},
+            {"row": 5, "errors": ["Invalid JSON"]},
+        ]
+        entries = client.get("/api/v1/sleep/entries", headers=auth_headers).json()
+        assert [entry["duration_hours"] for entry in entries] == [8.0, 8.0, 8.0]
+    
+    def test_habit_history_creates_habits_and_streaks(self, client, auth_headers):
+        """Test habit history creates habits by name and refreshes their streaks."""
+        today = date.today()
+        rows = [{"name": "Run", "completion_date": str(today - timedelta(days=i))} for i in range(5)]
+        rows += [{"name": "Run", "completion_date": str(today)}]
+        rows += [{"name": f"Habit {i}", "completion_date": str(today - timedelta(days=40))} for i in range(3)]
+        body = "\n".join(json.dumps(row) for row in rows)
+        
+        report = self._import(client, auth_headers, "habits", body)
+        
+        assert (report["imported"], report["failed"]) == (8, 1)
+        assert report["errors"][0]["row"] == 6
+        habits = {habit["name"]: habit for habit in client.get("/api/v1/habits/", headers=auth_headers).json()}
+        assert habits["Run"]["current_streak"] == 5
+        assert habits["Run"]["is_completed_today"] is True
+        # The active-habit limit still applies; the extra habit is imported inactive
+        assert sorted(name for name, habit in habits.items() if habit["is_active"]) == ["Habit 0", "Habit 1", "Run"]
+        
+        # Importing into an existing habit extends its history
+        report = self._import(client, auth_headers, "habits", json.dumps(
+            {"name": "Run", "completion_date": str(today - timedelta(days=5))}
+        ))
+        assert report["imported"] == 1
+        run = client.get(f"/api/v1/habits/{habits['Run']['id']}", headers=auth_headers).json()
+        assert (run["current_streak"], run["longest_streak"]) == (6, 6)
+    
+    def test_habit_history_rejects_out_of_range_dates(self, client, auth_headers):
+        """Test imported completions get the same date bounds as the complete endpoint."""
+        body = "\n".join(json.dumps({"name": "Run", "completion_date": day}) for day in (
+            "0001-01-01", "9999-12-31", str(date.today())
+        ))
+        report = self._import(client, auth_headers, "habits", body)
+        assert (report["imported"], report["failed"]) == (1, 2)
+        assert [error["row"] for error in report["errors"]] == [1, 2]
+    
+    def test_imported_rows_are_synced(self, client, auth_headers):
+        """Test imported rows appear in the delta sync change log."""
+        body = "\n".join(json.dumps({
+            "food_name": f"Item {i}", "quantity": 1, "calories": 10, "meal_category": "snack"
+        }) for i in range(3))
+        self._import(client, auth_headers, "food", body)
+        
+        sync = client.get("/api/v1/sync", params={"since": 0}, headers=auth_headers).json()
+        assert sorted(entry["food_name"] for entry in sync["changes"]["food_entries"]) == ["Item 0", "Item 1", "Item 2"]
+    
+    def test_unknown_kind(self, client, auth_headers):
+        """Test an unknown import kind is rejected."""
+        response = client.post("/api/v1/import/todos", content="{}", headers=auth_headers)
+        assert response.status_code == 422
@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.loop_monitor import EventLoopBlocked, LoopLagMiddleware, gc_clock, loop_blocked, loop_lag
+
+
+def _blocking_app():
+    """A tiny app with one endpoint that blocks the loop and one that awaits, behind the watchdog."""
+    app = FastAPI()
+    app.add_middleware(LoopLagMiddleware)
+    
+    @app.get("/block/{seconds}")
+    async def block(seconds: float):
+        time.sleep(seconds)
+        return {"ok": True}
+    
+    @app.get("/collect/{seconds}")
+    async def collect(seconds: float):
+        gc_clock.callback("start", {})
+        time.sleep(seconds)
+        gc_clock.callback("stop", {})
+        return {"ok": True}
+    
+    @app.get("/wait/{seconds}")
+    async def wait(seconds: float):
+        await asyncio.sleep(seconds)
+        return {"ok": True}
+    
+    return app
+
+
+class TestLoopMonitor:
+    """Test the event loop watchdog and its strict mode."""
+    
+    def test_blocking_call_fails_in_strict_mode(self):
+        """Test a handler blocking the loop raises, naming the route and line."""
+        client = TestClient(_blocking_app())
+        assert client.get("/wait/0.3").status_code == 200
+        
+        with pytest.raises(EventLoopBlocked, match=r"GET /block/\{seconds\} blocked the event loop .* in block"):
+            client.get("/block/0.3")
+    
+    def test_blocking_call_is_logged_and_counted(self, monkeypatch, caplog):
+        """Test production logs the stack, counts the offender and still answers."""
+        monkeypatch.setattr(settings, "LOOP_LAG_STRICT", False)
+        client = TestClient(_blocking_app())
+        with caplog.at_level(logging.WARNING, logger="app.core.loop_monitor"):
+            response = client.get("/block/0.3")
+        
+        assert response.status_code == 200
+        assert "GET /block/{seconds} blocked the event loop" in caplog.text
+        assert "time.sleep(seconds)" in caplog.text
+        (location,) = {
+            labels[1] for labels in loop_blocked._merged() if labels[0] == "GET /block/{seconds}"
+        }
+        assert location.startswith("test_loop_monitor.py:") and location.endswith(" in block")
+    
+    def test_admin_lists_stalls(self, client, monkeypatch):
+        """Test recent stalls are listed for operators."""
+        monkeypatch.setattr(settings, "LOOP_LAG_STRICT", False)
+        monkeypatch.setattr(settings, "ADMIN_API_KEY", "test-admin-key")
+        TestClient(_blocking_app()).get("/block/0.3")
+        
+        stalls = client.get("/api/v1/admin/stalls", headers={"X-Admin-Key": "test-admin-key"}).json()
+        stall = next(stall for stall in reversed(stalls) if stall["route"] == "GET /block/{seconds}")
+        assert stall["lag_ms"] >= 300 * 0.9 and "time.sleep(seconds)" in "".join(stall["stack"])
+    
+    def test_short_blocks_pass(self):
+        """Test work under the threshold is not reported, while lag is still measured."""
+        client = TestClient(_blocking_app())
+        lags = loop_lag.count()
+        assert client.get(f"/block/{settings.LOOP_LAG_THRESHOLD_SECONDS / 10}").status_code == 200
+        assert client.get("/wait/0.2").status_code == 200
+        assert loop_lag.count() > lags
+    
+    def test_gc_pauses_are_not_blamed(self):
+        """Test time the garbage collector stopped the loop does not count against the route."""
+        client = TestClient(_blocking_app())
+        assert client.get("/collect/0.3").status_code == 200
+        assert not any(labels[0] == "GET /collect/{seconds}" for labels in loop_blocked._merged())
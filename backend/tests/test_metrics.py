@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.metrics import (
+    Counter, Histogram, MetricsMiddleware, Registry, db_pool_checkout_wait, http_request_duration,
+    http_request_errors, http_requests, password_hash_duration
+)
+from app.core.security import get_password_hash_async
+from app.db.base import SessionLocal
+
+
+class TestMetrics:
+    """Test the /metrics endpoint and the counters behind it."""
+    
+    def test_routes_are_counted_by_template(self, client, auth_headers):
+        """Test requests are labelled with their route template and status."""
+        labels = ("GET", "/api/v1/habits/{habit_id}")
+        before = http_requests.value(labels + ("404",))
+        timed_before = http_request_duration.count(labels)
+        
+        client.get("/api/v1/habits/missing-1", headers=auth_headers)
+        client.get("/api/v1/habits/missing-2", headers=auth_headers)
+        
+        assert http_requests.value(labels + ("404",)) == before + 2
+        assert http_request_duration.count(labels) == timed_before + 2
+        body = client.get("/metrics").text
+        assert 'http_requests_total{method="GET",route="/api/v1/habits/{habit_id}",status="404"}' in body
+        assert "missing-1" not in body
+    
+    def test_exposition_format(self, client, auth_headers):
+        """Test the scrape has the Prometheus content type, histograms and cache ratios."""
+        client.get("/api/v1/todos/", headers=auth_headers)
+        response = client.get("/metrics")
+        
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        body = response.text
+        assert "# TYPE http_request_duration_seconds histogram" in body
+        assert 'http_request_duration_seconds_bucket{method="GET",route="/api/v1/todos/",le="+Inf"}' in body
+        assert 'cache_hit_ratio{cache="auth_principals"}' in body
+        assert 'db_pool_size{engine="sync"} 10' in body
+    
+    def test_errors_are_counted(self):
+        """Test unhandled exceptions count as 5xx errors."""
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+        
+        @app.get("/boom")
+        async def boom():
+            raise RuntimeError("boom")
+        
+        before = http_request_errors.value(("GET", "/boom"))
+        response = TestClient(app, raise_server_exceptions=False).get("/boom")
+        
+        assert response.status_code == 500
+        assert http_request_errors.value(("GET", "/boom")) == before + 1
+    
+    def test_pool_checkouts_and_password_hashing_are_timed(self):
+        """Test connection checkouts and bcrypt jobs are observed."""
+        checkouts = db_pool_checkout_wait.count(("sync",))
+        SessionLocal().connection().close()
+        assert db_pool_checkout_wait.count(("sync",)) == checkouts + 1
+        
+        hashes = password_hash_duration.count(("get_password_hash",))
+        asyncio.run(get_password_hash_async("Password123"))
+        assert password_hash_duration.count(("get_password_hash",)) == hashes + 1
+    
+    def test_threads_update_without_sharing(self):
+        """Test updates from many threads are all summed when scraped."""
+        registry = Registry()
+        counter = Counter("jobs_total", "Jobs.", ("kind",), registry=registry)
+        histogram = Histogram("job_seconds", "Job time.", buckets=(0.1, 1.0), registry=registry)
+        
+        def work():
+            for _ in range(1000):
+                counter.inc(("a",))
+                histogram.observe(0.5)
+        
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert registry.render() == (
+            "# HELP jobs_total Jobs.\n"
+            "# TYPE jobs_total counter\n"
+            'jobs_total{kind="a"} 4000\n'
+            "# HELP job_seconds Job time.\n"
+            "# TYPE job_seconds histogram\n"
+            'job_seconds_bucket{le="0.1"} 0\n'
+            'job_seconds_bucket{le="1"} 4000\n'
+            'job_seconds_bucket{le="+Inf"} 4000\n'
+            "job_seconds_sum 2000\n"
+            "job_seconds_count 4000\n"
+        )
@@ -0,0 +1,98 @@
+from app.core.pagination import CURSOR_HEADER, decode_cursor, encode_cursor
+from app.models.food import FoodEntry
+
+
+def page_through(client, url, headers, limit, **params):
+    """Follow X-Next-Cursor until the last page, returning every item id."""
+    ids, cursor, pages = [], None, 0
+    while True:
+        query = dict(params, limit=limit)
+        if cursor:
+            query["cursor"] = cursor
+        response = client.get(url, params=query, headers=headers)
+        assert response.status_code == 200
+        ids.extend(item["id"] for item in response.json())
+        pages += 1
+        cursor = response.headers.get(CURSOR_HEADER)
+        if not cursor:
+            return ids, pages
+
+
+class TestKeysetPagination:
+    """Test cursor pagination on the list endpoints."""
+    
+    def _log_food(self, client, headers, logged_at):
+        response = client.post("/api/v1/food/entries", json={
+            "food_name": "Rice", "quantity": 1, "calories": 200,
+            "meal_category": "lunch", "logged_at": logged_at
+        }, headers=headers)
+        assert response.status_code == 201
+        return response.json()["id"]
+    
+    def test_cursor_pages_match_offset_order(self, client, auth_headers):
+        """Test cursor pages cover every row once, ties included, in the usual order."""
+        for hour in (8, 8, 8, 12, 12, 19, 7):
+            self._log_food(client, auth_headers, f"2025-01-10T{hour:02d}:00:00")
+        
+        ids, pages = page_through(client, "/api/v1/food/entries", auth_headers, limit=2)
+        expected = [item["id"] for item in client.get(
+            "/api/v1/food/entries", params={"limit": 100}, headers=auth_headers
+        ).json()]
+        
+        assert pages == 4
+        assert ids == expected
+        assert len(set(ids)) == 7
+    
+    def test_inserts_between_pages_do_not_shift_rows(self, client, auth_headers):
+        """Test a newer row written mid-pagination is not repeated or skipped."""
+        for day in range(1, 6):
+            self._log_food(client, auth_headers, f"2025-02-0{day}T12:00:00")
+        
+        first = client.get("/api/v1/food/entries", params={"limit": 2}, headers=auth_headers)
+        self._log_food(client, auth_headers, "2025-02-09T12:00:00")
+        rest, _ = page_through(
+            client, "/api/v1/food/entries", auth_headers, limit=2,
+            cursor=first.headers[CURSOR_HEADER]
+        )
+        
+        seen = [item["id"] for item in first.json()] + rest
+        assert len(seen) == 5
+        assert len(set(seen)) == 5
+    
+    def test_mixed_direction_todo_order(self, client, auth_headers):
+        """Test priority ascending, newest first within a priority."""
+        # Only three todos may be open at once, so complete each one
+        for priority in (3, 1, 2, 3, 3):
+            response = client.post("/api/v1/todos/", json={"title": "Task", "priority": priority}, headers=auth_headers)
+            assert response.status_code == 201
+            client.post(f"/api/v1/todos/{response.json()['id']}/complete", headers=auth_headers)
+        
+        ids, _ = page_through(client, "/api/v1/todos/", auth_headers, limit=2)
+        expected = [item["id"] for item in client.get(
+            "/api/v1/todos/", params={"limit": 100}, headers=auth_headers
+        ).json()]
+        
+        assert ids == expected
+        assert len(ids) == 5
+    
+    def test_last_page_has_no_cursor(self, client, auth_headers):
+        """Test a page holding the remaining rows omits the header."""
+        self._log_food(client, auth_headers, "2025-03-01T12:00:00")
+        
+        response = client.get("/api/v1/food/entries", params={"limit": 5}, headers=auth_headers)
+        
+        assert CURSOR_HEADER not in response.headers
+    
+    def test_invalid_cursor(self, client, auth_headers):
+        """Test malformed cursors are rejected with 400."""
+        for cursor in ("not-a-cursor", encode_cursor(["2025-01-01T00:00:00"]), encode_cursor([1, 2])):
+            response = client.get("/api/v1/food/entries", params={"cursor": cursor}, headers=auth_headers)
+            assert response.status_code == 400
+    
+    def test_cursor_round_trip(self):
+        """Test cursor values decode to the sort columns' types."""
+        from datetime import datetime
+        sort_keys = [(FoodEntry.logged_at, True), (FoodEntry.id, True)]
+        values = [datetime(2025, 1, 2, 3, 4, 5, 678000), "abc"]
+        
+        assert decode_cursor(encode_cursor(values), sort_keys) == values
@@ -0,0 +1,111 @@
+import asyncio
+import time
+
+import pytest
+from pydantic import ValidationError
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.config import Settings, settings
+from app.core.profiler import ProfilerMiddleware, sign_profile_request
+from app.main import app as main_app
+
+ADMIN_KEY = "test-admin-key"
+
+
+@pytest.fixture
+def profiler_settings(monkeypatch, tmp_path):
+    """Point profiles at a temporary directory and set an admin key."""
+    monkeypatch.setattr(settings, "ADMIN_API_KEY", ADMIN_KEY)
+    monkeypatch.setattr(settings, "PROFILE_DIR", str(tmp_path))
+    monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 0.0)
+    return tmp_path
+
+
+def _profiled_app():
+    """A tiny app with a slow endpoint, behind the profiler."""
+    app = FastAPI()
+    app.add_middleware(ProfilerMiddleware)
+    
+    def spin(seconds: float):
+        deadline = time.perf_counter() + seconds
+        while time.perf_counter() < deadline:
+            pass
+    
+    @app.get("/slow")
+    async def slow():
+        spin(0.05)
+        await asyncio.sleep(0)
+        return {"ok": True}
+    
+    return app
+
+
+class TestProfiler:
+    """Test sampled and signed request profiles and the admin listing."""
+    
+    def test_disabled_by_default(self):
+        """Test the middleware is not installed unless enabled."""
+        assert not settings.PROFILER_ENABLED
+        assert ProfilerMiddleware not in [middleware.cls for middleware in main_app.user_middleware]
+    
+    def test_signed_request_is_profiled(self, profiler_settings):
+        """Test a signed header writes collapsed stacks, allocations and metadata."""
+        client = TestClient(_profiled_app())
+        assert client.get("/slow").status_code == 200
+        assert list(profiler_settings.iterdir()) == []
+        
+        header = sign_profile_request("GET", "/slow", int(time.time()) + 60)
+        assert client.get("/slow", headers={"X-Profile": header}).status_code == 200
+        
+        (meta,) = profiler_settings.glob("*.json")
+        collapsed = profiler_settings / f"{meta.stem}.collapsed"
+        stacks = collapsed.read_text().splitlines()
+        assert any("spin (tests/test_profiler.py" in stack for stack in stacks)
+        assert all(stack.rsplit(" ", 1)[1].isdigit() for stack in stacks)
+        assert (profiler_settings / f"{meta.stem}.alloc.txt").read_text().startswith(f"{'KiB':>10}")
+    
+    def test_bad_signatures_are_ignored(self, profiler_settings):
+        """Test expired, forged or other-path signatures do not profile."""
+        client = TestClient(_profiled_app())
+        future = int(time.time()) + 60
+        for header in (
+            sign_profile_request("GET", "/slow", int(time.time()) - 1),
+            sign_profile_request("GET", "/other", future),
+            f"{future}:{'0' * 64}",
+            "garbage",
+        ):
+            assert client.get("/slow", headers={"X-Profile": header}).status_code == 200
+        assert list(profiler_settings.iterdir()) == []
+    
+    def test_sampling_and_retention(self, profiler_settings, monkeypatch):
+        """Test sampled requests are profiled and only the newest are kept."""
+        monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+        monkeypatch.setattr(settings, "PROFILE_MAX_KEPT", 2)
+        client = TestClient(_profiled_app())
+        for _ in range(3):
+            client.get("/slow")
+        
+        assert len(list(profiler_settings.glob("*.json"))) == 2
+        assert len(list(profiler_settings.glob("*.collapsed"))) == 2
+    
+    def test_max_kept_must_keep_a_profile(self):
+        """Test PROFILE_MAX_KEPT=0 is rejected rather than pruning every profile."""
+        with pytest.raises(ValidationError, match="PROFILE_MAX_KEPT must be at least 1"):
+            Settings(PROFILE_MAX_KEPT=0)
+    
+    def test_admin_endpoints(self, client, profiler_settings, monkeypatch):
+        """Test profiles are listed and downloaded with the admin key only."""
+        monkeypatch.setattr(settings, "PROFILE_SAMPLE_RATE", 1.0)
+        TestClient(_profiled_app()).get("/slow")
+        admin = {"X-Admin-Key": ADMIN_KEY}
+        
+        assert client.get("/api/v1/admin/profiles").status_code == 403
+        assert client.get("/api/v1/admin/profiles", headers={"X-Admin-Key": "wrong"}).status_code == 403
+        (profile,) = client.get("/api/v1/admin/profiles", headers=admin).json()
+        assert profile["path"] == "/slow" and profile["trigger"] == "sampled" and profile["samples"] > 0
+        
+        response = client.get(f"/api/v1/admin/profiles/{profile['id']}/collapsed", headers=admin)
+        assert response.status_code == 200 and "spin" in response.text
+        response = client.get("/api/v1/admin/profiles/..%2F..%2Fetc/collapsed", headers=admin)
+        assert response.status_code == 404
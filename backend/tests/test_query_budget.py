@@ -0,0 +1,95 @@
+import copy
+import logging
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import select, text
+from sqlalchemy.exc import OperationalError
+
+from app.core.config import settings
+from app.core.query_budget import QueryBudgetExceeded, QueryStatsMiddleware, query_budget, statement_shape
+from app.db.base import AsyncSessionLocal, engine
+from app.models.habit import Habit
+
+
+def _loop_app():
+    """A tiny app whose endpoints query in a loop, behind the stats middleware."""
+    app = FastAPI()
+    app.add_middleware(QueryStatsMiddleware)
+    
+    async def run_queries(count: int):
+        async with AsyncSessionLocal() as db:
+            for i in range(count):
+                await db.execute(select(Habit.id).filter(Habit.name == f"habit {i}"))
+    
+    @app.get("/loop/{count}")
+    async def loop(count: int):
+        await run_queries(count)
+        return {"ok": True}
+    
+    @app.get("/budgeted/{count}", dependencies=[Depends(query_budget(1))])
+    async def budgeted(count: int):
+        async with AsyncSessionLocal() as db:
+            await db.execute(select(Habit.id))
+            if count > 1:
+                await db.execute(select(Habit.name))
+        return {"ok": True}
+    
+    return app
+
+
+class TestQueryBudget:
+    """Test per-request query stats, budgets and the N+1 detector."""
+    
+    def test_server_timing_header(self, client, auth_headers):
+        """Test responses report their query count and DB time."""
+        client.get("/api/v1/habits/", params={"is_active": True}, headers=auth_headers)
+        response = client.get("/api/v1/habits/", headers=auth_headers)
+        
+        db_timing, total_timing = response.headers["Server-Timing"].split(", ")
+        assert db_timing.startswith("db;dur=") and db_timing.endswith('desc="1 queries"')
+        assert total_timing.startswith("total;dur=")
+    
+    def test_repeated_statement_fails_in_strict_mode(self):
+        """Test a statement run in a loop raises, while a couple of runs do not."""
+        client = TestClient(_loop_app())
+        assert client.get(f"/loop/{settings.QUERY_REPEAT_THRESHOLD - 1}").status_code == 200
+        
+        with pytest.raises(QueryBudgetExceeded, match=f"{settings.QUERY_REPEAT_THRESHOLD}x SELECT habits.id"):
+            client.get(f"/loop/{settings.QUERY_REPEAT_THRESHOLD}")
+    
+    def test_budget_fails_in_strict_mode(self):
+        """Test exceeding a declared budget raises."""
+        client = TestClient(_loop_app())
+        assert client.get("/budgeted/1").status_code == 200
+        
+        with pytest.raises(QueryBudgetExceeded, match="2 queries exceed the budget of 1"):
+            client.get("/budgeted/2")
+    
+    def test_violations_are_logged_outside_strict_mode(self, monkeypatch, caplog):
+        """Test production only logs a warning and still answers."""
+        monkeypatch.setattr(settings, "QUERY_BUDGET_STRICT", False)
+        client = TestClient(_loop_app())
+        
+        with caplog.at_level(logging.WARNING, logger="app.core.query_budget"):
+            response = client.get("/budgeted/2")
+        
+        assert response.status_code == 200
+        assert "GET /budgeted/2: 2 queries exceed the budget of 1" in caplog.text
+    
+    def test_failed_statements_leave_no_state_on_the_connection(self):
+        """Test a statement that raises is not timed into the next one on the same connection."""
+        with engine.connect() as conn:
+            before = copy.deepcopy(conn.info)
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    conn.execute(text("SELECT missing FROM nowhere"))
+            assert conn.execute(text("SELECT 1")).scalar() == 1
+            assert conn.info == before
+    
+    def test_statement_shape_folds_parameter_lists(self):
+        """Test IN lists of any length and whitespace share one shape."""
+        assert statement_shape("SELECT a FROM t WHERE id IN (?, ?, ?)") == statement_shape(
+            "SELECT a\n  FROM t WHERE id IN (?)"
+        ) == statement_shape("SELECT a FROM t WHERE id IN (%s,%s)")
@@ -0,0 +1,81 @@
+from datetime import date, timedelta
+
+from app.db.base import engine
+
+
+def table_scans(statements):
+    """EXPLAIN QUERY PLAN each captured read/update/delete and return full-table scans."""
+    scans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE")):
+                continue
+            plan = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            for row in plan:
+                detail = row[-1]
+                # "SCAN t" reads every row; "SEARCH t USING INDEX" and "SCAN CONSTANT ROW" do not
+                if detail.startswith("SCAN ") and "USING" not in detail and "CONSTANT ROW" not in detail:
+                    scans.append((detail, statement))
+    return scans
+
+
+class TestQueryPlans:
+    """Test endpoint queries are served by indexes rather than table scans."""
+
+    def _exercise(self, client, headers):
+        today = date.today()
+
+        food = client.post("/api/v1/food/entries", json={
+            "food_name": "Oats", "quantity": 1, "calories": 150, "meal_category": "breakfast"
+        }, headers=headers).json()
+        client.post("/api/v1/food/entries", json={
+            "food_name": "Tea", "quantity": 1, "calories": 5, "meal_category": "snack"
+        }, headers=headers)
+        page = client.get("/api/v1/food/entries", params={"date_from": today.isoformat(), "date_to": today.isoformat(), "limit": 1}, headers=headers)
+        client.get("/api/v1/food/entries", params={"cursor": page.headers["X-Next-Cursor"], "limit": 1}, headers=headers)
+        client.get(f"/api/v1/food/entries/{food['id']}", headers=headers)
+        client.put(f"/api/v1/food/entries/{food['id']}", json={"calories": 200}, headers=headers)
+        client.get("/api/v1/food/daily-summary", headers=headers)
+        client.get("/api/v1/food/range-summary", params={"from": (today - timedelta(days=7)).isoformat(), "to": today.isoformat()}, headers=headers)
+        client.delete(f"/api/v1/food/entries/{food['id']}", headers=headers)
+
+        sleep = client.post("/api/v1/sleep/entries", json={
+            "bedtime": f"{(today - timedelta(days=1)).isoformat()}T23:00:00",
+            "wake_time": f"{today.isoformat()}T07:00:00"
+        }, headers=headers).json()
+        client.get("/api/v1/sleep/entries", params={"date_from": (today - timedelta(days=7)).isoformat()}, headers=headers)
+        client.put(f"/api/v1/sleep/entries/{sleep['id']}", json={"quality_rating": 8}, headers=headers)
+        client.get("/api/v1/sleep/weekly-summary", headers=headers)
+        client.delete(f"/api/v1/sleep/entries/{sleep['id']}", headers=headers)
+
+        habit = client.post("/api/v1/habits/", json={"name": "Read"}, headers=headers).json()
+        client.post(f"/api/v1/habits/{habit['id']}/complete", headers=headers)
+        client.get("/api/v1/habits/", params={"is_active": True}, headers=headers)
+        client.get(f"/api/v1/habits/{habit['id']}/calendar", headers=headers)
+        client.delete(f"/api/v1/habits/{habit['id']}/complete", headers=headers)
+        client.put(f"/api/v1/habits/{habit['id']}", json={"is_active": False}, headers=headers)
+        client.delete(f"/api/v1/habits/{habit['id']}", headers=headers)
+
+        todo = client.post("/api/v1/todos/", json={"title": "Write", "priority": 2}, headers=headers).json()
+        client.get("/api/v1/todos/", params={"is_completed": False}, headers=headers)
+        client.get("/api/v1/todos/", params={"is_completed": False, "priority": 2}, headers=headers)
+        client.post(f"/api/v1/todos/{todo['id']}/complete", headers=headers)
+        client.post(f"/api/v1/todos/{todo['id']}/uncomplete", headers=headers)
+        client.delete(f"/api/v1/todos/{todo['id']}", headers=headers)
+
+        client.post("/api/v1/import/food", content='{"food_name": "Rice", "quantity": 1, "calories": 200, "meal_category": "lunch"}', headers=headers)
+        client.post("/api/v1/import/sleep", content=f'{{"bedtime": "{today}T00:30:00", "wake_time": "{today}T08:00:00"}}', headers=headers)
+        client.post("/api/v1/import/habits", content=f'{{"name": "Stretch", "completion_date": "{today}"}}', headers=headers)
+        
+        client.get("/api/v1/auth/me", headers=headers)
+        client.get("/api/v1/dashboard", headers=headers)
+        client.get("/api/v1/sync", params={"since": 0}, headers=headers)
+
+    def test_no_full_table_scans(self, client, auth_headers, capture_statements):
+        """Test every endpoint query plan uses an index or primary key."""
+        with capture_statements() as statements:
+            self._exercise(client, auth_headers)
+
+        assert len(statements) > 30
+        scans = table_scans(statements)
+        assert not scans, "\n\n".join(f"{detail}:\n{statement}" for detail, statement in scans)
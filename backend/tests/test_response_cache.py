@@ -0,0 +1,174 @@
+import asyncio
+import os
+from datetime import date, timedelta
+
+import pytest
+
+from app.commands.recompute_streaks import recompute_all_streaks
+from app.commands.reconcile_food_rollups import reconcile_food_rollups
+from app.core.config import settings
+from app.core.response_cache import (
+    MemoryBackend, RedisBackend, cache_namespace, create_backend, response_cache
+)
+from app.db.base import SessionLocal
+
+
+class TestResponseCache:
+    """Test cached GET responses and their write-through invalidation."""
+    
+    READS = ["/habits/", "/todos/", "/food/daily-summary", "/sleep/weekly-summary"]
+    
+    def _food(self, client, headers, calories):
+        return client.post("/api/v1/food/entries", json={
+            "food_name": "Apple", "quantity": 1, "calories": calories, "meal_category": "snack"
+        }, headers=headers)
+    
+    def test_repeat_reads_are_served_from_cache(self, client, auth_headers, count_queries):
+        """Test a second read of each cached endpoint runs no queries and counts a hit."""
+        client.post("/api/v1/habits/", json={"name": "Read"}, headers=auth_headers)
+        client.post("/api/v1/todos/", json={"title": "Plan", "priority": 1}, headers=auth_headers)
+        first = [client.get(f"/api/v1{path}", headers=auth_headers) for path in self.READS]
+        hits = dict(response_cache.hits)
+        
+        with count_queries() as statements:
+            second = [client.get(f"/api/v1{path}", headers=auth_headers) for path in self.READS]
+        
+        assert statements == []
+        assert [response.json() for response in second] == [response.json() for response in first]
+        assert all(response.headers["content-type"] == "application/json" for response in second)
+        for domain in ("habits", "todos", "food", "sleep"):
+            assert response_cache.hits[domain] == hits.get(domain, 0) + 1
+        stats = client.get("/health").json()["caches"]["responses"]
+        assert stats["backend"] == "memory" and 0 < stats["domains"]["food"]["hit_ratio"] <= 1
+    
+    def test_writes_invalidate_their_domain(self, client, auth_headers):
+        """Test every mutating handler's write shows up on the next read."""
+        habit = client.post("/api/v1/habits/", json={"name": "Read"}, headers=auth_headers).json()
+        assert client.get("/api/v1/habits/", headers=auth_headers).json()[0]["is_completed_today"] is False
+        client.post(f"/api/v1/habits/{habit['id']}/complete", headers=auth_headers)
+        assert client.get("/api/v1/habits/", headers=auth_headers).json()[0]["is_completed_today"] is True
+        
+        todo = client.post("/api/v1/todos/", json={"title": "Plan", "priority": 1}, headers=auth_headers).json()
+        assert len(client.get("/api/v1/todos/", headers=auth_headers).json()) == 1
+        client.delete(f"/api/v1/todos/{todo['id']}", headers=auth_headers)
+        assert client.get("/api/v1/todos/", headers=auth_headers).json() == []
+        
+        entry = self._food(client, auth_headers, 95).json()
+        assert client.get("/api/v1/food/daily-summary", headers=auth_headers).json()["total_calories"] == 95
+        client.put(f"/api/v1/food/entries/{entry['id']}", json={"calories": 120}, headers=auth_headers)
+        assert client.get("/api/v1/food/daily-summary", headers=auth_headers).json()["total_calories"] == 120
+        
+        assert client.get("/api/v1/sleep/weekly-summary", headers=auth_headers).json()["total_entries"] == 0
+        today = date.today()
+        client.post("/api/v1/sleep/entries", json={
+            "bedtime": f"{today - timedelta(days=1)}T23:00:00", "wake_time": f"{today}T07:00:00"
+        }, headers=auth_headers)
+        assert client.get("/api/v1/sleep/weekly-summary", headers=auth_headers).json()["total_entries"] == 1
+        
+        client.post(
+            "/api/v1/import/food",
+            content=b"food_name,quantity,calories,meal_category\nPear,1,80,snack\n",
+            headers={**auth_headers, "Content-Type": "text/csv"}
+        )
+        assert client.get("/api/v1/food/daily-summary", headers=auth_headers).json()["total_calories"] == 200
+    
+    def test_writes_keep_other_domains_cached(self, client, auth_headers, count_queries):
+        """Test a food write leaves cached habit and todo lists alone."""
+        client.get("/api/v1/habits/", headers=auth_headers)
+        client.get("/api/v1/food/daily-summary", headers=auth_headers)
+        self._food(client, auth_headers, 95)
+        
+        with count_queries() as statements:
+            client.get("/api/v1/habits/", headers=auth_headers)
+        assert statements == []
+        assert client.get("/api/v1/food/daily-summary", headers=auth_headers).json()["total_calories"] == 95
+    
+    def test_namespaced_per_user(self, client, auth_headers, make_auth_headers):
+        """Test users never see each other's cached responses or invalidations."""
+        other_headers = make_auth_headers()
+        self._food(client, auth_headers, 95)
+        assert client.get("/api/v1/food/daily-summary", headers=auth_headers).json()["total_calories"] == 95
+        assert client.get("/api/v1/food/daily-summary", headers=other_headers).json()["total_calories"] == 0
+        
+        self._food(client, other_headers, 300)
+        assert client.get("/api/v1/food/daily-summary", headers=auth_headers).json()["total_calories"] == 95
+        assert client.get("/api/v1/food/daily-summary", headers=other_headers).json()["total_calories"] == 300
+    
+    def test_cursor_header_is_cached(self, client, auth_headers):
+        """Test a cached page keeps its next-page cursor."""
+        for title in ("A", "B", "C"):
+            client.post("/api/v1/todos/", json={"title": title, "priority": 1}, headers=auth_headers)
+        first = client.get("/api/v1/todos/", params={"limit": 2}, headers=auth_headers)
+        second = client.get("/api/v1/todos/", params={"limit": 2}, headers=auth_headers)
+        
+        assert second.headers["X-Next-Cursor"] == first.headers["X-Next-Cursor"]
+        rest = client.get("/api/v1/todos/", params={"cursor": second.headers["X-Next-Cursor"]}, headers=auth_headers)
+        assert len(rest.json()) == 1 and "X-Next-Cursor" not in rest.headers
+    
+    def test_maintenance_commands_invalidate(self, client, auth_headers):
+        """Test the bulk rebuild commands start new generations for the users they rewrote."""
+        user_id = client.get("/api/v1/auth/me", headers=auth_headers).json()["id"]
+        client.post("/api/v1/habits/", json={"name": "Read"}, headers=auth_headers)
+        self._food(client, auth_headers, 95)
+        
+        def generations():
+            return {
+                domain: asyncio.run(response_cache.generation(cache_namespace(user_id, domain)))
+                for domain in ("habits", "food", "dashboard", "todos")
+            }
+        
+        db = SessionLocal()
+        try:
+            before = generations()
+            recompute_all_streaks(db)
+            after_streaks = generations()
+            reconcile_food_rollups(db)
+            after_rollups = generations()
+        finally:
+            db.close()
+        
+        assert after_streaks["habits"] != before["habits"] and after_streaks["food"] == before["food"]
+        assert after_streaks["dashboard"] != before["dashboard"]
+        assert after_rollups["food"] != after_streaks["food"] and after_rollups["habits"] == after_streaks["habits"]
+        assert after_rollups["dashboard"] != after_streaks["dashboard"]
+        assert after_rollups["todos"] == before["todos"]
+    
+    def test_memory_backend_is_bounded_by_bytes(self):
+        """Test the LRU evicts least recently used entries past max_bytes."""
+        backend = MemoryBackend(max_bytes=300, ttl=60)
+        
+        async def scenario():
+            generation, _ = await backend.lookup("ns", "a")
+            for key in ("a", "b", "c"):
+                await backend.store("ns", key, generation, b"x" * 100, ttl=60)
+            assert (await backend.lookup("ns", "a"))[1] is None
+            await backend.store("ns", "b", generation, b"y" * 100, ttl=60)
+            assert (await backend.lookup("ns", "c"))[1] == b"x" * 100
+            
+            await backend.invalidate(["ns"])
+            assert (await backend.lookup("ns", "c"))[1] is None
+        
+        asyncio.run(scenario())
+        assert backend.stats()["bytes"] <= 300 and backend.evictions == 1
+    
+    def test_memory_backend_is_opt_in(self, monkeypatch):
+        """Test without Redis the cache is off unless the per-process backend is asked for."""
+        monkeypatch.setattr(settings, "REDIS_URL", None)
+        assert create_backend(None) is None
+        assert isinstance(create_backend("memory"), MemoryBackend)
+    
+    @pytest.mark.skipif(not os.environ.get("TEST_REDIS_URL"), reason="TEST_REDIS_URL is not set")
+    def test_redis_backend(self):
+        """Test generations and entries round-trip through a real Redis server."""
+        backend = RedisBackend(os.environ["TEST_REDIS_URL"], ttl=60)
+        
+        async def scenario():
+            await backend.clear()
+            generation, value = await backend.lookup("rc:test:food", "rc:test:food:k")
+            assert value is None
+            await backend.store("rc:test:food", "rc:test:food:k", generation, b"body\nwith newline", ttl=60)
+            assert await backend.lookup("rc:test:food", "rc:test:food:k") == (generation, b"body\nwith newline")
+            await backend.invalidate(["rc:test:food"])
+            assert (await backend.lookup("rc:test:food", "rc:test:food:k"))[1] is None
+        
+        asyncio.run(scenario())
@@ -0,0 +1,116 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.singleflight import SingleFlight, summary_flights
+from app.main import app
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+class TestSingleFlight:
+    """Test collapsing concurrent identical computations."""
+    
+    def test_concurrent_calls_share_one_execution(self):
+        """Test waiters get the leader's result and only distinct keys run separately."""
+        flights = SingleFlight()
+        calls = []
+        
+        async def compute(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            return {"value": value}
+        
+        async def scenario():
+            return await asyncio.gather(
+                *(flights.do("a", lambda: compute("a")) for _ in range(5)),
+                flights.do("b", lambda: compute("b"))
+            )
+        
+        results = run(scenario())
+        assert results == [{"value": "a"}] * 5 + [{"value": "b"}]
+        assert calls == ["a", "b"]
+        assert flights.stats() == {"executions": 2, "shared": 4, "in_flight": 0}
+    
+    def test_errors_reach_every_waiter(self):
+        """Test the leader's exception is raised in all callers and the next call runs again."""
+        flights = SingleFlight()
+        
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+        
+        async def scenario():
+            return await asyncio.gather(*(flights.do("k", fail) for _ in range(3)), return_exceptions=True)
+        
+        results = run(scenario())
+        assert all(isinstance(result, ValueError) for result in results)
+        assert run(flights.do("k", lambda: asyncio.sleep(0, result=1))) == 1
+        assert flights.executions == 2
+    
+    def test_timeouts(self):
+        """Test a slow computation times out for everyone and is not left running."""
+        flights = SingleFlight()
+        finished, cancelled = [], []
+        
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+            finished.append(True)
+        
+        async def scenario():
+            results = await asyncio.gather(*(flights.do("k", slow, timeout=0.02) for _ in range(3)), return_exceptions=True)
+            # Cancelled by the time the leader gave up, not merely some time later
+            assert cancelled == [True]
+            await asyncio.sleep(0.05)
+            return results
+        
+        results = run(scenario())
+        assert all(isinstance(result, asyncio.TimeoutError) for result in results)
+        assert finished == [] and flights.stats()["in_flight"] == 0
+    
+    def test_cancelled_leader_hands_over(self):
+        """Test a waiter runs the computation itself when the leader is cancelled."""
+        flights = SingleFlight()
+        
+        async def compute():
+            await asyncio.sleep(0.02)
+            return "done"
+        
+        async def scenario():
+            leader = asyncio.ensure_future(flights.do("k", compute))
+            await asyncio.sleep(0)
+            waiter = asyncio.ensure_future(flights.do("k", compute))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await waiter
+        
+        assert run(scenario()) == "done"
+        assert flights.executions == 2
+    
+    def test_summary_endpoints_coalesce(self, auth_headers):
+        """Test identical concurrent summary requests run the handler once."""
+        async def scenario():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=auth_headers) as client:
+                # Warm the principal cache so the requests reach the handler together
+                await client.get("/api/v1/todos/")
+                before = summary_flights.executions
+                responses = await asyncio.gather(
+                    *(client.get("/api/v1/sleep/weekly-summary", params={"start_date": "2024-01-01"}) for _ in range(5))
+                )
+                return responses, summary_flights.executions - before
+        
+        responses, executions = run(scenario())
+        assert executions == 1
+        assert all(response.status_code == 200 for response in responses)
+        assert len({response.content for response in responses}) == 1
+        assert len({response.headers["ETag"] for response in responses}) == 1
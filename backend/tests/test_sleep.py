@@ -0,0 +1,41 @@
+from datetime import date, timedelta
+
+
+class TestSleepEntries:
+    """Test sleep entry date handling."""
+    
+    def _create(self, client, headers, wake_day):
+        bed_day = date.fromisoformat(wake_day) - timedelta(days=1)
+        response = client.post("/api/v1/sleep/entries", json={
+            "bedtime": f"{bed_day}T23:00:00",
+            "wake_time": f"{wake_day}T07:00:00"
+        }, headers=headers)
+        assert response.status_code == 201
+        return response.json()
+    
+    def test_update_rejects_moving_onto_existing_date(self, client, auth_headers):
+        """Test changing wake_time onto another entry's date is rejected."""
+        self._create(client, auth_headers, "2025-03-02")
+        entry = self._create(client, auth_headers, "2025-03-03")
+        
+        response = client.put(
+            f"/api/v1/sleep/entries/{entry['id']}",
+            json={"wake_time": "2025-03-02T08:00:00"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 400
+        assert client.get(f"/api/v1/sleep/entries/{entry['id']}", headers=auth_headers).json()["date"] == "2025-03-03"
+    
+    def test_update_within_same_date(self, client, auth_headers):
+        """Test changing wake_time within the same day still works."""
+        entry = self._create(client, auth_headers, "2025-03-05")
+        
+        response = client.put(
+            f"/api/v1/sleep/entries/{entry['id']}",
+            json={"wake_time": "2025-03-05T09:30:00"},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 200
+        assert response.json()["duration_hours"] == 10.5
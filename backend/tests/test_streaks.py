@@ -0,0 +1,149 @@
+from datetime import date, timedelta
+
+from app.db.base import SessionLocal
+from app.commands.recompute_streaks import recompute_all_streaks
+from app.models.habit import Habit
+from app.services.habit_bitmap import CompletionBitmap
+from app.services.streaks import compute_streaks
+
+TODAY = date(2025, 3, 15)
+
+
+def days_ago(*offsets):
+    return [TODAY - timedelta(days=offset) for offset in offsets]
+
+
+class TestComputeStreaks:
+    """Test the pure streak computation."""
+    
+    def test_out_of_order_dates(self):
+        """Test that input order does not matter."""
+        dates = days_ago(0, 5, 1, 6, 2, 7, 8)
+        assert compute_streaks(dates, TODAY) == (3, 4)
+    
+    def test_current_streak_counts_through_yesterday(self):
+        """Test that a streak ending yesterday is still current."""
+        assert compute_streaks(days_ago(1, 2), TODAY) == (2, 2)
+        assert compute_streaks(days_ago(2, 3), TODAY) == (0, 2)
+    
+    def test_empty(self):
+        """Test a habit with no completions."""
+        assert compute_streaks([], TODAY) == (0, 0)
+
+
+class TestCompletionBitmap:
+    """Test the day-indexed completion bitmap."""
+    
+    def test_membership_survives_earlier_origin(self):
+        """Test that adding a day before the origin shifts existing bits."""
+        bitmap = CompletionBitmap.from_dates(days_ago(0, 1))
+        bitmap.add(TODAY - timedelta(days=30))
+        
+        restored = CompletionBitmap.from_bytes(bitmap.origin, bitmap.to_bytes())
+        assert list(restored.dates()) == sorted(days_ago(0, 1, 30))
+        assert TODAY - timedelta(days=2) not in restored
+    
+    def test_windows_and_rates(self):
+        """Test last-N-day flags, range counts and completion rate."""
+        bitmap = CompletionBitmap.from_dates(days_ago(0, 2, 3))
+        
+        assert bitmap.last_n_days(5, TODAY) == [False, True, True, False, True]
+        assert bitmap.count(TODAY - timedelta(days=3), TODAY) == 3
+        assert bitmap.completion_rate(TODAY - timedelta(days=3), TODAY) == 0.75
+    
+    def test_discard_splits_run(self):
+        """Test that removing a day splits the run it belonged to."""
+        bitmap = CompletionBitmap.from_dates(days_ago(0, 1, 2, 3, 4))
+        bitmap.discard(TODAY - timedelta(days=2))
+        
+        assert bitmap.current_streak(TODAY) == 2
+        assert bitmap.longest_streak() == 2
+
+
+class TestStreakEndpoints:
+    """Test incremental streak maintenance through the API."""
+    
+    def _complete(self, client, headers, habit_id, day):
+        response = client.post(
+            f"/api/v1/habits/{habit_id}/complete",
+            json={"habit_id": habit_id, "completion_date": day.isoformat()},
+            headers=headers
+        )
+        assert response.status_code == 200
+    
+    def _streaks(self, client, headers, habit_id):
+        habit = client.get(f"/api/v1/habits/{habit_id}", headers=headers).json()
+        return habit["current_streak"], habit["longest_streak"]
+    
+    def test_backfill_bridges_runs(self, client, auth_headers):
+        """Test that backfilling a gap merges the runs on either side."""
+        today = date.today()
+        habit_id = client.post("/api/v1/habits/", json={"name": "Run"}, headers=auth_headers).json()["id"]
+        for offset in (0, 1, 3, 4, 5):
+            self._complete(client, auth_headers, habit_id, today - timedelta(days=offset))
+        assert self._streaks(client, auth_headers, habit_id) == (2, 3)
+        
+        self._complete(client, auth_headers, habit_id, today - timedelta(days=2))
+        
+        assert self._streaks(client, auth_headers, habit_id) == (6, 6)
+    
+    def test_uncomplete_past_date_shrinks_longest(self, client, auth_headers):
+        """Test that removing a day inside the longest run recomputes it."""
+        today = date.today()
+        habit_id = client.post("/api/v1/habits/", json={"name": "Read"}, headers=auth_headers).json()["id"]
+        for offset in (10, 11, 12, 13, 14, 0):
+            self._complete(client, auth_headers, habit_id, today - timedelta(days=offset))
+        assert self._streaks(client, auth_headers, habit_id) == (1, 5)
+        
+        response = client.delete(
+            f"/api/v1/habits/{habit_id}/complete",
+            params={"completion_date": (today - timedelta(days=12)).isoformat()},
+            headers=auth_headers
+        )
+        
+        assert response.status_code == 204
+        assert self._streaks(client, auth_headers, habit_id) == (1, 2)
+    
+    def test_recompute_command_repairs_streaks(self, client, auth_headers):
+        """Test that the bulk command rebuilds corrupted streak columns."""
+        today = date.today()
+        habit_id = client.post("/api/v1/habits/", json={"name": "Walk"}, headers=auth_headers).json()["id"]
+        for offset in (2, 0, 1):
+            self._complete(client, auth_headers, habit_id, today - timedelta(days=offset))
+        
+        db = SessionLocal()
+        try:
+            habit = db.get(Habit, habit_id)
+            habit.current_streak, habit.longest_streak = 0, 0
+            db.commit()
+            recompute_all_streaks(db, chunk_size=2)
+        finally:
+            db.close()
+        
+        assert self._streaks(client, auth_headers, habit_id) == (3, 3)
+    
+    def test_legacy_bitmap_read_then_backfilled(self, client, auth_headers):
+        """Test the calendar builds a missing bitmap without storing it, and the command backfills it."""
+        today = date.today()
+        habit_id = client.post("/api/v1/habits/", json={"name": "Stretch"}, headers=auth_headers).json()["id"]
+        for offset in (1, 0):
+            self._complete(client, auth_headers, habit_id, today - timedelta(days=offset))
+        
+        db = SessionLocal()
+        try:
+            habit = db.get(Habit, habit_id)
+            habit.completion_bitmap, habit.bitmap_origin = None, None
+            db.commit()
+            
+            response = client.get(f"/api/v1/habits/{habit_id}/calendar", headers=auth_headers)
+            assert response.status_code == 200
+            assert response.json()["current_streak"] == 2
+            db.expire_all()
+            assert db.get(Habit, habit_id).completion_bitmap is None
+            
+            assert recompute_all_streaks(db, missing_only=True) >= 1
+            db.expire_all()
+            assert db.get(Habit, habit_id).completion_bitmap is not None
+            assert recompute_all_streaks(db, missing_only=True) == 0
+        finally:
+            db.close()
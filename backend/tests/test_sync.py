@@ -0,0 +1,130 @@
+from datetime import date, timedelta
+
+from sqlalchemy import select
+
+from app.db.base import SessionLocal
+from app.models.sync import ChangeLog, record_changes
+
+
+class TestDeltaSync:
+    """Test the /sync delta endpoint."""
+    
+    def _sync(self, client, headers, since=0, limit=500):
+        response = client.get("/api/v1/sync", params={"since": since, "limit": limit}, headers=headers)
+        assert response.status_code == 200
+        return response.json()
+    
+    def _food(self, client, headers, name="Soup"):
+        response = client.post("/api/v1/food/entries", json={
+            "food_name": name, "quantity": 1, "calories": 120, "meal_category": "dinner"
+        }, headers=headers)
+        assert response.status_code == 201
+        return response.json()
+    
+    def test_full_sync_then_delta(self, client, auth_headers):
+        """Test a full download followed by a delta with updates and tombstones."""
+        kept = self._food(client, auth_headers, "Kept")
+        removed = self._food(client, auth_headers, "Removed")
+        todo = client.post("/api/v1/todos/", json={"title": "Call", "priority": 1}, headers=auth_headers).json()
+        
+        full = self._sync(client, auth_headers)
+        assert {entry["id"] for entry in full["changes"]["food_entries"]} == {kept["id"], removed["id"]}
+        assert [item["id"] for item in full["changes"]["todos"]] == [todo["id"]]
+        assert full["has_more"] is False
+        
+        client.put(f"/api/v1/food/entries/{kept['id']}", json={"calories": 150}, headers=auth_headers)
+        client.delete(f"/api/v1/food/entries/{removed['id']}", headers=auth_headers)
+        
+        delta = self._sync(client, auth_headers, since=full["watermark"])
+        assert [entry["calories"] for entry in delta["changes"]["food_entries"]] == [150]
+        assert delta["deleted"]["food_entries"] == [removed["id"]]
+        assert delta["changes"]["todos"] == []
+        assert delta["watermark"] > full["watermark"]
+        
+        assert self._sync(client, auth_headers, since=delta["watermark"])["watermark"] == delta["watermark"]
+    
+    def test_habit_completion_tombstones(self, client, auth_headers):
+        """Test uncomplete and habit delete produce tombstones."""
+        habit = client.post("/api/v1/habits/", json={"name": "Walk"}, headers=auth_headers).json()
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        first = client.post(f"/api/v1/habits/{habit['id']}/complete", headers=auth_headers).json()
+        second = client.post(
+            f"/api/v1/habits/{habit['id']}/complete",
+            json={"habit_id": habit["id"], "completion_date": yesterday},
+            headers=auth_headers
+        ).json()
+        
+        start = self._sync(client, auth_headers)
+        synced_habit = start["changes"]["habits"][0]
+        assert synced_habit["is_completed_today"] is True
+        assert synced_habit["current_streak"] == 2
+        
+        client.delete(f"/api/v1/habits/{habit['id']}/complete", headers=auth_headers)
+        delta = self._sync(client, auth_headers, since=start["watermark"])
+        assert delta["deleted"]["habit_completions"] == [first["id"]]
+        assert delta["changes"]["habits"][0]["current_streak"] == 1
+        
+        client.delete(f"/api/v1/habits/{habit['id']}", headers=auth_headers)
+        delta = self._sync(client, auth_headers, since=delta["watermark"])
+        assert delta["deleted"]["habits"] == [habit["id"]]
+        assert delta["deleted"]["habit_completions"] == [second["id"]]
+    
+    def test_paginates_by_sequence(self, client, auth_headers):
+        """Test small pages walk the log without gaps or repeats."""
+        ids = {self._food(client, auth_headers, f"Item {i}")["id"] for i in range(5)}
+        
+        seen, since, pages = [], 0, 0
+        while True:
+            page = self._sync(client, auth_headers, since=since, limit=2)
+            seen.extend(entry["id"] for entry in page["changes"]["food_entries"])
+            since, pages = page["watermark"], pages + 1
+            if not page["has_more"]:
+                break
+        
+        assert pages == 3
+        assert sorted(seen) == sorted(ids)
+    
+    def test_other_users_changes_are_hidden(self, client, auth_headers, make_auth_headers):
+        """Test a user's sync never includes another user's rows."""
+        self._food(client, auth_headers)
+        
+        assert self._sync(client, make_auth_headers())["changes"]["food_entries"] == []
+    
+    def test_late_commit_is_not_skipped(self, client, auth_headers):
+        """Test a transaction that logs first but commits last still lands past the synced watermark."""
+        user_id = client.get("/api/v1/auth/me", headers=auth_headers).json()["id"]
+        habit = client.post("/api/v1/habits/", json={"name": "Stretch"}, headers=auth_headers).json()
+        start = self._sync(client, auth_headers)
+        
+        # A logs and flushes first (as recompute_streaks does), B then writes and commits;
+        # SQLite allows one writer at a time, so A only logs here
+        slow = SessionLocal()
+        try:
+            record_changes(slow, user_id, "habits", [habit["id"]])
+            slow.flush()
+            fast = self._food(client, auth_headers)
+            synced = self._sync(client, auth_headers, since=start["watermark"])
+            assert [entry["id"] for entry in synced["changes"]["food_entries"]] == [fast["id"]]
+            assert synced["changes"]["habits"] == []
+            slow.commit()
+        finally:
+            slow.close()
+        
+        delta = self._sync(client, auth_headers, since=synced["watermark"])
+        assert [item["id"] for item in delta["changes"]["habits"]] == [habit["id"]]
+    
+    def test_rolled_back_savepoint_logs_nothing(self, client, auth_headers):
+        """Test changes logged inside a savepoint that rolls back are not written."""
+        user_id = client.get("/api/v1/auth/me", headers=auth_headers).json()["id"]
+        db = SessionLocal()
+        try:
+            record_changes(db, user_id, "todos", ["kept"])
+            savepoint = db.begin_nested()
+            record_changes(db, user_id, "todos", ["dropped"])
+            savepoint.rollback()
+            db.commit()
+            logged = db.scalars(select(ChangeLog.entity_id).filter(ChangeLog.user_id == user_id)).all()
+        finally:
+            db.close()
+        
+        assert logged == ["kept"]